@@ -20,6 +20,14 @@ UNKNOWN_CONTACT_TRIAGE_SYSTEM_PROMPT = (
     "- notes: 1-3 brief bullets as a single string\n"
 )
 
+UNKNOWN_CONTACT_BATCH_TRIAGE_SYSTEM_PROMPT = (
+    UNKNOWN_CONTACT_TRIAGE_SYSTEM_PROMPT
+    + "\nBATCH MODE: the input is a JSON array of {\"id\", \"handle\", \"inbound_text\"} objects, "
+    "one per unknown sender. Triage each sender independently. "
+    "Return ONLY strict JSON of the form {\"results\": [ ... ]} with exactly one object per input, "
+    "each carrying the input's \"id\" plus the keys above.\n"
+)
+
 UNKNOWN_CONTACT_ALLOWED_CLASSIFICATIONS: set[str] = {
     "benign_chat",
     "business",
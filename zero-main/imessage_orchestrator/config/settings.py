@@ -140,7 +140,17 @@ LLM_FAILOVER_CHAIN: list[str] = (
     if _env_failover
     else []  # Empty = no failover; populated at runtime from available providers
 )
+# Hedged failover: if no provider has answered after this many seconds, start
+# the next one in parallel and take the first usable reply.  0 = sequential.
+LLM_HEDGE_DELAY_SEC: float = float(os.getenv("LLM_HEDGE_DELAY_SEC", "0"))
 
 # Bridge retry settings
 BRIDGE_SEND_RETRIES: int = int(os.getenv("BRIDGE_SEND_RETRIES", "3"))
 BRIDGE_SEND_BACKOFF: float = float(os.getenv("BRIDGE_SEND_BACKOFF", "2.0"))
+BRIDGE_SEND_BACKOFF_CAP: float = float(os.getenv("BRIDGE_SEND_BACKOFF_CAP", "30.0"))
+# Per-handle circuit breaker: skip sends for COOLDOWN seconds after THRESHOLD
+# consecutive permanent failures (e.g. unknown buddy).
+BRIDGE_BREAKER_THRESHOLD: int = int(os.getenv("BRIDGE_BREAKER_THRESHOLD", "3"))
+BRIDGE_BREAKER_COOLDOWN: float = float(os.getenv("BRIDGE_BREAKER_COOLDOWN", "300"))
+# Read chat.db (read-only) to try a handle's existing chat service first
+BRIDGE_CHATDB_HINTS: bool = os.getenv("BRIDGE_CHATDB_HINTS", "true").lower() == "true"
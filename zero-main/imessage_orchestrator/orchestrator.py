@@ -114,6 +114,10 @@ class Orchestrator:
             logger.warning(f"[INIT] Analyst Service fallback mode (no LotL): {e}")
             self.analyst = AnalystService(api_key=api_key, lotl_client=None)
         
+        # Unknown-sender triage prefetched for the current poll batch:
+        # canonical handle -> (inbound text, triage result)
+        self._prefetched_triage: dict[str, tuple[str, dict]] = {}
+
         # CRITICAL: Load persisted approvals on startup
         self.pending_approvals = self._load_approvals()
         logger.info(f"Loaded {len(self.pending_approvals)} pending approvals from disk.")
@@ -340,7 +344,7 @@ class Orchestrator:
             if not isinstance(entry, dict):
                 continue
 
-            profile = self.archivist.load_profile(handle)
+            profile = self.archivist.peek_profile(handle)
             if profile.get("mute_agent", False):
                 continue
 
@@ -484,7 +488,7 @@ class Orchestrator:
         Calculates delay using the V2 Pacing Engine (Deep Limerence).
         Uses 'average_latency_seconds' and 'variable_reward_ratio' to create addictive rhythms.
         """
-        profile = self.archivist.load_profile(current_msg.handle)
+        profile = self.archivist.peek_profile(current_msg.handle)
         pacing = profile.get("pacing_engine", {})
         
         # Pacing Engine Parameters
@@ -1044,6 +1048,7 @@ class Orchestrator:
             success = self.bridge.send_message(target_handle, draft)
             
             if success:
+                self._invalidate_history(target_handle)
                 self.archivist.store_interaction(target_handle, "(Approved)", draft)
                 
                 # Trust calibration
@@ -1143,6 +1148,12 @@ class Orchestrator:
         
         logger.info(f"[STATE] {target_handle}: AWAITING_APPROVAL (draft updated)")
 
+    def _invalidate_history(self, handle: str) -> None:
+        """Drop the watcher's cached history for *handle* after an outbound send."""
+        invalidate = getattr(self.watcher, "invalidate", None)
+        if callable(invalidate):
+            invalidate(handle)
+
     def _send_message(self, handle: str, text: str, service: str = "iMessage") -> bool:
         """Route message to the correct bridge and persist outbound for history."""
         # Normalize service name
@@ -1172,8 +1183,48 @@ class Orchestrator:
             except Exception:
                 pass
 
+        if success:
+            self._invalidate_history(handle)
         return success
 
+    def _prefetch_unknown_triage(self, messages: list) -> None:
+        """Triage every new unknown sender in a poll batch with one analyst call.
+
+        Results are parked per handle and consumed by _handle_unknown_contact;
+        a single unknown sender keeps the per-contact path.
+        """
+        self._prefetched_triage.clear()
+        contacts: list[dict] = []
+        seen: set[str] = set()
+        for msg in messages:
+            text = str(msg.text or "").strip()
+            if not text or text.startswith("__UNREAD_PENDING__:"):
+                continue
+            decision = policy.decide_inbound(msg.handle)
+            key = policy.canonicalize_handle(decision.handle)
+            if decision.kind != "unknown" or not key or key in seen:
+                continue
+            # Probationary contacts (main profile exists) skip triage entirely
+            if self.archivist.has_profile(decision.handle):
+                continue
+            if decision.handle in self.pending_approvals or key in self.pending_approvals:
+                continue
+            seen.add(key)
+            contacts.append({"handle": key, "inbound_text": text})
+
+        if len(contacts) < 2:
+            return
+        try:
+            results = self._with_llm_lock(
+                context=f"analyst_unknown_batch:{len(contacts)}",
+                fn=lambda: self.analyst.analyze_batch(contacts),
+            )
+        except Exception as e:
+            logger.warning(f"[UNKNOWN] Batch triage failed; triaging per contact: {e}")
+            return
+        for contact, triage in zip(contacts, results):
+            self._prefetched_triage[contact["handle"]] = (contact["inbound_text"], triage)
+
     def _handle_unknown_contact(self, *, handle: str, inbound_text: str, service: str) -> None:
         """Safety-first flow for unknown senders.
 
@@ -1187,21 +1238,25 @@ class Orchestrator:
             canonical = "+" + canonical
 
         inbound_text = str(inbound_text or "").strip()
+        prefetched = self._prefetched_triage.pop(policy.canonicalize_handle(canonical), None)
 
         # If we already have a pending approval for this handle, don't spam new requests.
         if canonical in self.pending_approvals:
             logger.info(f"[UNKNOWN] {canonical} already pending approval; not re-triaging")
             return
 
-        # Run triage first.
+        # Run triage first (unless this poll's batch already covered this message).
         triage: dict = {}
-        try:
-            triage = self._with_llm_lock(
-                context=f"analyst_unknown:{canonical}",
-                fn=lambda: self.analyst.analyze_unknown_contact(handle=canonical, inbound_text=inbound_text),
-            )
-        except Exception as e:
-            logger.warning(f"[UNKNOWN] Analyst triage failed for {canonical}: {e}")
+        if prefetched is not None and prefetched[0] == inbound_text:
+            triage = prefetched[1]
+        else:
+            try:
+                triage = self._with_llm_lock(
+                    context=f"analyst_unknown:{canonical}",
+                    fn=lambda: self.analyst.analyze_unknown_contact(handle=canonical, inbound_text=inbound_text),
+                )
+            except Exception as e:
+                logger.warning(f"[UNKNOWN] Analyst triage failed for {canonical}: {e}")
 
         classification = str(triage.get("classification", "unknown"))
         confidence = triage.get("confidence", 0.0)
@@ -1525,101 +1580,108 @@ def _run_main_loop(api_key: str | None, logger: logging.Logger) -> None:
 
     logger.info("Phase 2 Orchestrator running (The Triad + Bridge). Poll interval=%ss", settings.POLL_INTERVAL_SECONDS)
 
-    while True:
-        try:
-            now = time.time()
-            if now < cooldown_until:
-                time.sleep(min(settings.POLL_INTERVAL_SECONDS, max(0.0, cooldown_until - now)))
-                continue
-
-            # ---- DRAIN SCHEDULED SENDS (non-blocking pacing) ----
-            # This replaces the old blocking time.sleep(delay) approach.
-            # Messages enqueued by handle_incoming are delivered here once
-            # their pacing delay has elapsed.
+    try:
+        while True:
             try:
-                sent = bot.send_queue.drain(
-                    send_fn=bot._send_message,
-                    on_failure=lambda entry: (
-                        bot.bridge.send_message(
-                            settings.OPERATOR_HANDLE,
-                            f"\u274c SEND FAILED [{entry.handle}]: exhausted {entry.max_retries} retries",
+                now = time.time()
+                if now < cooldown_until:
+                    time.sleep(min(settings.POLL_INTERVAL_SECONDS, max(0.0, cooldown_until - now)))
+                    continue
+
+                # ---- DRAIN SCHEDULED SENDS (non-blocking pacing) ----
+                # This replaces the old blocking time.sleep(delay) approach.
+                # Messages enqueued by handle_incoming are delivered here once
+                # their pacing delay has elapsed.
+                try:
+                    sent = bot.send_queue.drain(
+                        send_fn=bot._send_message,
+                        on_failure=lambda entry: (
+                            bot.bridge.send_message(
+                                settings.OPERATOR_HANDLE,
+                                f"\u274c SEND FAILED [{entry.handle}]: exhausted {entry.max_retries} retries",
+                            )
+                            if settings.OPERATOR_HANDLE
+                            else None
+                        ),
+                    )
+                    if sent:
+                        logger.info("[SEND_Q] Delivered %d scheduled messages", sent)
+                except Exception as exc:
+                    logger.error("[SEND_Q] Drain error: %s", exc)
+
+                new_messages = watcher.poll_new_messages()
+
+                # One analyst round-trip for all new unknown senders in this poll
+                bot._prefetch_unknown_triage(new_messages)
+
+                # Collect messages that couldn't be processed due to rate limit
+                # so they can be retried on the next tick instead of being dropped.
+                rate_limited = False
+
+                for msg in new_messages:
+                    if rate_limited:
+                        # Don't process remaining messages in this batch;
+                        # they will be re-polled because we only advance rowid
+                        # for successfully processed messages.
+                        break
+
+                    # --- DEFERRED READ FOR WHATSAPP (Human-like behavior) ---
+                    if msg.text.startswith("__UNREAD_PENDING__:"):
+                        read_delay = random.uniform(2.0, 8.0)
+                        logger.info(f"[WHATSAPP] Waiting {read_delay:.1f}s before reading message from {msg.handle}")
+                        time.sleep(read_delay)
+                        
+                        actual_text = watcher.read_message(msg.handle) if hasattr(watcher, 'read_message') else None
+                        if not actual_text:
+                            logger.warning(f"[WHATSAPP] Could not read message from {msg.handle}")
+                            continue
+                        msg = IncomingMessage(
+                            message_rowid=msg.message_rowid,
+                            handle=msg.handle,
+                            text=actual_text,
+                            service=msg.service,
+                            date=msg.date
                         )
-                        if settings.OPERATOR_HANDLE
-                        else None
-                    ),
-                )
-                if sent:
-                    logger.info("[SEND_Q] Delivered %d scheduled messages", sent)
-            except Exception as exc:
-                logger.error("[SEND_Q] Drain error: %s", exc)
-
-            new_messages = watcher.poll_new_messages()
-
-            # Collect messages that couldn't be processed due to rate limit
-            # so they can be retried on the next tick instead of being dropped.
-            rate_limited = False
-
-            for msg in new_messages:
-                if rate_limited:
-                    # Don't process remaining messages in this batch;
-                    # they will be re-polled because we only advance rowid
-                    # for successfully processed messages.
-                    break
-
-                # --- DEFERRED READ FOR WHATSAPP (Human-like behavior) ---
-                if msg.text.startswith("__UNREAD_PENDING__:"):
-                    read_delay = random.uniform(2.0, 8.0)
-                    logger.info(f"[WHATSAPP] Waiting {read_delay:.1f}s before reading message from {msg.handle}")
-                    time.sleep(read_delay)
+
+                    logger.info("[INFO] New Message from %s: %s", msg.handle, msg.text[:100])
+
+                    history = watcher.fetch_recent_history(handle=msg.handle)
                     
-                    actual_text = watcher.read_message(msg.handle) if hasattr(watcher, 'read_message') else None
-                    if not actual_text:
-                        logger.warning(f"[WHATSAPP] Could not read message from {msg.handle}")
-                        continue
-                    msg = IncomingMessage(
-                        message_rowid=msg.message_rowid,
-                        handle=msg.handle,
-                        text=actual_text,
-                        service=msg.service,
-                        date=msg.date
-                    )
+                    try:
+                        bot.handle_incoming(msg, history)
+                    except RateLimitError as exc:
+                        cooldown_until = time.time() + exc.retry_after_seconds
+                        logger.warning("[RATE_LIMIT] Backing off for %.1fs (remaining msgs preserved)", exc.retry_after_seconds)
+                        rate_limited = True
+                        # Do NOT break — the for-loop guard above skips remaining
+                    except Exception as e:
+                        logger.exception("Error handling message from %s: %s", msg.handle, e)
+
+                # Quiet-hours Option B: attempt deferred sends once quiet hours ends.
+                if time.time() >= cooldown_until:
+                    try:
+                        drained = bot.drain_deferred_outbox(max_per_tick=5)
+                        if drained:
+                            logger.info("[DEFERRED] Drained %s deferred handles", drained)
+                    except RateLimitError as exc:
+                        cooldown_until = time.time() + exc.retry_after_seconds
+                        logger.warning("[RATE_LIMIT] Backing off for %.1fs", exc.retry_after_seconds)
 
-                logger.info("[INFO] New Message from %s: %s", msg.handle, msg.text[:100])
+                # Check for Proactive Initiations every cycle (before sleep,
+                # so proactive checks are not gated by the poll interval).
+                bot._check_proactive_initiation()
 
-                history = watcher.fetch_recent_history(handle=msg.handle)
-                
-                try:
-                    bot.handle_incoming(msg, history)
-                except RateLimitError as exc:
-                    cooldown_until = time.time() + exc.retry_after_seconds
-                    logger.warning("[RATE_LIMIT] Backing off for %.1fs (remaining msgs preserved)", exc.retry_after_seconds)
-                    rate_limited = True
-                    # Do NOT break — the for-loop guard above skips remaining
-                except Exception as e:
-                    logger.exception("Error handling message from %s: %s", msg.handle, e)
-
-            # Quiet-hours Option B: attempt deferred sends once quiet hours ends.
-            if time.time() >= cooldown_until:
-                try:
-                    drained = bot.drain_deferred_outbox(max_per_tick=5)
-                    if drained:
-                        logger.info("[DEFERRED] Drained %s deferred handles", drained)
-                except RateLimitError as exc:
-                    cooldown_until = time.time() + exc.retry_after_seconds
-                    logger.warning("[RATE_LIMIT] Backing off for %.1fs", exc.retry_after_seconds)
-
-            # Check for Proactive Initiations every cycle (before sleep,
-            # so proactive checks are not gated by the poll interval).
-            bot._check_proactive_initiation()
-
-            time.sleep(settings.POLL_INTERVAL_SECONDS)
-
-        except KeyboardInterrupt:
-            logger.info("Orchestrator stopped by user.")
-            break
-        except Exception as e:
-            logger.exception("Top-level error in loop: %s", e)
-            time.sleep(5)
+                time.sleep(settings.POLL_INTERVAL_SECONDS)
+
+            except KeyboardInterrupt:
+                logger.info("Orchestrator stopped by user.")
+                break
+            except Exception as e:
+                logger.exception("Top-level error in loop: %s", e)
+                time.sleep(5)
+    finally:
+        # Scheduled sends are written in batches; persist whatever is pending
+        bot.send_queue.flush()
 
 
 if __name__ == "__main__":
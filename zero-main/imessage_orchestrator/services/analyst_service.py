@@ -17,20 +17,33 @@ Single entry point for all intelligence operations with consistent provider hand
 """
 
 from __future__ import annotations
+import copy
+import functools
+import hashlib
 import json
 import logging
 import time
 import random
 import datetime
 import os
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Dict, List
 
 import pytz
 
+try:
+    import google.generativeai as genai
+except ImportError:  # Only required when the Gemini provider is used
+    genai = None
+
 from services.lotl_client import LotLClient
 from config import settings
 from config.prompts_unknown_contact import (
     UNKNOWN_CONTACT_ALLOWED_CLASSIFICATIONS,
+    UNKNOWN_CONTACT_BATCH_TRIAGE_SYSTEM_PROMPT,
     UNKNOWN_CONTACT_TRIAGE_SYSTEM_PROMPT,
 )
 from config import prompts_analyst_fact_extraction
@@ -44,6 +57,129 @@ logger = logging.getLogger(__name__)
 EMOTIONAL_EVENT_RETENTION_DAYS = 14  # Days to keep emotional events before pruning
 DEFAULT_FALLBACK_DATE = "2000-01-01"  # Fallback date for events missing timestamp
 
+# Max unknown contacts triaged per provider round-trip (analyze_batch)
+UNKNOWN_CONTACT_BATCH_SIZE = 16
+
+# Successful analyses remembered per (provider, system prompt, user content)
+ANALYSIS_CACHE_SIZE = 512
+
+# Markdown code fence around a JSON payload (```json ... ``` / ```JSON ... ``` / ``` ... ```);
+# the closing fence is optional so truncated replies still lose the opening one
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*(?:```\s*)?$", re.IGNORECASE | re.DOTALL)
+
+
+def _strip_fences(text: str) -> str:
+    """Return *text* with a surrounding markdown code fence removed (if any)."""
+    t = str(text or "")
+    m = _FENCE_RE.match(t)
+    return (m.group(1) if m else t).strip()
+
+
+# Probability keys of an unknown-contact belief state
+_PROB_KEYS = ("p_male", "p_female", "p_dating", "p_business", "p_friendship")
+
+
+# Safe neutral first reply used whenever triage yields nothing usable
+_DEFAULT_REPLY = "Hey — good to hear from you. Hope your day’s going well."
+
+# Unknown-contact triage result when the analysis itself failed (read-only templates)
+_DEFAULT_BELIEF = MappingProxyType({
+    "p_male": 0.5, "p_female": 0.5, "p_dating": 0.0, "p_business": 0.0, "p_friendship": 0.0,
+    "age_estimate": "unknown",
+})
+_FALLBACK_RESULT = MappingProxyType({
+    "classification": "unknown",
+    "confidence": 0.0,
+    "risk_flags": ("analysis_failed",),
+    "belief_state": _DEFAULT_BELIEF,
+    "suggested_reply": _DEFAULT_REPLY,
+    "notes": "- analysis failed; defaulting to safe neutral reply",
+})
+
+
+def _safe_float(value: object, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return default
+
+
+def _clamp01(value: float) -> float:
+    return max(0.0, min(1.0, value))
+
+
+def _as_str(value: object, default: str = "") -> str:
+    """``str(value)`` without the call when *value* already is one; None -> *default*."""
+    if isinstance(value, str):
+        return value
+    return default if value is None else str(value)
+
+
+# LotL UI states worth one more attempt on the same tab
+_RETRY_RE = re.compile(
+    r"stop generation before creating a new chat|verify it'?s you|unusual traffic"
+    r"|captcha|sign in|something went wrong",
+    re.IGNORECASE,
+)
+
+# LotL retries once: a fixed pause plus up to _RETRY_JITTER seconds of jitter
+_RETRY_BASE_DELAY = 5.0
+_RETRY_JITTER = 0.5
+
+
+def _retry_pause() -> float:
+    """Fixed base delay with jitter so concurrent analyses don't retry in lockstep."""
+    return _RETRY_BASE_DELAY + random.random() * _RETRY_JITTER
+
+
+# LotL analysis prompt framing: cached system prefix + per-call user content + fixed tail
+_LOTL_PROMPT_HEAD = "SYSTEM:\n{prompt}\n\nUSER REQUEST:\n"
+_LOTL_PROMPT_TAIL = "\n\nIMPORTANT: Return ONLY valid JSON. No markdown, no explanation."
+
+
+@functools.lru_cache(maxsize=4)
+def _lotl_prompt_head(prompt: str) -> str:
+    """Render (once per system prompt) the prefix of a LotL analysis request."""
+    return _LOTL_PROMPT_HEAD.format(prompt=prompt)
+
+
+def _require_genai() -> None:
+    if genai is None:
+        raise ImportError("google-generativeai is required for the Gemini analyst provider")
+
+
+@functools.lru_cache(maxsize=1)
+def _configure_genai(api_key: str, base_url: str | None) -> None:
+    """Configure the Gemini SDK once per (api_key, base_url).
+
+    The REST transport keeps a pooled keep-alive session, so every request
+    after the first skips the TCP/TLS handshake.
+    """
+    _require_genai()
+    configure_kwargs = {"api_key": api_key, "transport": "rest"}
+    if base_url:
+        if base_url.startswith("https://"):
+            base_url = base_url.replace("https://", "")
+        if base_url.endswith("/"):
+            base_url = base_url[:-1]
+        configure_kwargs["client_options"] = {"api_endpoint": base_url}
+    genai.configure(**configure_kwargs)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_gemini_model(model_name: str, prompt: str):
+    """Return a JSON-mode Gemini model for (*model_name*, *prompt*), reused across calls.
+
+    ``GenerativeModel`` holds no per-request state, so one instance per
+    system instruction can be shared by every analysis call.
+    """
+    _require_genai()
+    return genai.GenerativeModel(
+        model_name,
+        system_instruction=prompt,
+        generation_config={"response_mime_type": "application/json"},
+    )
+
 
 # =============================================================================
 # TIER 1 ANALYST SYSTEM PROMPT
@@ -94,6 +230,10 @@ class AnalystService:
         self.provider = settings.LLM_PROVIDER
         self.api_key = api_key or settings.GEMINI_API_KEY
         self.lotl = lotl_client
+
+        # Content-addressed LRU of successful analyses (see _run_analysis)
+        self._analysis_cache: OrderedDict[bytes, Dict] = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
         
         # Initialize provider
         self._init_provider()
@@ -104,17 +244,7 @@ class AnalystService:
     def _init_provider(self):
         """Initialize the configured LLM provider."""
         if self.provider == "gemini" and self.api_key:
-            import google.generativeai as genai
-            configure_kwargs = {"api_key": self.api_key}
-            base_url = os.environ.get("GEMINI_BASE_URL")
-            if base_url:
-                if base_url.startswith("https://"):
-                    base_url = base_url.replace("https://", "")
-                if base_url.endswith("/"):
-                    base_url = base_url[:-1]
-                configure_kwargs["client_options"] = {"api_endpoint": base_url}
-                configure_kwargs["transport"] = "rest"
-            genai.configure(**configure_kwargs)
+            _configure_genai(self.api_key, os.environ.get("GEMINI_BASE_URL"))
         elif self.provider == "lotl":
             logger.info("Analyst using LotL provider (Chrome Controller)")
         elif not self.api_key and self.provider != "lotl":
@@ -622,17 +752,26 @@ class AnalystService:
                 if "emotional_events" not in profile["psychometric_profile"]:
                     profile["psychometric_profile"]["emotional_events"] = []
                 
-                # Add timestamp to each new event (timezone-aware UTC)
+                # Add timestamp to each new event (timezone-aware UTC),
+                # plus its epoch so readers can skip re-parsing the ISO string.
                 now_utc = datetime.datetime.now(pytz.UTC)
                 now_iso = now_utc.isoformat()
+                now_epoch = now_utc.timestamp()
                 for event in new_emotions:
                     event["detected_at"] = now_iso
+                    event["detected_at_epoch"] = now_epoch
                     profile["psychometric_profile"]["emotional_events"].append(event)
                 
                 # Prune old events using the same timezone-aware reference time
                 cutoff = now_utc - datetime.timedelta(days=EMOTIONAL_EVENT_RETENTION_DAYS)
+                cutoff_epoch = cutoff.timestamp()
                 pruned_events = []
                 for event in profile["psychometric_profile"]["emotional_events"]:
+                    detected_epoch = event.get("detected_at_epoch")
+                    if isinstance(detected_epoch, (int, float)):
+                        if detected_epoch > cutoff_epoch:
+                            pruned_events.append(event)
+                        continue
                     raw_detected_at = event.get("detected_at", DEFAULT_FALLBACK_DATE)
                     try:
                         detected_at_dt = datetime.datetime.fromisoformat(raw_detected_at)  # type: ignore[arg-type]
@@ -720,12 +859,57 @@ class AnalystService:
     # =========================================================================
     
     def _run_analysis(self, system_prompt: str, user_content: str) -> Dict:
-        """Helper to route analysis requests to the configured provider."""
+        """Helper to route analysis requests to the configured provider.
+
+        Identical (provider, prompt, content) requests are answered from an
+        in-memory LRU; only successful (non-empty) results are cached.
+        """
+        key = self._analysis_cache_key(system_prompt, user_content)
+        cached = self._analysis_cache_get(key)
+        if cached is not None:
+            return cached
+
         if self.provider in {"lotl", "copilot"}:
             # Default to Copilot (which now has fallback to Gemini -> AI Studio)
             platform = "copilot"
-            return self._lotl_analyze(system_prompt, user_content, {}, platform=platform)
-        return self._gemini_analyze(system_prompt, user_content, {})
+            result = self._lotl_analyze(system_prompt, user_content, {}, platform=platform)
+        else:
+            result = self._gemini_analyze(system_prompt, user_content, {})
+        self._analysis_cache_put(key, result)
+        return result
+
+    def _analysis_cache_key(self, system_prompt: str, user_content: str) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        for part in (self.provider, system_prompt, user_content):
+            h.update(part.encode("utf-8", "surrogatepass"))
+            h.update(b"\x00")
+        return h.digest()
+
+    def _analysis_cache_get(self, key: bytes) -> Dict | None:
+        with self._analysis_cache_lock:
+            hit = self._analysis_cache.get(key)
+            if hit is None:
+                return None
+            self._analysis_cache.move_to_end(key)
+        # Callers mutate results (e.g. stamping emotional events), so hand out copies.
+        return copy.deepcopy(hit)
+
+    def _analysis_cache_put(self, key: bytes, result: object) -> None:
+        if not isinstance(result, dict) or not result:
+            return
+        snapshot = copy.deepcopy(result)
+        with self._analysis_cache_lock:
+            self._analysis_cache[key] = snapshot
+            self._analysis_cache.move_to_end(key)
+            while len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+
+    @staticmethod
+    def _unknown_contact_user_content(handle: str, inbound_text: str) -> str:
+        return (
+            f"UNKNOWN CONTACT HANDLE: {handle}\n"
+            f"INBOUND MESSAGE: {inbound_text}\n"
+        )
 
     def analyze_unknown_contact(self, *, handle: str, inbound_text: str) -> Dict:
         """Triage an unknown inbound contact.
@@ -734,72 +918,106 @@ class AnalystService:
         This is intentionally non-manipulative: it focuses on spam/scam detection
         and a polite, low-risk response draft.
         """
-        system_prompt = UNKNOWN_CONTACT_TRIAGE_SYSTEM_PROMPT
-
-        user_content = (
-            f"UNKNOWN CONTACT HANDLE: {handle}\n"
-            f"INBOUND MESSAGE: {inbound_text}\n"
+        result = self._run_analysis(
+            UNKNOWN_CONTACT_TRIAGE_SYSTEM_PROMPT,
+            self._unknown_contact_user_content(handle, inbound_text),
         )
+        return self._normalize_unknown_contact_result(result)
+
+    def analyze_batch(self, contacts: List[Dict]) -> List[Dict]:
+        """Triage several unknown contacts with one provider call per batch.
+
+        Contacts are sent as a JSON array (up to UNKNOWN_CONTACT_BATCH_SIZE per
+        call) and results are matched back by their "id". Any contact missing
+        from a batch reply falls back to a single analyze_unknown_contact() call.
+
+        Args:
+            contacts: Dicts with "handle" and "inbound_text" keys
+
+        Returns:
+            One normalized triage dict per contact, in input order.
+        """
+        out: List[Dict] = []
+        for start in range(0, len(contacts), UNKNOWN_CONTACT_BATCH_SIZE):
+            chunk = contacts[start : start + UNKNOWN_CONTACT_BATCH_SIZE]
+            items = [
+                {
+                    "id": i,
+                    "handle": str(c.get("handle") or ""),
+                    "inbound_text": str(c.get("inbound_text") or ""),
+                }
+                for i, c in enumerate(chunk)
+            ]
+            by_id: Dict[int, Dict] = {}
+            if len(items) > 1:
+                try:
+                    reply = self._run_analysis(
+                        UNKNOWN_CONTACT_BATCH_TRIAGE_SYSTEM_PROMPT,
+                        json.dumps(items, ensure_ascii=False),
+                    )
+                except Exception as e:
+                    logger.error(f"[ANALYST] Batch triage failed: {e}")
+                    reply = None
+                results = reply.get("results") if isinstance(reply, dict) else None
+                if isinstance(results, list):
+                    for r in results:
+                        rid = r.get("id") if isinstance(r, dict) else None
+                        # bool is an int subclass; first answer per id wins
+                        if type(rid) is int and rid not in by_id:
+                            by_id[rid] = r
+                else:
+                    logger.warning("[ANALYST] Batch triage reply unusable; falling back per contact")
+
+            for item in items:
+                raw = by_id.get(item["id"])
+                if raw is None:
+                    out.append(
+                        self.analyze_unknown_contact(
+                            handle=item["handle"], inbound_text=item["inbound_text"]
+                        )
+                    )
+                else:
+                    out.append(self._normalize_unknown_contact_result(raw))
+        return out
 
-        result = self._run_analysis(system_prompt, user_content)
+    @staticmethod
+    def _normalize_unknown_contact_result(result: object) -> Dict:
+        """Coerce a raw triage response into the fixed unknown-contact schema."""
         if not isinstance(result, dict):
+            # Fresh containers: callers persist/mutate belief_state and risk_flags.
             return {
-                "classification": "unknown",
-                "confidence": 0.0,
-                "risk_flags": ["analysis_failed"],
-                "belief_state": {
-                    "p_male": 0.5, "p_female": 0.5, "p_dating": 0.0, "p_business": 0.0, "p_friendship": 0.0, "age_estimate": "unknown"
-                },
-                "suggested_reply": "Hey — good to hear from you. Hope your day’s going well.",
-                "notes": "- analysis failed; defaulting to safe neutral reply",
+                **_FALLBACK_RESULT,
+                "risk_flags": list(_FALLBACK_RESULT["risk_flags"]),
+                "belief_state": dict(_DEFAULT_BELIEF),
             }
 
         # Defensive normalization
-        classification = str(result.get("classification", "unknown"))
+        classification = _as_str(result.get("classification"), "unknown")
         if classification not in UNKNOWN_CONTACT_ALLOWED_CLASSIFICATIONS:
             classification = "unknown"
-        try:
-            confidence = float(result.get("confidence", 0.0))
-        except Exception:
-            confidence = 0.0
-        confidence = max(0.0, min(1.0, confidence))
+        confidence = _clamp01(_safe_float(result.get("confidence", 0.0)))
         risk_flags = result.get("risk_flags")
         if not isinstance(risk_flags, list):
             risk_flags = []
+        elif risk_flags:
+            risk_flags = [f for f in (str(x).strip() for x in risk_flags) if f]
 
         demographics_raw = result.get("demographics", {})
         if not isinstance(demographics_raw, dict):
             demographics_raw = {}
 
         # Construct probabilistic belief state with robust fallbacks
-        def _get_prob(key: str) -> float:
-            try:
-                val = float(demographics_raw.get(key, 0.0))
-                return max(0.0, min(1.0, val))
-            except (ValueError, TypeError):
-                return 0.0
-
-        belief_state = {
-            "p_male": _get_prob("p_male"),
-            "p_female": _get_prob("p_female"),
-            "p_dating": _get_prob("p_dating"),
-            "p_business": _get_prob("p_business"),
-            "p_friendship": _get_prob("p_friendship"),
-            "age_estimate": str(demographics_raw.get("age_estimate", "unknown"))
-        }
+        _get = demographics_raw.get
+        belief_state = {k: _clamp01(_safe_float(_get(k, 0.0))) for k in _PROB_KEYS}
+        belief_state["age_estimate"] = _as_str(_get("age_estimate"), "unknown")
         
-        suggested_reply = str(result.get("suggested_reply") or "").strip()
-        if not suggested_reply:
-            suggested_reply = "Hey — good to hear from you. Hope your day’s going well."
-
-        notes = str(result.get("notes") or "").strip()
-        if not notes:
-            notes = "- no additional notes"
+        suggested_reply = _as_str(result.get("suggested_reply")).strip() or _DEFAULT_REPLY
+        notes = _as_str(result.get("notes")).strip() or "- no additional notes"
 
         return {
             "classification": classification,
             "confidence": confidence,
-            "risk_flags": [str(x) for x in risk_flags if str(x).strip()],
+            "risk_flags": risk_flags,
             "belief_state": belief_state,
             "suggested_reply": suggested_reply,
             "notes": notes,
@@ -807,25 +1025,18 @@ class AnalystService:
     
     def _gemini_analyze(self, prompt: str, user_content: str, profile: Dict) -> Dict:
         """Gemini API analysis."""
-        import google.generativeai as genai
-        
         model_name = settings.GEMINI_MODEL or "gemini-2.5-flash"
-        model = genai.GenerativeModel(
-            model_name,
-            system_instruction=prompt,
-            generation_config={"response_mime_type": "application/json"}
-        )
+        model = _get_gemini_model(model_name, prompt)
 
         try:
             response = model.generate_content(user_content)
             text = response.text
-            # Strip markdown if present
-            if text.startswith("```json"):
-                text = text[7:-3]
-            elif text.startswith("```"):
-                text = text[3:-3]
-                
-            result = json.loads(text)
+            # JSON mode (response_mime_type) normally yields bare JSON; only
+            # fall back to fence stripping when the model wrapped it anyway.
+            try:
+                result = json.loads(text)
+            except ValueError:
+                result = json.loads(_strip_fences(text))
             logger.info("Analyst successfully completed analysis")
             return result
             
@@ -849,35 +1060,11 @@ class AnalystService:
             return profile if profile else {}
         
         # Combine system prompt and user content
-        full_prompt = (
-            f"SYSTEM:\n{prompt}\n\n"
-            f"USER REQUEST:\n{user_content}\n\n"
-            f"IMPORTANT: Return ONLY valid JSON. No markdown, no explanation."
-        )
+        full_prompt = _lotl_prompt_head(prompt) + user_content + _LOTL_PROMPT_TAIL
         
         def _should_retry(err_or_text: str) -> bool:
-            t = str(err_or_text or "").strip().lower()
-            if not t:
-                return False
-            known = [
-                "stop generation before creating a new chat",
-                "verify it's you",
-                "unusual traffic",
-                "captcha",
-                "sign in",
-                "something went wrong",
-            ]
-            return any(k in t for k in known)
-
-        def _strip_fences(text: str) -> str:
-            t = str(text or "").strip()
-            if t.startswith("```json"):
-                t = t[7:]
-            if t.startswith("```"):
-                t = t[3:]
-            if t.endswith("```"):
-                t = t[:-3]
-            return t.strip()
+            t = str(err_or_text or "")
+            return bool(t) and _RETRY_RE.search(t) is not None
 
         response_text: str | None = None
 
@@ -892,8 +1079,7 @@ class AnalystService:
             # cause overlapping UI automation (interrupting active generations).
             if isinstance(exc, TimeoutError) or _should_retry(str(exc)):
                 try:
-                    import time
-                    time.sleep(5)
+                    time.sleep(_retry_pause())
                     # Use specific session for analysis context
                     response_text = str(
                         self.lotl.chat(
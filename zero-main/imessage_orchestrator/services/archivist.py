@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import copy
 import json
 import logging
-import copy
+import math
 import datetime
+import functools
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from config import prompts
 from config.prompts import PROACTIVE_INITIATION_INJECTION
-from utils.atomic import atomic_write_json
+from utils.atomic import atomic_write_bytes
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator; stdlib json is the fallback
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +29,14 @@ MIN_SIGNIFICANT_INTENSITY = 0.2  # Minimum intensity for emotion to be included
 STRONG_INTENSITY_THRESHOLD = 0.6  # Threshold for "strong" emotion label
 MODERATE_INTENSITY_THRESHOLD = 0.4  # Threshold for "moderate" emotion label
 HOURS_PER_DAY = 24  # Time conversion factor
+_SECONDS_PER_DAY = 86400.0
+
+# Parsed profiles kept by peek_profile(), validated against the file's stat.
+PROFILE_CACHE_SIZE = 256
+
+# Startup reconciliation of legacy numeric-only duplicate profiles.
+LEGACY_MIGRATION_PARALLEL_THRESHOLD = 4
+LEGACY_MIGRATION_MAX_WORKERS = 8
 
 # Advanced Red Team Schema V4.0 - Split Architecture
 # 
@@ -140,6 +160,115 @@ DEFAULT_PROFILE_TEMPLATE: Dict[str, Any] = {
     "strategic_state": {}
 }
 
+
+# Projection of the profile schema that is sent to the Delegate: each entry is
+# a top-level section plus the orchestrator-only/deprecated keys stripped from it.
+_LLM_CONTEXT_FIELDS: tuple[tuple[str, frozenset[str]], ...] = (
+    ("identity_matrix", frozenset({"handle", "last_interaction_epoch"})),
+    ("psychometric_profile", frozenset()),
+    ("strategic_intel", frozenset()),
+    ("operational_state", frozenset({"limerence_index", "compliance_score", "active_tactic"})),
+    ("knowledge_graph", frozenset()),
+    ("narrative_summaries", frozenset()),
+    ("operator_context", frozenset()),
+)
+
+
+# Both persona prompt variants are built once; prompts only change on restart.
+_BASE_PROMPT: str = prompts.GLOBAL_PERSONA_SYSTEM_PROMPT
+_BASE_PROMPT_PROACTIVE: str = _BASE_PROMPT + "\n" + PROACTIVE_INITIATION_INJECTION
+
+_RESPONSE_FOOTER = "\n---\nRespond naturally to the last message. Be brief. No reasoning output.\n"
+
+
+# Recent-message sender classification (see _message_sender).
+_ME_SENDERS = frozenset({"you", "me", "myself", "operator"})
+_ME_ROLES = frozenset({"assistant", "me"})
+_TRUTHY_FLAGS = frozenset({"1", "true", "yes", "y"})
+
+
+def _is_from_me(value: object) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return int(value) == 1
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUTHY_FLAGS
+    return False
+
+
+def _lowered(value: object) -> str:
+    if isinstance(value, str):
+        return value.strip().lower()
+    return str(value).strip().lower() if value else ""
+
+
+def _message_sender(msg: Dict) -> str:
+    """Return "ME" or "THEY" for a recent-message dict.
+
+    Supports both field naming conventions:
+    - sender/role (from fetch_last_messages_with_timestamps)
+    - is_from_me (legacy from fetch_recent_history)
+    """
+    if "sender" in msg:
+        return "ME" if _lowered(msg["sender"]) in _ME_SENDERS else "THEY"
+    if "role" in msg:
+        return "ME" if _lowered(msg["role"]) in _ME_ROLES else "THEY"
+    return "ME" if _is_from_me(msg.get("is_from_me")) else "THEY"
+
+
+@functools.lru_cache(maxsize=64)
+def _tz(name: str) -> ZoneInfo:
+    """Resolve (and memoize) a timezone name; avoids re-reading tzdata per message."""
+    return ZoneInfo(name)
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse a profile file's bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_indented_bytes(data: Any) -> bytes:
+    """Serialize *data* as 2-space indented UTF-8 JSON bytes (the on-disk profile format)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str
+            )
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _dumps_indented(data: Any) -> str:
+    """Serialize *data* as 2-space indented JSON text for prompt injection."""
+    return _dumps_indented_bytes(data).decode("utf-8")
+
+
+def _flatten_defaults(
+    template: Dict[str, Any], parents: tuple[str, ...] = ()
+) -> List[tuple[tuple[str, ...], str, Any, bool]]:
+    """Flatten a template into ``(parents, key, default, is_mutable)`` leaves.
+
+    Empty dicts are leaves (reserved sections); non-empty dicts are descended.
+    """
+    leaves: List[tuple[tuple[str, ...], str, Any, bool]] = []
+    for k, v in template.items():
+        if isinstance(v, dict) and v:
+            leaves.extend(_flatten_defaults(v, parents + (k,)))
+        else:
+            leaves.append((parents, k, v, isinstance(v, (dict, list))))
+    return leaves
+
+
+_DEFAULT_PATHS = _flatten_defaults(DEFAULT_PROFILE_TEMPLATE)
+
+# Pre-serialized template; _create_template decodes a private copy from it.
+_DEFAULT_PROFILE_TEMPLATE_JSON: bytes = json.dumps(DEFAULT_PROFILE_TEMPLATE).encode("utf-8")
+
+
 class Archivist:
     """Context Manager: Parses refined JSON fields and injects them into the system prompt."""
 
@@ -159,6 +288,11 @@ class Archivist:
             self.base_path.mkdir(parents=True, exist_ok=True)
             logger.warning(f"Could not use requested path, falling back to {self.base_path}")
 
+        self._profile_cache: OrderedDict[str, tuple[tuple[int, int, int], Dict]] = OrderedDict()
+        self._profile_cache_lock = threading.Lock()
+        # handle -> (profile file st_mtime_ns, its filtered prompt JSON)
+        self._filtered_json_cache: Dict[str, tuple[int, str]] = {}
+
         self._archive_legacy_duplicate_profiles()
 
     def _archive_legacy_duplicate_profiles(self) -> None:
@@ -166,19 +300,28 @@ class Archivist:
 
         Prevents operators accidentally editing the wrong profile when both
         `150...json` and `+150...json` exist. Preserves legacy files under
-        `_legacy/` for audit/rollback.
+        `_legacy/` for audit/rollback. A pending ``force_trigger`` on the
+        legacy file is mirrored onto the canonical profile before it moves.
         """
         try:
-            files = list(self.base_path.glob("*.json"))
-            stem_set = {f.stem for f in files}
+            stems = self._profile_stems()
+            stem_set = set(stems)
             legacy_dir = self.base_path / "_legacy"
 
-            for f in files:
-                stem = f.stem
-                if not stem.isdigit():
-                    continue
-                if ("+" + stem) not in stem_set:
-                    continue
+            legacy_stems = [
+                stem for stem in stems if stem.isdigit() and ("+" + stem) in stem_set
+            ]
+
+            # Mirroring reads two profiles per stem; overlap that IO on slow shared volumes.
+            if len(legacy_stems) > LEGACY_MIGRATION_PARALLEL_THRESHOLD:
+                with ThreadPoolExecutor(max_workers=LEGACY_MIGRATION_MAX_WORKERS) as pool:
+                    list(pool.map(self._mirror_legacy_force_trigger, legacy_stems))
+            else:
+                for stem in legacy_stems:
+                    self._mirror_legacy_force_trigger(stem)
+
+            for stem in legacy_stems:
+                f = self._path_for(stem)
 
                 legacy_dir.mkdir(parents=True, exist_ok=True)
                 dest = legacy_dir / f.name
@@ -193,36 +336,100 @@ class Archivist:
         except Exception as e:
             logger.warning(f"Failed to archive legacy duplicate profiles: {e}")
 
+    def _profile_stems(self) -> List[str]:
+        """List profile file stems via scandir (dirent type avoids a stat per entry).
+
+        Dotfiles (e.g. macOS ``._*`` resource forks) are skipped, as ``glob("*.json")`` did.
+        """
+        with os.scandir(self.base_path) as it:
+            return [
+                e.name[:-5]
+                for e in it
+                if e.name.endswith(".json") and not e.name.startswith(".") and e.is_file()
+            ]
+
+    def _mirror_legacy_force_trigger(self, stem: str) -> None:
+        """Carry a legacy duplicate's force_trigger over to its '+' profile."""
+        try:
+            # Read the legacy file directly: load_profile(stem) resolves to the '+' file.
+            legacy = _loads(self._path_for(stem).read_bytes())
+            if not legacy.get("pacing_engine", {}).get("force_trigger", False):
+                return
+            canonical_profile = self.load_profile("+" + stem)
+            if canonical_profile.get("pacing_engine", {}).get("force_trigger", False):
+                return
+            canonical_profile.setdefault("pacing_engine", {})["force_trigger"] = True
+            self.update_profile("+" + stem, canonical_profile)
+        except Exception as e:
+            logger.warning(f"Failed to mirror force_trigger from legacy profile {stem}: {e}")
+
     def _path_for(self, handle: str) -> Path:
-        # Keep the + prefix - it's part of the handle identity
-        safe_handle = handle.strip()
-        return self.base_path / f"{safe_handle}.json"
+        # Keep the + prefix - it's part of the handle identity.
+        # Callers pass handles already stripped at the public API boundary.
+        return self.base_path / f"{handle}.json"
 
     def _canonicalize_handle(self, handle: str) -> str:
-        h = handle.strip()
-        if h.startswith("+"):
-            return h
+        """Normalize a pre-stripped handle (digits-only phone numbers gain a '+')."""
+        if handle.startswith("+"):
+            return handle
         # If it looks like a phone number, normalize to +E.164-ish
-        if h.isdigit():
-            return "+" + h
-        return h
+        if handle.isdigit():
+            return "+" + handle
+        return handle
 
-    def load_profile(self, handle: str) -> Dict:
+    def _resolve_profile_path(self, handle: str) -> tuple[str, Path]:
+        """Return ``(canonical, path)`` for a stripped handle, preferring the canonical file."""
         canonical = self._canonicalize_handle(handle)
         file_path = self._path_for(canonical)
-        legacy_path = self._path_for(handle)
         
         # Backward-compatible: if caller uses +handle but file exists without '+', load legacy.
-        if not file_path.exists() and handle != canonical and legacy_path.exists():
-            file_path = legacy_path
+        if handle != canonical and not file_path.exists():
+            legacy_path = self._path_for(handle)
+            if legacy_path.exists():
+                file_path = legacy_path
+        return canonical, file_path
+
+    def peek_profile(self, handle: str) -> Dict:
+        """Read-only variant of `load_profile` backed by an in-memory LRU.
+
+        Entries are keyed by path and validated against the file's
+        ``(st_mtime_ns, st_size, st_ino)``; `update_profile` replaces the file,
+        which invalidates the entry naturally. The returned dict is shared
+        between callers and MUST NOT be mutated - use `load_profile` for
+        read-modify-write.
+        """
+        canonical, file_path = self._resolve_profile_path(handle.strip())
+        try:
+            st = file_path.stat()
+        except OSError:
+            return self._create_template(canonical)
+
+        key = str(file_path)
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with self._profile_cache_lock:
+            entry = self._profile_cache.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._profile_cache.move_to_end(key)
+                return entry[1]
+
+        profile = self.load_profile(handle)
+        with self._profile_cache_lock:
+            self._profile_cache[key] = (stamp, profile)
+            self._profile_cache.move_to_end(key)
+            while len(self._profile_cache) > PROFILE_CACHE_SIZE:
+                self._profile_cache.popitem(last=False)
+        return profile
+
+    def load_profile(self, handle: str) -> Dict:
+        handle = handle.strip()
+        canonical, file_path = self._resolve_profile_path(handle)
 
         if file_path.exists():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Merge with default to ensure new fields exist
-                    # Ensure identity handle uses canonical form
-                    return self._merge_defaults(data, DEFAULT_PROFILE_TEMPLATE, canonical)
+                data = _loads(file_path.read_bytes())
+                # Merge with default to ensure new fields exist
+                # Ensure identity handle uses canonical form
+                return self._merge_defaults(data, canonical)
             except Exception as e:
                 logger.warning(f"Failed to load profile for {handle}: {e}")
                 return self._create_template(canonical)
@@ -231,12 +438,12 @@ class Archivist:
 
     def has_profile(self, handle: str) -> bool:
         """Check if a profile exists on disk for this handle."""
-        canonical = self._canonicalize_handle(handle)
+        canonical = self._canonicalize_handle(handle.strip())
         return self._path_for(canonical).exists()
 
     def delete_profile(self, handle: str) -> bool:
         """Permanently remove a profile from disk."""
-        canonical = self._canonicalize_handle(handle)
+        canonical = self._canonicalize_handle(handle.strip())
         path = self._path_for(canonical)
         if path.exists():
             try:
@@ -250,62 +457,33 @@ class Archivist:
 
 
     def _create_template(self, handle: str) -> Dict:
-        import copy # Ensure copy is imported locally just in case of weird scoping/reload issues
-        profile = copy.deepcopy(DEFAULT_PROFILE_TEMPLATE)
+        # Decoding the pre-serialized template yields a fresh deep structure far cheaper than deepcopy.
+        profile = _loads(_DEFAULT_PROFILE_TEMPLATE_JSON)
         profile["identity_matrix"]["handle"] = handle
         now_ts = datetime.datetime.now().timestamp()
         profile["identity_matrix"]["last_interaction_epoch"] = now_ts
         return profile
 
     def get_all_handles(self) -> List[str]:
-        """Returns a list of all handles with profiles."""
-        stems = [f.stem for f in self.base_path.glob("*.json")]
-        stem_set = set(stems)
-
-        handles: list[str] = []
-        seen: set[str] = set()
-
-        for stem in stems:
-            canonical = self._canonicalize_handle(stem)
-
-            # If both 150... and +150... exist, prefer the + form.
-            if stem.isdigit() and ("+" + stem) in stem_set:
-                # If the legacy file has a force_trigger, mirror it over to the canonical file.
-                try:
-                    legacy = self.load_profile(stem)
-                    canonical_profile = self.load_profile("+" + stem)
-                    legacy_force = bool(legacy.get("pacing_engine", {}).get("force_trigger", False))
-                    canonical_force = bool(canonical_profile.get("pacing_engine", {}).get("force_trigger", False))
-                    if legacy_force and not canonical_force:
-                        canonical_profile.setdefault("pacing_engine", {})["force_trigger"] = True
-                        self.update_profile("+" + stem, canonical_profile)
-                        legacy.setdefault("pacing_engine", {})["force_trigger"] = False
-                        self.update_profile(stem, legacy)
-                except Exception:
-                    pass
-                continue
-
-            if canonical in seen:
-                continue
-            seen.add(canonical)
-            handles.append(canonical)
+        """Returns a sorted list of all canonical handles with profiles.
 
-        return handles
+        Legacy numeric duplicates are reconciled by
+        `_archive_legacy_duplicate_profiles` at startup, so this is a pure
+        in-memory pass over the directory listing.
+        """
+        return sorted({self._canonicalize_handle(stem) for stem in self._profile_stems()})
 
     def _compute_immediate_context(self, profile: Dict) -> Dict:
         """Compute live time awareness for the Delegate."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-        
         ident = profile.get("identity_matrix", {})
         tz_name = ident.get("timezone", "America/New_York")
 
         try:
-            tz = ZoneInfo(tz_name)
-        except Exception:
-            tz = ZoneInfo("America/New_York")
+            tz = _tz(tz_name)
+        except (ZoneInfoNotFoundError, ValueError, TypeError):
+            tz = _tz("America/New_York")
 
-        now = datetime.now(tz)
+        now = datetime.datetime.now(tz)
         hour = now.hour
         day_name = now.strftime("%A")
         
@@ -352,16 +530,26 @@ class Archivist:
             "is_weekend": is_weekend
         }
 
-    def _merge_defaults(self, data: Dict, template: Dict, handle: str, _depth: int = 0) -> Dict:
-        """Recursively merge defaults so we don't break if schema evolves."""
-        for k, v in template.items():
-            if k not in data:
-                data[k] = v
-            elif isinstance(v, dict) and isinstance(data[k], dict):
-                self._merge_defaults(data[k], v, handle, _depth + 1)
-                
+    def _merge_defaults(self, data: Dict, handle: str) -> Dict:
+        """Fill in missing template fields so we don't break if schema evolves.
+
+        Walks the pre-flattened `_DEFAULT_PATHS` instead of recursing over the
+        template. Existing non-dict values are left untouched, and mutable
+        defaults are deep-copied so profiles never share state with the
+        template.
+        """
+        for parents, key, value, mutable in _DEFAULT_PATHS:
+            d = data
+            for p in parents:
+                d = d.setdefault(p, {})
+                if not isinstance(d, dict):
+                    break
+            else:
+                if key not in d:
+                    d[key] = copy.deepcopy(value) if mutable else value
+
         # Ensure handle is set at root level
-        if _depth == 0 and "identity_matrix" in data:
+        if isinstance(data.get("identity_matrix"), dict):
             data["identity_matrix"]["handle"] = handle
         return data
 
@@ -373,47 +561,16 @@ class Archivist:
         This prevents wasting tokens on internal state that the delegate doesn't need.
         """
         
-        # Create a filtered copy
         filtered = {}
-        
-        
-        # Include identity_matrix but strip orchestrator-only fields
-        if "identity_matrix" in profile:
-            im = copy.deepcopy(profile["identity_matrix"])
-            # Remove orchestrator-only fields
-            im.pop("handle", None)  # Not needed by LLM
-            im.pop("last_interaction_epoch", None)  # Not needed by LLM
-            filtered["identity_matrix"] = im
-        
-        # Include psychometric_profile (all fields are LLM-relevant)
-        if "psychometric_profile" in profile:
-            filtered["psychometric_profile"] = copy.deepcopy(profile["psychometric_profile"])
-        
-        # Include strategic_intel (all fields are LLM-relevant)
-        if "strategic_intel" in profile:
-            filtered["strategic_intel"] = copy.deepcopy(profile["strategic_intel"])
-        
-        # Include operational_state but strip orchestrator-only fields
-        if "operational_state" in profile:
-            op = copy.deepcopy(profile["operational_state"])
-            # Remove deprecated/unused metrics
-            op.pop("limerence_index", None)  # Deprecated
-            op.pop("compliance_score", None)  # Deprecated
-            op.pop("active_tactic", None)  # Deprecated
-            filtered["operational_state"] = op
-        
-        # Include knowledge_graph (LLM-relevant)
-        if "knowledge_graph" in profile:
-            filtered["knowledge_graph"] = copy.deepcopy(profile["knowledge_graph"])
-        
-        # Include narrative_summaries (LLM-relevant)
-        if "narrative_summaries" in profile:
-            filtered["narrative_summaries"] = copy.deepcopy(profile["narrative_summaries"])
-        
-        # Include operator_context (LLM-relevant)
-        if "operator_context" in profile:
-            filtered["operator_context"] = profile["operator_context"]
-        
+        for key, dropped in _LLM_CONTEXT_FIELDS:
+            if key not in profile:
+                continue
+            value = profile[key]
+            if dropped and isinstance(value, dict):
+                value = {k: v for k, v in value.items() if k not in dropped}
+            # No copy needed: the result is only serialized into the prompt and discarded.
+            filtered[key] = value
+
         # Explicitly EXCLUDE orchestrator-only fields:
         # - pacing_engine (timing logic only)
         # - requires_approval (orchestrator control only)
@@ -443,13 +600,17 @@ class Archivist:
         if not events:
             return ""
         
-        now = datetime.datetime.now()
+        now_ts = datetime.datetime.now().timestamp()
         active = []
         
         for event in events:
             try:
-                detected_at = datetime.datetime.fromisoformat(event.get("detected_at", ""))
-                age_days = (now - detected_at).total_seconds() / datetime.timedelta(days=1).total_seconds()
+                detected_ts = event.get("detected_at_epoch")
+                if detected_ts is None:
+                    # Legacy events only carry the ISO string (naive or tz-aware).
+                    detected_ts = datetime.datetime.fromisoformat(event.get("detected_at", "")).timestamp()
+                # Clamped so a future timestamp (clock skew) can't amplify intensity
+                age_days = max(0.0, (now_ts - float(detected_ts)) / _SECONDS_PER_DAY)
                 
                 # Skip if too old
                 if age_days > max_age_days:
@@ -457,13 +618,16 @@ class Archivist:
                 
                 # Calculate decayed intensity using half-life formula
                 # intensity_now = intensity_original * (0.5 ** (age_days / decay_days))
-                decay_days = float(event.get("decay_days", 3.0))
                 original_intensity = float(event.get("intensity", 0.5))
+                # Decay only lowers intensity, so weak events can't qualify.
+                if original_intensity < MIN_SIGNIFICANT_INTENSITY:
+                    continue
+                decay_days = float(event.get("decay_days", 3.0))
                 
                 if decay_days <= 0:
                     decay_days = 3.0  # Default half-life
                     
-                decayed_intensity = original_intensity * (0.5 ** (age_days / decay_days))
+                decayed_intensity = original_intensity * math.exp2(-age_days / decay_days)
                 
                 # Only include if still significant
                 if decayed_intensity >= MIN_SIGNIFICANT_INTENSITY:
@@ -524,109 +688,133 @@ class Archivist:
         Returns:
             Dict with system_instruction and contact fields
         """
-        import pytz
-        
-        base_prompt = prompts.GLOBAL_PERSONA_SYSTEM_PROMPT
-        
+        # --- PROACTIVE, NOTHING TO REACT TO (scheduler fast path) ---
+        if is_proactive and not recent_messages and not analyst_report:
+            return self._fast_proactive(profile)
+
         # --- PROACTIVE INITIATION INJECTION ---
-        if is_proactive:
-            base_prompt += "\n" + PROACTIVE_INITIATION_INJECTION
+        base_prompt = _BASE_PROMPT_PROACTIVE if is_proactive else _BASE_PROMPT
         
         # --- CURRENT TIME AWARENESS ---
-        now = datetime.datetime.now()
-        target_tz_str = profile.get("identity_matrix", {}).get("timezone", "America/New_York")
-        try:
-            target_tz = pytz.timezone(target_tz_str)
-            target_now = datetime.datetime.now(target_tz)
-        except:
-            target_now = now
-        
-        day_name = target_now.strftime("%A")
-        hour = target_now.hour
-        
-        if 5 <= hour < 12:
-            time_of_day = "morning"
-        elif 12 <= hour < 17:
-            time_of_day = "afternoon"
-        elif 17 <= hour < 21:
-            time_of_day = "evening"
-        else:
-            time_of_day = "night"
-        
-        context_injection = f"\n\n---\n\n## CURRENT TIME\nIt is {day_name} {time_of_day} ({target_now.strftime('%I:%M %p')}) in their timezone.\n"
+        parts: list[str] = [base_prompt, self._current_time_section(profile)]
         
         # --- TIER 1 CONTEXT REPORT (if available) ---
         if analyst_report:
-            context_injection += "\n## CONTEXT REPORT (Tier 1 Analyst, JSON)\n```json\n"
-            context_injection += str(analyst_report).strip() + "\n"
-            context_injection += "```\n"
+            parts.append("\n## CONTEXT REPORT (Tier 1 Analyst, JSON)\n```json\n")
+            parts.append(str(analyst_report).strip())
+            parts.append("\n```\n")
         
-        # --- EMOTIONAL CARRYOVER (ESV with decay) ---
-        emotional_context = self._get_active_emotional_context(profile)
-        if emotional_context:
-            context_injection += f"\n{emotional_context}\n"
-        
-        # --- FILTERED JSON CONTEXT (LLM-relevant fields only) ---
-        # Remove orchestrator-only fields to save tokens
-        filtered_profile = self._filter_for_llm_context(profile)
-        
-        context_injection += "\n## CONTACT PROFILE (JSON)\n```json\n"
-        context_injection += json.dumps(filtered_profile, indent=2, default=str)
-        context_injection += "\n```\n"
+        # --- EMOTIONAL CARRYOVER + FILTERED PROFILE JSON ---
+        self._append_profile_sections(parts, profile)
         
         # --- RECENT MESSAGES (Raw, with timestamps) ---
         if recent_messages:
             # Compute a rough length target based on THEIR recent messages.
-            their_lengths: list[int] = []
-            context_injection += f"\n## RECENT CONVERSATION (Last {len(recent_messages)} Messages)\n"
+            their_sum = 0
+            their_count = 0
+            parts.append(f"\n## RECENT CONVERSATION (Last {len(recent_messages)} Messages)\n")
             for msg in recent_messages:
-                # Support both field naming conventions:
-                # - is_from_me (legacy from fetch_recent_history)
-                # - sender/role (from fetch_last_messages_with_timestamps)
-                def _is_from_me(value: object) -> bool:
-                    if isinstance(value, bool):
-                        return value
-                    if isinstance(value, (int, float)):
-                        return int(value) == 1
-                    if isinstance(value, str):
-                        v = value.strip().lower()
-                        return v in {"1", "true", "yes", "y"}
-                    return False
-
-                if "sender" in msg:
-                    s = str(msg.get("sender") or "").strip().lower()
-                    sender = "ME" if s in {"you", "me", "myself", "operator"} else "THEY"
-                elif "role" in msg:
-                    r = str(msg.get("role") or "").strip().lower()
-                    sender = "ME" if r in {"assistant", "me"} else "THEY"
-                else:
-                    sender = "ME" if _is_from_me(msg.get("is_from_me")) else "THEY"
+                sender = _message_sender(msg)
                 ts_str = msg.get('time_ago', 'Recently')
                 text = msg.get('text', '')
                 if sender == "THEY":
-                    their_lengths.append(len(str(text or "").strip()))
-                context_injection += f"[{ts_str}] {sender}: {text}\n"
+                    their_sum += len(str(text or "").strip())
+                    their_count += 1
+                parts.append(f"[{ts_str}] {sender}: {text}\n")
 
-            if their_lengths:
-                avg = int(sum(their_lengths) / max(1, len(their_lengths)))
+            if their_count:
+                avg = their_sum // their_count
                 # Give a small band so it doesn't feel mechanical.
                 low = max(20, int(avg * 0.7))
                 high = max(low + 10, int(avg * 1.2))
-                context_injection += (
+                parts.append(
                     "\n## LENGTH MIRRORING\n"
                     f"Target length: ~{avg} characters. Aim for {low}–{high} characters unless context demands otherwise.\n"
                 )
         
-        context_injection += "\n---\nRespond naturally to the last message. Be brief. No reasoning output.\n"
+        parts.append(_RESPONSE_FOOTER)
         
         return {
-            "system_instruction": base_prompt + context_injection,
+            "system_instruction": "".join(parts),
             "contact": profile  # Pass full profile for potential fallback usage
         }
 
+    def _fast_proactive(self, profile: Dict) -> Dict:
+        """Specialized `build_context_payload` for proactive ticks with no report or history."""
+        parts: list[str] = [_BASE_PROMPT_PROACTIVE, self._current_time_section(profile)]
+        self._append_profile_sections(parts, profile)
+        parts.append(_RESPONSE_FOOTER)
+        return {
+            "system_instruction": "".join(parts),
+            "contact": profile
+        }
+
+    def _current_time_section(self, profile: Dict) -> str:
+        """Render the CURRENT TIME block in the contact's timezone."""
+        target_tz_str = profile.get("identity_matrix", {}).get("timezone", "America/New_York")
+        try:
+            target_tz = _tz(target_tz_str)
+        except (ZoneInfoNotFoundError, ValueError, TypeError):
+            target_tz = _tz("America/New_York")
+        target_now = datetime.datetime.now(target_tz)
+        
+        day_name = target_now.strftime("%A")
+        hour = target_now.hour
+        
+        if 5 <= hour < 12:
+            time_of_day = "morning"
+        elif 12 <= hour < 17:
+            time_of_day = "afternoon"
+        elif 17 <= hour < 21:
+            time_of_day = "evening"
+        else:
+            time_of_day = "night"
+        
+        return f"\n\n---\n\n## CURRENT TIME\nIt is {day_name} {time_of_day} ({target_now.strftime('%I:%M %p')}) in their timezone.\n"
+
+    def _append_profile_sections(self, parts: List[str], profile: Dict) -> None:
+        """Append emotional carryover and the LLM-filtered profile JSON to *parts*."""
+        # --- EMOTIONAL CARRYOVER (ESV with decay) ---
+        emotional_context = self._get_active_emotional_context(profile)
+        if emotional_context:
+            parts.append(f"\n{emotional_context}\n")
+        
+        # --- FILTERED JSON CONTEXT (LLM-relevant fields only) ---
+        # Remove orchestrator-only fields to save tokens
+        parts.append("\n## CONTACT PROFILE (JSON)\n```json\n")
+        parts.append(self._filtered_profile_json(profile))
+        parts.append("\n```\n")
+
+    def _filtered_profile_json(self, profile: Dict) -> str:
+        """Serialize the LLM view of *profile*, cached per handle until its file changes.
+
+        Entries are validated against the profile file's ``st_mtime_ns`` and
+        dropped by `update_profile`, so edits must be saved before they show
+        up in the prompt.
+        """
+        handle = profile.get("identity_matrix", {}).get("handle")
+        if not isinstance(handle, str) or not handle:
+            return _dumps_indented(self._filter_for_llm_context(profile))
+
+        try:
+            mtime_ns = self._resolve_profile_path(handle)[1].stat().st_mtime_ns
+        except OSError:
+            return _dumps_indented(self._filter_for_llm_context(profile))
+
+        entry = self._filtered_json_cache.get(handle)
+        if entry is not None and entry[0] == mtime_ns:
+            return entry[1]
+
+        text = _dumps_indented(self._filter_for_llm_context(profile))
+        self._filtered_json_cache[handle] = (mtime_ns, text)
+        return text
+
     def update_profile(self, handle: str, data: Dict):
+        handle = handle.strip()
+        self._filtered_json_cache.pop(self._canonicalize_handle(handle), None)
         file_path = self._path_for(handle)
-        atomic_write_json(file_path, data, indent=4)
+        # Indented on disk so operators can read and hand-edit profiles.
+        atomic_write_bytes(file_path, _dumps_indented_bytes(data))
 
     def store_interaction(self, handle: str, user_msg: str, agent_msg: str) -> Dict:
         """
@@ -634,7 +822,6 @@ class Archivist:
         Note: We no longer store text in 'recent_interactions' inside JSON to avoid duplication 
         with the primary chat database (Bridge/Watcher).
         """
-        import datetime
         profile = self.load_profile(handle)
         
         # Update last interaction epoch
@@ -1,28 +1,319 @@
+import functools
 import subprocess
 import logging
+import random
+import re
+import string
+import tempfile
+import threading
 import time
+from dataclasses import dataclass
+from pathlib import Path
 
 from config import settings
+from utils.db_client import connect_readonly, fetch_one
+
+try:  # PyObjC is macOS-only and optional; osascript remains the fallback.
+    from ScriptingBridge import SBApplication
+except ImportError:
+    SBApplication = None
 
 logger = logging.getLogger(__name__)
 
+MESSAGES_BUNDLE_ID = "com.apple.iChat"
+
+# Backslash/quote escaping for values interpolated into inline AppleScript.
+_APPLESCRIPT_ESCAPE = str.maketrans({"\\": "\\\\", '"': '\\"'})
+_PHONE_SEPARATORS = re.compile(r"[- ]")
+
+
+@functools.lru_cache(maxsize=2048)
+def _normalize_handle(handle: str) -> str:
+    """Normalize a handle - ensure +1 prefix for US numbers."""
+    if handle.isdigit():
+        if len(handle) == 10:
+            return "+1" + handle
+        if len(handle) == 11 and handle.startswith("1"):
+            return "+" + handle
+        return handle
+    if not handle.startswith("+"):
+        digits = _PHONE_SEPARATORS.sub("", handle)
+        if digits.isdigit():
+            if len(digits) == 10:
+                return "+1" + digits
+            if len(digits) == 11 and digits.startswith("1"):
+                return "+" + digits
+    return handle
+
+# Outcome of a single send attempt.
+_SEND_OK = "ok"
+_SEND_TRANSIENT = "transient"
+_SEND_PERMANENT = "permanent"
+
+# Error fragments that no retry can fix (unknown recipient, missing Automation
+# permission). Anything else is treated as transient and retried.
+_PERMANENT_ERROR_MARKERS: tuple[str, ...] = (
+    "can't get buddy",
+    "can’t get buddy",
+    "invalid buddy",
+    "buddy not found",
+    "-1728",  # errAENoSuchObject
+    "-1743",  # errAEEventNotPermitted
+    "not authorized",
+)
+
+
+def _classify_send_error(text: str) -> str:
+    lowered = text.lower()
+    if any(marker in lowered for marker in _PERMANENT_ERROR_MARKERS):
+        return _SEND_PERMANENT
+    return _SEND_TRANSIENT
+
+
+def _next_backoff(base: float, previous: float, cap: float) -> float:
+    """Decorrelated jitter: spreads retries so concurrent chats don't sync up."""
+    return min(cap, random.uniform(base, previous * 3))
+
+
+@dataclass(slots=True)
+class _CBState:
+    """Per-handle circuit breaker fed by consecutive permanent failures."""
+
+    consecutive_permanent: int = 0
+    open_until: float = 0.0
+
+
+# Send strategies in cascade order. The key is echoed back as "SUCCESS: <key>"
+# so the winning strategy can be remembered per handle.
+_STRATEGY_ORDER: tuple[str, ...] = ("imsg_chat", "sms_chat", "imsg_buddy", "sms_buddy")
+
+# chat.service_name -> chat strategy, used to pick the first strategy for a
+# handle we have never sent to from this process.
+_CHAT_SERVICE_STRATEGY = {"iMessage": "imsg_chat", "SMS": "sms_chat"}
+
+# Send routine compiled once with osacompile; the handle and strategies to try
+# arrive as argv and the message on stdin (argv is visible to any local user via
+# ps), so no per-send AppleScript parsing or escaping is needed.
+_SEND_SCRIPT_SOURCE = '''
+on sendVia(strategy, targetHandle, theMessage)
+    tell application "Messages"
+        if strategy is "imsg_chat" then
+            set theChat to a reference to chat id ("iMessage;-;" & targetHandle)
+            send theMessage to theChat
+        else if strategy is "sms_chat" then
+            set theChat to a reference to chat id ("SMS;-;" & targetHandle)
+            send theMessage to theChat
+        else if strategy is "imsg_buddy" then
+            send theMessage to buddy targetHandle of (1st service whose service type is iMessage)
+        else
+            send theMessage to buddy targetHandle of (1st service whose service type is SMS)
+        end if
+    end tell
+end sendVia
+
+on run argv
+    set targetHandle to item 1 of argv
+    try
+        set theMessage to read (POSIX file "/dev/stdin") as «class utf8»
+    on error
+        -- Never fall through to sending an empty message
+        return "ERROR: could not read message from stdin"
+    end try
+    set lastError to ""
+    repeat with i from 2 to (count of argv)
+        set strategy to item i of argv
+        try
+            sendVia(strategy, targetHandle, theMessage)
+            return "SUCCESS: " & strategy
+        on error e
+            set lastError to e
+        end try
+    end repeat
+    return "ERROR: All strategies failed. " & lastError
+end run
+'''
+
+# Inline (uncompiled) fallback statements per strategy; $HANDLE / $MSG are escaped values.
+_INLINE_STRATEGY_STATEMENTS: dict[str, str] = {
+    "imsg_chat": 'set theChat to a reference to chat id ("iMessage;-;" & "$HANDLE")\nsend "$MSG" to theChat',
+    "sms_chat": 'set theChat to a reference to chat id ("SMS;-;" & "$HANDLE")\nsend "$MSG" to theChat',
+    "imsg_buddy": 'send "$MSG" to buddy "$HANDLE" of (1st service whose service type is iMessage)',
+    "sms_buddy": 'send "$MSG" to buddy "$HANDLE" of (1st service whose service type is SMS)',
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _inline_script_template(strategies: tuple[str, ...]) -> string.Template:
+    """Nested try/on-error blocks trying *strategies* in order, built once per cascade."""
+    body = 'return "ERROR: All strategies failed. " & e'
+    for strategy in reversed(strategies):
+        stmt = _INLINE_STRATEGY_STATEMENTS[strategy]
+        body = (
+            f"try\n{stmt}\nreturn \"SUCCESS: {strategy}\"\n"
+            f"on error e\n{body}\nend try"
+        )
+    return string.Template(f'tell application "Messages"\n{body}\nend tell\n')
+
+
+def _build_inline_script(strategies: tuple[str, ...], safe_handle: str, safe_message: str) -> bytes:
+    """Render the inline script for *strategies* as UTF-8 ready for osascript's stdin."""
+    return _inline_script_template(strategies).substitute(HANDLE=safe_handle, MSG=safe_message).encode("utf-8")
+
 
 class iMessageBridge:
+    def __init__(self) -> None:
+        self._compiled_script: Path | None = None
+        self._compile_attempted = False
+        self._compile_lock = threading.Lock()
+        # normalized handle -> strategy key that last delivered successfully
+        self._strategy: dict[str, str] = {}
+        # normalized handle -> breaker state; cleared on the next success
+        self._breakers: dict[str, _CBState] = {}
+        self._breaker_lock = threading.Lock()
+        # normalized handle -> strategy suggested by chat.db (None = no existing chat)
+        self._chat_db_hints: dict[str, str | None] = {}
+        self._chat_db_enabled = getattr(settings, "BRIDGE_CHATDB_HINTS", True)
+        self._messages_app = None
+        self._sb_lock = threading.Lock()
+        if SBApplication is not None:
+            try:
+                self._messages_app = SBApplication.applicationWithBundleIdentifier_(MESSAGES_BUNDLE_ID)
+            except Exception as e:
+                logger.warning(f"[BRIDGE] ScriptingBridge unavailable ({e}); using osascript")
+
+    def _try_send_scripting_bridge(self, normalized_handle: str, message: str) -> bool:
+        """Send in-process via ScriptingBridge to an existing chat.
+
+        Returns False when ScriptingBridge is unavailable or no existing
+        iMessage/SMS chat resolves, so the caller falls back to osascript
+        (which also covers the buddy strategies).
+        """
+        if self._messages_app is None:
+            return False
+        try:
+            with self._sb_lock:
+                chats = self._messages_app.chats()
+                for prefix in ("iMessage", "SMS"):
+                    chat = chats.objectWithID_(f"{prefix};-;{normalized_handle}").get()
+                    if chat is None:
+                        continue
+                    self._messages_app.send_to_(message, chat)
+                    logger.info(f"[BRIDGE] Sent to {normalized_handle} via ScriptingBridge ({prefix} chat)")
+                    return True
+        except Exception as e:
+            logger.warning(f"[BRIDGE] ScriptingBridge send failed for {normalized_handle}: {e}")
+        return False
+
+    def _chat_db_strategy(self, normalized_handle: str) -> str | None:
+        """Suggest a chat strategy from the handle's existing chat in chat.db.
+
+        Read-only: chat.db is only consulted to skip cascade branches that
+        would fail. Any error disables the lookup for this process.
+        """
+        if not self._chat_db_enabled:
+            return None
+        if normalized_handle in self._chat_db_hints:
+            return self._chat_db_hints[normalized_handle]
+        try:
+            with connect_readonly(
+                settings.CHAT_DB_PATH,
+                retries=settings.DB_LOCKED_RETRIES,
+                backoff_seconds=settings.DB_LOCKED_BACKOFF_SECONDS,
+            ) as conn:
+                row = fetch_one(
+                    conn,
+                    "SELECT service_name FROM chat WHERE chat_identifier = ? ORDER BY ROWID DESC LIMIT 1",
+                    (normalized_handle,),
+                )
+        except Exception as e:
+            logger.warning(f"[BRIDGE] chat.db strategy lookup disabled ({e})")
+            self._chat_db_enabled = False
+            return None
+        hint = _CHAT_SERVICE_STRATEGY.get(row["service_name"]) if row is not None else None
+        self._chat_db_hints[normalized_handle] = hint
+        return hint
+
+    def _get_compiled_script(self) -> Path | None:
+        """Compile the send routine once; returns None if osacompile is unavailable."""
+        if self._compiled_script is not None and not self._compiled_script.exists():
+            # Temp dir was cleaned up underneath us; compile again.
+            self._compiled_script = None
+            self._compile_attempted = False
+        if self._compile_attempted:
+            return self._compiled_script
+        with self._compile_lock:
+            if self._compile_attempted:
+                return self._compiled_script
+            self._compile_attempted = True
+            try:
+                out = Path(tempfile.mkdtemp(prefix="imessage_bridge_")) / "send.scpt"
+                result = subprocess.run(
+                    ["osacompile", "-o", str(out)],
+                    input=_SEND_SCRIPT_SOURCE.encode("utf-8"),
+                    check=False,
+                    capture_output=True,
+                )
+                if result.returncode == 0 and out.exists():
+                    self._compiled_script = out
+                    logger.info(f"[BRIDGE] Compiled send script at {out}")
+                else:
+                    logger.warning(
+                        f"[BRIDGE] osacompile failed (returncode={result.returncode}); using inline AppleScript"
+                    )
+            except Exception as e:
+                logger.warning(f"[BRIDGE] osacompile unavailable ({e}); using inline AppleScript")
+            return self._compiled_script
+
+    def _breaker_open(self, normalized_handle: str) -> bool:
+        state = self._breakers.get(normalized_handle)
+        return state is not None and time.monotonic() < state.open_until
+
+    def _record_outcome(self, normalized_handle: str, outcome: str) -> None:
+        """Trip the handle's breaker after repeated permanent failures; reset on success."""
+        if outcome == _SEND_OK:
+            self._breakers.pop(normalized_handle, None)
+            return
+        if outcome != _SEND_PERMANENT:
+            return
+        threshold = getattr(settings, "BRIDGE_BREAKER_THRESHOLD", 3)
+        cooldown = getattr(settings, "BRIDGE_BREAKER_COOLDOWN", 300.0)
+        with self._breaker_lock:
+            state = self._breakers.setdefault(normalized_handle, _CBState())
+            state.consecutive_permanent += 1
+            if state.consecutive_permanent >= threshold:
+                state.open_until = time.monotonic() + cooldown
+                logger.warning(
+                    "[BRIDGE] Circuit open for %s after %d permanent failures (%.0fs)",
+                    normalized_handle, state.consecutive_permanent, cooldown,
+                )
+
     def send_message(self, handle: str, message: str, service: str = "iMessage") -> bool:
         """
         Executes AppleScript to send a message via the local Mac Messages app.
-        Retries with exponential backoff on transient failures.
+        Retries transient failures with jittered backoff; permanent failures
+        (unknown recipient, no Automation permission) abort immediately.
         Tries: direct chat lookup by ID, then buddy methods.
         """
+        normalized_handle = _normalize_handle(handle)
+        if self._breaker_open(normalized_handle):
+            logger.warning("[BRIDGE] Circuit open for %s; skipping send", handle)
+            return False
+
         retries = getattr(settings, "BRIDGE_SEND_RETRIES", 3)
         backoff = getattr(settings, "BRIDGE_SEND_BACKOFF", 2.0)
+        cap = getattr(settings, "BRIDGE_SEND_BACKOFF_CAP", 30.0)
+        wait = backoff
 
         for attempt in range(1, retries + 1):
-            success = self._try_send(handle, message, service)
-            if success:
+            outcome = self._try_send(handle, message, service)
+            self._record_outcome(normalized_handle, outcome)
+            if outcome == _SEND_OK:
                 return True
+            if outcome == _SEND_PERMANENT:
+                logger.error("[BRIDGE] Permanent send failure for %s; not retrying", handle)
+                return False
             if attempt < retries:
-                wait = backoff * (2 ** (attempt - 1))
+                wait = _next_backoff(backoff, wait, cap)
                 logger.warning(
                     "[BRIDGE] Send attempt %d/%d failed for %s. Retrying in %.1fs",
                     attempt, retries, handle, wait,
@@ -32,71 +323,73 @@ class iMessageBridge:
         logger.error("[BRIDGE] All %d send attempts failed for %s", retries, handle)
         return False
 
-    def _try_send(self, handle: str, message: str, service: str = "iMessage") -> bool:
-        """Single send attempt via AppleScript."""
-        # APPLESCRIPT ESCAPING LOGIC
-        safe_message = message.replace("\\", "\\\\").replace('"', '\\"')
-        safe_handle = handle.replace("\\", "\\\\").replace('"', '\\"')
-        
-        # Normalize handle - ensure +1 prefix for US numbers
-        normalized_handle = safe_handle
-        if safe_handle.isdigit() and len(safe_handle) == 10:
-            normalized_handle = "+1" + safe_handle
-        elif safe_handle.isdigit() and len(safe_handle) == 11 and safe_handle.startswith("1"):
-            normalized_handle = "+" + safe_handle
-        elif not safe_handle.startswith("+") and safe_handle.replace("-", "").replace(" ", "").isdigit():
-            digits = safe_handle.replace("-", "").replace(" ", "")
-            if len(digits) == 10:
-                normalized_handle = "+1" + digits
-            elif len(digits) == 11 and digits.startswith("1"):
-                normalized_handle = "+" + digits
-        
-        applescript = f'''
-        tell application "Messages"
-            -- STRATEGY 1: Direct Chat ID lookup (most reliable)
-            -- Try iMessage chat first, then SMS chat
-            try
-                set theChat to a reference to chat id ("iMessage;-;" & "{normalized_handle}")
-                send "{safe_message}" to theChat
-                return "SUCCESS: Direct iMessage Chat"
-            on error
-                try
-                    set theChat to a reference to chat id ("SMS;-;" & "{normalized_handle}")
-                    send "{safe_message}" to theChat
-                    return "SUCCESS: Direct SMS Chat"
-                on error
-                    -- STRATEGY 2: Buddy method fallback
-                    try
-                        send "{safe_message}" to buddy "{normalized_handle}" of (1st service whose service type is iMessage)
-                        return "SUCCESS: iMessage buddy"
-                    on error
-                        try
-                            send "{safe_message}" to buddy "{normalized_handle}" of (1st service whose service type is SMS)
-                            return "SUCCESS: SMS buddy"
-                        on error e
-                            return "ERROR: All strategies failed. " & e
-                        end try
-                    end try
-                end try
-            end try
-        end tell
-        '''
-        
+    def _try_send(self, handle: str, message: str, service: str = "iMessage") -> str:
+        """Single send attempt; returns _SEND_OK, _SEND_TRANSIENT or _SEND_PERMANENT."""
+        normalized_handle = _normalize_handle(handle)
+
+        if self._try_send_scripting_bridge(normalized_handle, message):
+            return _SEND_OK
+
+        # Re-use the strategy that worked last time (or the one chat.db suggests);
+        # on failure forget it and cascade.
+        cached = self._strategy.get(normalized_handle) or self._chat_db_strategy(normalized_handle)
+        if cached is not None:
+            outcome, _ = self._send_osascript(normalized_handle, message, (cached,), handle)
+            if outcome == _SEND_OK:
+                return _SEND_OK
+            self._strategy.pop(normalized_handle, None)
+            self._chat_db_hints[normalized_handle] = None
+
+        outcome, detail = self._send_osascript(normalized_handle, message, _STRATEGY_ORDER, handle)
+        if outcome == _SEND_OK and detail:
+            self._strategy[normalized_handle] = detail
+        return outcome
+
+    def _send_osascript(
+        self, normalized_handle: str, message: str, strategies: tuple[str, ...], handle: str
+    ) -> tuple[str, str]:
+        """Run one osascript send trying *strategies*; see `_run_osascript` for the result."""
+        compiled = self._get_compiled_script()
+        if compiled is not None:
+            return self._run_osascript(
+                ["osascript", str(compiled), normalized_handle, *strategies],
+                message.encode("utf-8"),
+                handle,
+                normalized_handle,
+            )
+
+        # Fallback: inline script, so values must be AppleScript-escaped.
+        applescript = _build_inline_script(
+            strategies,
+            normalized_handle.translate(_APPLESCRIPT_ESCAPE),
+            message.translate(_APPLESCRIPT_ESCAPE),
+        )
+        return self._run_osascript(["osascript", "-"], applescript, handle, normalized_handle)
+
+    def _run_osascript(
+        self, cmd: list[str], stdin: bytes | None, handle: str, normalized_handle: str
+    ) -> tuple[str, str]:
+        """Returns (outcome, detail): the winning strategy key on success, else the error text."""
         try:
-            result = subprocess.run(["osascript", "-"], input=applescript.encode('utf-8'), check=False, capture_output=True)
-            output = result.stdout.decode('utf-8').strip()
-            stderr = result.stderr.decode('utf-8').strip()
+            # The script's result is on stdout; osascript warnings and `log`
+            # lines go to stderr and only feed the failure logging.
+            result = subprocess.run(cmd, input=stdin, check=False, capture_output=True)
+            output = result.stdout.decode('utf-8', 'replace').strip()
+            stderr = result.stderr.decode('utf-8', 'replace').strip()
             
             logger.info(f"[BRIDGE] Sent to {normalized_handle}. Result: '{output}'")
             
             if result.returncode != 0:
+                 detail = stderr or output
                  logger.error(f"[BRIDGE ERROR] OsaScript failed. returncode={result.returncode}, stderr={stderr}")
-                 return False
+                 return _classify_send_error(detail), detail
 
             if output.startswith("ERROR"):
-                logger.error(f"AppleScript Error sending to {handle}: {output}")
-                return False
-            return True
+                logger.error(f"AppleScript Error sending to {handle}: {output} (stderr={stderr})")
+                return _classify_send_error(output), output
+            strategy = output.removeprefix("SUCCESS:").strip()
+            # "" still means success, just with nothing worth remembering.
+            return _SEND_OK, strategy if strategy in _INLINE_STRATEGY_STATEMENTS else ""
         except Exception as e:
             logger.error(f"ERROR: Failed to send message to {handle}. {e}")
-            return False
+            return _SEND_TRANSIENT, str(e)
@@ -1,35 +1,127 @@
 from __future__ import annotations
 
+import heapq
+import threading
 import time
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import attrgetter
 from typing import List
-from .interfaces import TransportWatcher, IncomingMessage
+from .interfaces import HistoryCapable, TransportWatcher, IncomingMessage
+
+# History is re-read several times per conversation turn; a short TTL lets
+# those back-to-back callers share one chat.db / store round-trip.
+HISTORY_CACHE_TTL_SECONDS = 2.0
+HISTORY_CACHE_SIZE = 512
+# Recently emitted messages, remembered to drop the same message seen twice.
+SEEN_MESSAGES_SIZE = 4096
+_SYNTH_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_BY_DATE = attrgetter("date")
+
+# Handle shapes only one transport can own; phone numbers are ambiguous.
+_WHATSAPP_JID_SUFFIXES = ("@s.whatsapp.net", "@c.us", "@g.us")
+
+
+def _seen_key(m: IncomingMessage) -> tuple[str, float, int]:
+    return (m.handle, m.date, hash(m.text))
+
+
+def _handle_transport(handle: str) -> str:
+    """Transport that must own *handle*, or "" when any transport could."""
+    if handle.startswith("whatsapp:") or handle.endswith(_WHATSAPP_JID_SUFFIXES):
+        return "WhatsApp"
+    if "@" in handle:
+        return "iMessage"  # Email handles only exist on iMessage.
+    return ""
 
 class CompositeWatcher:
     def __init__(self, walkers: List[TransportWatcher]):
         self.watchers = walkers
+        # Watchers poll independent I/O (chat.db, WhatsApp UI); overlap them.
+        self._pool: ThreadPoolExecutor | None = None
+        if len(walkers) > 1:
+            self._pool = ThreadPoolExecutor(
+                max_workers=len(walkers), thread_name_prefix="watcher"
+            )
+        # Optional capabilities differ per transport; resolve them once so
+        # the hot paths iterate bound methods instead of re-probing.
+        self._load_state = self._bound(walkers, "load_state")
+        self._verify = self._bound(walkers, "verify_permissions")
+        # History sources in watcher order, plus per-transport orderings that
+        # put the owning transport first for handles only it can serve.
+        history = [
+            (getattr(w, "transport_name", ""), w.fetch_recent_history)
+            for w in walkers
+            if isinstance(w, HistoryCapable)
+        ]
+        self._history_routes: dict[str, list] = {"": [fetch for _, fetch in history]}
+        for transport in {name for name, _ in history if name}:
+            owners = [fetch for name, fetch in history if name == transport]
+            rest = [fetch for name, fetch in history if name != transport]
+            self._history_routes[transport] = owners + rest
+        self._read = self._bound(walkers, "read_message")
+        self._fetch_ts = self._bound(walkers, "fetch_last_messages_with_timestamps")
+        self._hist_cache: OrderedDict[tuple[str, int], tuple[float, List[dict]]] = OrderedDict()
+        self._hist_cache_lock = threading.Lock()
+        self._seen: OrderedDict[tuple[str, float, int], None] = OrderedDict()
+        if len(walkers) == 1:
+            # Common single-transport deployment: no fan-out or merge needed.
+            self.initialize = walkers[0].initialize
+            self._sole_poll = walkers[0].poll
+            self.poll_new_messages = self._poll_single
+
+    @staticmethod
+    def _bound(walkers: List[TransportWatcher], name: str) -> list:
+        methods = (getattr(w, name, None) for w in walkers)
+        return [fn for fn in methods if callable(fn)]
+
+    def _fan_out(self, fns: list) -> list:
+        """Call each zero-arg callable concurrently; results in input order.
+
+        Exceptions propagate to the caller exactly as with sequential calls.
+        """
+        if self._pool is None or len(fns) < 2:
+            return [fn() for fn in fns]
+        futures = [self._pool.submit(fn) for fn in fns]
+        return [f.result() for f in futures]
 
     def initialize(self) -> None:
-        for w in self.watchers:
-            w.initialize()
+        self._fan_out([w.initialize for w in self.watchers])
 
     def load_state(self) -> None:
         # Some watchers define load_state, others don't in the interface.
         # But we know iMessageWatcher does.
-        for w in self.watchers:
-            if hasattr(w, "load_state"):
-                w.load_state()
-            if hasattr(w, "verify_permissions"):
-                w.verify_permissions()
+        self._fan_out(self._load_state)
+        self._fan_out(self._verify)
 
     def poll_new_messages(self) -> List[IncomingMessage]:
-        all_messages = []
-        for w in self.watchers:
-            all_messages.extend(w.poll())
-        
-        # Sort by date/timestamp if possible to preserve order
-        all_messages.sort(key=lambda m: m.date)
-        return all_messages
+        polls = self._fan_out([w.poll for w in self.watchers])
+        if not any(polls):
+            return []
+        self._invalidate_handles({m.handle for m in chain.from_iterable(polls)})
+        # Each watcher yields its batch in date order, so a linear k-way
+        # merge preserves global chronological order without a full sort.
+        return self._unseen(heapq.merge(*polls, key=_BY_DATE))
+
+    def _poll_single(self) -> List[IncomingMessage]:
+        polled = self._sole_poll()
+        if not polled:
+            return []
+        self._invalidate_handles({m.handle for m in polled})
+        return self._unseen(polled)
+
+    def _unseen(self, messages) -> List[IncomingMessage]:
+        fresh: List[IncomingMessage] = []
+        for m in messages:
+            key = _seen_key(m)
+            if key in self._seen:
+                continue
+            self._seen[key] = None
+            if len(self._seen) > SEEN_MESSAGES_SIZE:
+                self._seen.popitem(last=False)
+            fresh.append(m)
+        return fresh
     
     # Delegate other methods if needed, e.g. fetch_recent_history
     # But usually fetch_recent_history logic is specific to iMessage DB.
@@ -42,28 +134,60 @@ class CompositeWatcher:
         Tries each watcher in order.  The WhatsAppWatcher now has a
         persistent store-backed ``fetch_recent_history`` so WhatsApp
         contacts will get real history instead of empty lists.
+
+        Results are memoized for ``HISTORY_CACHE_TTL_SECONDS``; new inbound
+        messages and :meth:`invalidate` drop the entry early.
         """
-        for w in self.watchers:
-            if hasattr(w, "fetch_recent_history"):
-                try:
-                    hist = w.fetch_recent_history(handle=handle, limit=limit)
-                    if hist:
-                        return hist
-                except Exception:
-                    continue
-                    
-        return []
+        key = (handle, limit)
+        now = time.monotonic()
+        with self._hist_cache_lock:
+            cached = self._hist_cache.get(key)
+            if cached is not None and now - cached[0] < HISTORY_CACHE_TTL_SECONDS:
+                self._hist_cache.move_to_end(key)
+                return list(cached[1])
+
+        result: List[dict] = []
+        for fetch in self._route(handle):
+            try:
+                hist = fetch(handle=handle, limit=limit)
+                if hist:
+                    result = hist
+                    break
+            except Exception:
+                continue
+
+        with self._hist_cache_lock:
+            self._hist_cache[key] = (now, result)
+            self._hist_cache.move_to_end(key)
+            while len(self._hist_cache) > HISTORY_CACHE_SIZE:
+                self._hist_cache.popitem(last=False)
+        return list(result)
+
+    def _route(self, handle: str) -> list:
+        """History sources to try for *handle*, owning transport first."""
+        return self._history_routes.get(_handle_transport(handle), self._history_routes[""])
+
+    def invalidate(self, handle: str) -> None:
+        """Drop cached history for *handle* (e.g. after sending to it)."""
+        self._invalidate_handles((handle,))
+
+    def _invalidate_handles(self, handles) -> None:
+        if not handles:
+            return
+        with self._hist_cache_lock:
+            for key in [k for k in self._hist_cache if k[0] in handles]:
+                del self._hist_cache[key]
 
     def read_message(self, handle: str) -> str | None:
         """
         Actually read a message from a specific handle.
         This is for WhatsApp deferred reading - marks message as "read" (blue ticks).
         """
-        for w in self.watchers:
-            if hasattr(w, "read_message"):
-                result = w.read_message(handle)
-                if result:
-                    return result
+        for read in self._read:
+            result = read(handle)
+            if result:
+                self.invalidate(handle)
+                return result
         return None
 
     def fetch_last_messages_with_timestamps(self, *, handle: str, limit: int = 3) -> List[dict]:
@@ -76,42 +200,37 @@ class CompositeWatcher:
         """
 
         # Prefer a native implementation if any watcher provides it.
-        for w in self.watchers:
-            fn = getattr(w, "fetch_last_messages_with_timestamps", None)
-            if callable(fn):
-                try:
-                    msgs = fn(handle=handle, limit=limit)
-                    if msgs:
-                        return msgs
-                except Exception:
-                    # Try other watchers.
-                    continue
+        for fetch in self._fetch_ts:
+            try:
+                msgs = fetch(handle=handle, limit=limit)
+                if msgs:
+                    return msgs
+            except Exception:
+                # Try other watchers.
+                continue
 
+        return self._synthesized_timestamps(handle, limit)
+
+    def _synthesized_timestamps(self, handle: str, limit: int) -> List[dict]:
         # Fallback: derive from fetch_recent_history and add timestamp-like keys.
         hist = self.fetch_recent_history(handle=handle, limit=max(1, int(limit)))
         if not hist:
             return []
 
         now_unix = int(time.time())
-        now_str = datetime.fromtimestamp(now_unix).strftime("%Y-%m-%d %H:%M:%S")
-        out: list[dict] = []
+        now_str = time.strftime(_SYNTH_TIME_FORMAT, time.localtime(now_unix))
 
         # `fetch_recent_history` is typically [{role,text,date,...}] in chronological order.
-        for item in hist[-limit:]:
-            role = str(item.get("role", "user"))
-            text = str(item.get("text", "")).strip()
-            if not text:
-                continue
-            out.append(
-                {
-                    "sender": "Me" if role == "assistant" else "Them",
-                    "role": role,
-                    "text": text,
-                    "time": now_str,
-                    "time_ago": "",
-                    "unix_ts": now_unix,
-                }
-            )
-
-        return out
-
+        return [
+            {
+                "sender": "Me" if role == "assistant" else "Them",
+                "role": role,
+                "text": text,
+                "time": now_str,
+                "time_ago": "",
+                "unix_ts": now_unix,
+            }
+            for item in hist[-limit:]
+            if (text := str(item.get("text", "")).strip())
+            for role in (str(item.get("role", "user")),)
+        ]
@@ -1,46 +1,60 @@
 from __future__ import annotations
 
+import functools
 import logging
 import json
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any
 
 from config import prompts, settings
+from services.lotl_client import LotLClient
 
 logger = logging.getLogger(__name__)
 
-
-class RateLimitError(RuntimeError):
-    def __init__(self, *, provider: str, retry_after_seconds: float) -> None:
-        super().__init__(f"Rate limited by {provider}; retry after {retry_after_seconds:.1f}s")
-        self.provider = provider
-        self.retry_after_seconds = retry_after_seconds
+# google.generativeai is heavy and only needed for the gemini provider;
+# import it on first use and keep the module reference.
+_genai = None
 
 
-class Delegate:
-    """Execution service: LLM call to generate the reply text."""
-
-    def __init__(self, api_key: str | None = None, persona_name: str | None = None) -> None:
-        self.provider = settings.LLM_PROVIDER
-        # api_key and persona_name are available via settings/config but captured here for compatibility
-        self.api_key = api_key 
-        self.persona_name = persona_name
-
-    def _clean_output(self, text: str) -> str:
-        """Strip any reasoning/preamble leakage from model output.
-        
-        Strategy: Aggressively remove known reasoning patterns and artifacts.
-        CRITICAL: Analyst output must NEVER leak to contact - only delegate output.
-        Assume the LAST clean block is the message.
-        """
-        import re
-        
-        original = text.strip()
-        if not original:
-            return ""
-        
-        # 0. CRITICAL: Remove ANY analyst markers/output that might leak
-        # Analyst output is for delegate only, NEVER for contact
-        analyst_patterns = [
+def _get_genai():
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        _genai = genai
+    return _genai
+
+
+@functools.lru_cache(maxsize=4)
+def _gemini_endpoint(base_url: str) -> str:
+    """Reduce GEMINI_BASE_URL to the bare host the SDK's ``api_endpoint`` expects."""
+    return base_url.removeprefix("https://").removeprefix("http://").removesuffix("/")
+
+
+@functools.lru_cache(maxsize=4)
+def _get_gemini_model(api_key: str, base_url: str | None, model_name: str):
+    """Configure the SDK and build the reply model once per (key, endpoint, model).
+
+    The model binds its client on first use, so later ``genai.configure``
+    calls elsewhere (e.g. the analyst) don't change where replies go.
+    """
+    genai = _get_genai()
+    configure_kwargs: dict[str, Any] = {"api_key": api_key}
+    if base_url:
+        configure_kwargs["client_options"] = {"api_endpoint": _gemini_endpoint(base_url)}
+        configure_kwargs["transport"] = "rest"  # Cloudflare/Proxies usually valid via REST
+    genai.configure(**configure_kwargs)
+    return genai.GenerativeModel(model_name)
+
+# --- _clean_output patterns (compiled once; the function runs on every reply) ---
+
+# CRITICAL: Analyst output is for delegate only, NEVER for contact.
+# Fused into one alternation so the reply is scanned once, not once per pattern.
+_ANALYST_RE = re.compile(
+    '|'.join(
+        f'(?:{p})'
+        for p in (
             r'SYSTEM:(?:.|\n)*?USER REQUEST:', # Full prompt echo
             r'##\s*ANALYSIS\s*REQUEST', # Analyst prompt header
             r'##\s*YOUR\s*TASK', # Analyst task header
@@ -56,128 +70,354 @@ class Delegate:
             r'CONVERSATION\s*DYNAMICS.*?(?=\n\n|$)',  # Conversation dynamics
             r'##\s*TACTICAL\s*CONTEXT.*?(?=##|\n\n|$)',  # Markdown tactical headers (legacy)
             r'##\s*INTELLIGENCE\s*DOSSIER.*?(?=##|\n\n|$)',  # Markdown intelligence headers
-            r'⏰|📊|🎯|⚠️|📋|💕',  # Any analyst emoji markers alone
-        ]
-        
-        for pattern in analyst_patterns:
-            text = re.sub(pattern, '', original, flags=re.DOTALL | re.IGNORECASE)
-            original = text  # Chain the cleaning
-        
-        # 1. Remove XML-style thinking tags (common in some fine-tunes)
-        text = re.sub(r'<thinking>.*?</thinking>', '', text, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r'<reasoning>.*?</reasoning>', '', text, flags=re.DOTALL | re.IGNORECASE)
-        
-        # 2. Strip Gemini "Thinking" blocks that start with known headers
-        # These look like: "Thinking Analyzing Persona Context Okay, I'm working on..."
-        # They typically run until "Collapse to hide model thoughts" or similar
-        text = re.sub(
-            r'(?:^|\n)\s*(?:Thinking|Analyzing|Evaluating|Confirming|Prioritizing|Resolving|Interpreting|Reconciling)\s+[A-Z][^\n]*(?:\n(?!(?:Hey|Hi|Yo|What|So |I |You |We |Just |Miss|Thinking|Sup|Wassup|Haha|Lol|Hmm|Omg|Nah|Yeah|Yep|Bruh|Bro)[A-Z]?)[^\n]*)*',
-            '',
-            text,
-            flags=re.IGNORECASE
         )
+    ),
+    re.DOTALL | re.IGNORECASE,
+)
+# Any analyst emoji markers left alone once their sections are gone.
+# ⚠️ is two code points (U+26A0 U+FE0F), so it is removed with str.replace;
+# the rest are single code points erased by one translate pass.
+_ANALYST_WARNING_EMOJI = '⚠️'
+_ANALYST_EMOJI_STRIP = str.maketrans('', '', '⏰📊🎯📋💕')
+
+# XML-style thinking tags (common in some fine-tunes)
+_THINKING_TAG_RE = re.compile(r'<thinking>.*?</thinking>', re.DOTALL | re.IGNORECASE)
+_REASONING_TAG_RE = re.compile(r'<reasoning>.*?</reasoning>', re.DOTALL | re.IGNORECASE)
+
+# Gemini "Thinking" blocks: "Thinking Analyzing Persona Context Okay, I'm working on..."
+# A block opens on a line whose first word is one of these headers followed by
+# a capitalized word, and swallows following lines until one starts like a message.
+_THINKING_HEAD_RE = re.compile(
+    r'(?:Thinking|Analyzing|Evaluating|Confirming|Prioritizing|Resolving|Interpreting|Reconciling)\s+[A-Z][^\n]*',
+    re.IGNORECASE,
+)
+_THINKING_STOP_RE = re.compile(
+    r'(?:Hey|Hi|Yo|What|So |I |You |We |Just |Miss|Thinking|Sup|Wassup|Haha|Lol|Hmm|Omg|Nah|Yeah|Yep|Bruh|Bro)',
+    re.IGNORECASE,
+)
+_LEADING_WS_RE = re.compile(r'\s*')
+
+# UI artifacts scraped along with the reply
+_COLLAPSE_RE = re.compile(r'Collapse to hide model thoughts.*?(?=\n|$)', re.IGNORECASE)
+_CHEVRON_RE = re.compile(r'chevron_right', re.IGNORECASE)
+_SEND_PROMPT_RE = re.compile(r'Send prompt.*?(?:\(.*\))?', re.IGNORECASE)  # "Send prompt (⌘ + Enter)"
+
+_BLOCK_SPLIT_RE = re.compile(r'\n\s*\n')
+# Lines/blocks that are DEFINITELY not the message
+_REASONING_RE = re.compile(
+    r'^(?:thinking|strategy|analysis|reasoning|trajectory|assessment|internal|brainstorming|evaluating|confirming|prioritizing|resolving|interpreting|reconciling|okay,?\s*i\'?m|i\'?m\s*now|\[|#|---|\*\*)',
+    re.IGNORECASE,
+)
+# Literal alternatives of _REASONING_RE, checked with str.startswith on ASCII heads
+_REASONING_PREFIXES = (
+    "thinking", "strategy", "analysis", "reasoning", "trajectory", "assessment",
+    "internal", "brainstorming", "evaluating", "confirming", "prioritizing",
+    "resolving", "interpreting", "reconciling", "[", "#", "---", "**",
+)
+_REASONING_PHRASE_RE = re.compile(r"(?:okay,?\s*i'?m|i'?m\s*now)", re.IGNORECASE)
+# Generated one-line "Key: Value" headers to drop, e.g. "Tone: Casual".  The key
+# must be title-case, so "tone: casual" or "TONE: x" are kept as message text.
+_HEADER_SKIP_RE = re.compile(r'(?:Strategy|Tone|Intent|Goal|Summary):\s')
+_LABEL_PREFIX_RE = re.compile(r'^(?:response|draft|message|me|reply):\s*', re.IGNORECASE)
+_FILLER_PREFIX_RE = re.compile(
+    r'^(?:here\'?s?|my)\s+(?:is\s+)?(?:my\s+)?(?:draft|response|reply|message)(?: is)?[:\.]?\s*',
+    re.IGNORECASE,
+)
+_WS_RE = re.compile(r"\s+")
+
+# Case-folded substrings, grouped by pipeline stage, at least one of which each
+# stage's patterns need.  A stage whose sentinels are absent is skipped.
+_ANALYST_SENTINELS = (
+    'system:', '##', '=' * 20, 'tactical', 'intelligence', 'verification', 'dynamics',
+    '⏰', '📊', '🎯', '⚠️', '📋',
+)
+_TAG_SENTINELS = ('<thinking', '<reasoning')
+_THINKING_SENTINELS = (
+    'thinking', 'analyzing', 'evaluating', 'confirming', 'prioritizing', 'resolving',
+    'interpreting', 'reconciling',
+)
+_UI_SENTINELS = ('collapse to hide model thoughts', 'chevron_right', 'send prompt')
+# A single block can't lose text to candidate selection, so replies without
+# a blank line and without any of these skip the pipeline entirely.
+_CLEAN_SENTINELS = (
+    _ANALYST_SENTINELS + ('💕',) + _TAG_SENTINELS + _THINKING_SENTINELS + _UI_SENTINELS
+)
+# IGNORECASE also folds these onto ASCII 'i'; str.casefold() doesn't, so
+# text containing them runs every stage.
+_FOLD_MISSES = ('İ', 'ı')
+
+
+# Scaffolding that never belongs in a reply
+_LEAK_MARKERS = (
+    "system:",
+    "chat:",
+    "contact context:",
+    "instruction:",
+    "[system injection]",
+)
+# Raw prompt prefix normalized for the echo heuristics in _looks_like_prompt_leak
+_PROMPT_HEAD_SCAN = 256
+# Providers whose reply methods already return _clean_output text
+_SELF_CLEANING_PROVIDERS = frozenset({"lotl"})
+# Substrings that mark an AI Studio/LotL UI error page rather than a real reply
+_KNOWN_UI_ERRORS = (
+    "stop generation before creating a new chat",
+    "verify it's you",
+    "sign in",
+    "unusual traffic",
+    "captcha",
+    "something went wrong",
+    "an internal error has occurred",
+    "internal error",
+    "error an internal",
+    "server error",
+    "rate limit",
+    "too many requests",
+    "try again later",
+    "model is overloaded",
+    "temporarily unavailable",
+)
+_KNOWN_UI_ERROR_RE = re.compile("|".join(map(re.escape, _KNOWN_UI_ERRORS)))
+
+
+def _is_reasoning_block(content: str) -> bool:
+    """Return True when a block opens like meta-commentary (see _REASONING_RE)."""
+    head = content[:16]
+    if not head.isascii():
+        # re.IGNORECASE folds a few non-ASCII letters (e.g. 'ſ', 'İ') onto ASCII
+        return _REASONING_RE.match(content) is not None
+    return head.lower().startswith(_REASONING_PREFIXES) or _REASONING_PHRASE_RE.match(content) is not None
+
+
+def _strip_thinking_blocks(text: str) -> str:
+    """Remove Gemini "Thinking" blocks with a single forward scan over lines.
+
+    A block starts at the beginning of the text or at a newline (together with
+    any blank lines before the header) and ends before the first line that
+    opens with a greeting from _THINKING_STOP_RE.
+    """
+    n = len(text)
+    out: list[str] = []
+    kept = 0
+    line = 0
+    while line <= n:
+        head_at = _LEADING_WS_RE.match(text, line).end()
+        head = _THINKING_HEAD_RE.match(text, head_at)
+        if head is None:
+            # Any later line start up to head_at reaches the same header position
+            nl = text.find('\n', head_at)
+            if nl < 0:
+                break
+            line = nl + 1
+            continue
+        out.append(text[kept:line - 1 if line else 0])
+        end = head.end()
+        while end < n and not _THINKING_STOP_RE.match(text, end + 1):
+            nl = text.find('\n', end + 1)
+            end = n if nl < 0 else nl
+        kept = end
+        line = end + 1
+    if not out:
+        return text
+    out.append(text[kept:])
+    return ''.join(out)
+
+
+def _has_fold_miss(text: str) -> bool:
+    return any(c in text for c in _FOLD_MISSES)
+
+
+def _needs_full_clean(text: str) -> bool:
+    if _BLOCK_SPLIT_RE.search(text) or _has_fold_miss(text):
+        return True
+    folded = text.casefold()
+    return any(s in folded for s in _CLEAN_SENTINELS)
+
+
+def _unwrap_reply(final_text: str) -> str:
+    """Strip label/filler prefixes and wrapping quotes from the chosen reply."""
+    # Remove "Response:" or "Draft:" prefixes
+    final_text = _LABEL_PREFIX_RE.sub('', final_text)
+
+    # Remove conversational filler "Here is the draft:"
+    final_text = _FILLER_PREFIX_RE.sub('', final_text)
+
+    # Remove quotes if the entire message is quoted
+    if final_text and final_text[0] in ('"', "'") and final_text[-1] == final_text[0]:
+        final_text = final_text[1:-1]
+
+    # Final whitespace cleanup
+    return final_text.strip()
+
+
+@functools.lru_cache(maxsize=256)
+def _clean_output_impl(text: str) -> str:
+    """Strip any reasoning/preamble leakage from model output.
+    
+    Strategy: Aggressively remove known reasoning patterns and artifacts.
+    CRITICAL: Analyst output must NEVER leak to contact - only delegate output.
+    Assume the LAST clean block is the message.
+    """
+    original = text.strip()
+    if not original:
+        return ""
+
+    # Fast path: a single block with no marker the pipeline below could
+    # remove (the common case) only needs the prefix/quote unwrap.
+    if not _needs_full_clean(original):
+        return _unwrap_reply(original)
+    
+    # Stages 0-3 only delete text, so a stage changed the text iff it got
+    # shorter; the folded copy used for gating is refreshed only then.
+    ungated = _has_fold_miss(original)
+    folded = original.casefold()
+
+    def wanted(sentinels: tuple[str, ...]) -> bool:
+        return ungated or any(s in folded for s in sentinels)
+
+    # 0. CRITICAL: Remove ANY analyst markers/output that might leak
+    # Analyst output is for delegate only, NEVER for contact
+    text = _ANALYST_RE.sub('', original) if wanted(_ANALYST_SENTINELS) else original
+    text = text.replace(_ANALYST_WARNING_EMOJI, '').translate(_ANALYST_EMOJI_STRIP)
+    if len(text) != len(original):
+        folded = text.casefold()
+    original = text
+    
+    # 1. Remove XML-style thinking tags (common in some fine-tunes)
+    if wanted(_TAG_SENTINELS):
+        size = len(text)
+        text = _THINKING_TAG_RE.sub('', text)
+        text = _REASONING_TAG_RE.sub('', text)
+        if len(text) != size:
+            folded = text.casefold()
+    
+    # 2. Strip Gemini "Thinking" blocks that start with known headers
+    # These look like: "Thinking Analyzing Persona Context Okay, I'm working on..."
+    # They typically run until "Collapse to hide model thoughts" or similar
+    if wanted(_THINKING_SENTINELS):
+        size = len(text)
+        text = _strip_thinking_blocks(text)
+        if len(text) != size:
+            folded = text.casefold()
+    
+    # 3. Strip "Collapse to hide model thoughts" and similar UI artifacts
+    if wanted(_UI_SENTINELS):
+        text = _COLLAPSE_RE.sub('', text)
+        text = _CHEVRON_RE.sub('', text)
+        text = _SEND_PROMPT_RE.sub('', text) # Catch "Send prompt (⌘ + Enter)"
+    
+    # 4. Split into blocks to isolate the message from the "prep"
+    blocks = _BLOCK_SPLIT_RE.split(text)
+    candidates = []
+    
+    for block in blocks:
+        content = block.strip()
+        if not content:
+            continue
+            
+        # If it explicitly looks like meta-commentary, skip it
+        if _is_reasoning_block(content):
+            continue
+            
+        # Specific check for "Key: Value" generated headers like "Tone: Casual"
+        # If a block is just one line and looks like a header, skip it
+        # E.g. "Response: Hey there" -> we want to keep "Hey there" but remove "Response:"
+        # But "Strategy: Be cool" -> remove entirely.
+        if '\n' not in content and _HEADER_SKIP_RE.match(content):
+            continue
         
-        # 3. Strip "Collapse to hide model thoughts" and similar UI artifacts
-        text = re.sub(r'Collapse to hide model thoughts.*?(?=\n|$)', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'chevron_right', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'Send prompt.*?(?:\(.*\))?', '', text, flags=re.IGNORECASE) # Catch "Send prompt (⌘ + Enter)"
-        
-        # 4. Split into blocks to isolate the message from the "prep"
-        blocks = re.split(r'\n\s*\n', text)
-        candidates = []
+        candidates.append(content)
         
-        # Regex for lines/blocks that are DEFINITELY not the message
-        reasoning_pattern = r'^(?:thinking|strategy|analysis|reasoning|trajectory|assessment|internal|brainstorming|evaluating|confirming|prioritizing|resolving|interpreting|reconciling|okay,?\s*i\'?m|i\'?m\s*now|\[|#|---|\*\*)'
+    # Select the best candidate
+    if not candidates:
+        # If everything was filtered, fall back to the last block of original
+        final_text = blocks[-1].strip()
+    else:
+        # Default to the LAST candidate (messages usually come after reasoning)
+        final_text = candidates[-1]
+
+    # 3. Clean up the selected text
+    final_text = _unwrap_reply(final_text)
+    
+    if final_text != original:
+        logger.debug(f"Cleaned output: '{original[:50]}...' -> '{final_text[:50]}...'")
         
-        for block in blocks:
-            content = block.strip()
-            if not content:
-                continue
-                
-            # If it explicitly looks like meta-commentary, skip it
-            if re.match(reasoning_pattern, content, re.IGNORECASE):
-                continue
-                
-            # Specific check for "Key: Value" generated headers like "Tone: Casual"
-            # If a block is just one line and looks like a header, skip it
-            if '\n' not in content and re.match(r'^[A-Z][a-z]+:\s', content):
-                # E.g. "Response: Hey there" -> we want to keep "Hey there" but remove "Response:"
-                # But "Strategy: Be cool" -> remove entirely.
-                # Let's filter specific known keys
-                if re.match(r'^(?:Strategy|Tone|Intent|Goal|Summary):', content, re.IGNORECASE):
-                    continue
-            
-            candidates.append(content)
-            
-        # Select the best candidate
-        if not candidates:
-            # If everything was filtered, fall back to the last block of original
-            final_text = blocks[-1].strip()
-        else:
-            # Default to the LAST candidate (messages usually come after reasoning)
-            final_text = candidates[-1]
+    return final_text
 
-        # 3. Clean up the selected text
-        # Remove "Response:" or "Draft:" prefixes
-        final_text = re.sub(r'^(?:response|draft|message|me|reply):\s*', '', final_text, flags=re.IGNORECASE)
-        
-        # Remove conversational filler "Here is the draft:"
-        final_text = re.sub(r'^(?:here\'?s?|my)\s+(?:is\s+)?(?:my\s+)?(?:draft|response|reply|message)(?: is)?[:\.]?\s*', '', final_text, flags=re.IGNORECASE)
 
-        # Remove quotes if the entire message is quoted
-        if (final_text.startswith('"') and final_text.endswith('"')) or (final_text.startswith("'") and final_text.endswith("'")):
-            final_text = final_text[1:-1]
-            
-        # Final whitespace cleanup
-        final_text = final_text.strip()
-        
-        if final_text != original:
-            logger.debug(f"Cleaned output: '{original[:50]}...' -> '{final_text[:50]}...'")
-            
-        return final_text
+class RateLimitError(RuntimeError):
+    def __init__(self, *, provider: str, retry_after_seconds: float) -> None:
+        super().__init__(f"Rate limited by {provider}; retry after {retry_after_seconds:.1f}s")
+        self.provider = provider
+        self.retry_after_seconds = retry_after_seconds
+
+
+class Delegate:
+    """Execution service: LLM call to generate the reply text."""
+
+    def __init__(self, api_key: str | None = None, persona_name: str | None = None) -> None:
+        self.provider = settings.LLM_PROVIDER
+        # api_key and persona_name are available via settings/config but captured here for compatibility
+        self.api_key = api_key 
+        self.persona_name = persona_name
+        self._failover_chain = self._build_failover_chain()
+        # Shared across replies so the controller connection stays pooled
+        self._lotl_client: LotLClient | None = None
+
+    def _clean_output(self, text: str) -> str:
+        """Strip any reasoning/preamble leakage from model output.
+
+        Memoized on the raw text (see _clean_output_impl): failover retries and
+        repeated LotL responses often hand back the same reply.
+        """
+        return _clean_output_impl(text)
 
     @staticmethod
     def _looks_like_prompt_leak(*, reply_text: str, sent_prompt: str) -> bool:
-        import re
-
         r = str(reply_text or "").strip()
         p = str(sent_prompt or "").strip()
         if not r or not p:
             return False
 
         def norm(s: str) -> str:
-            return re.sub(r"\s+", " ", s).strip().lower()
+            return _WS_RE.sub(" ", s).strip().lower()
 
         rn = norm(r)
-        pn = norm(p)
+        # Only the prompt's first 120 normalized chars are ever compared, so
+        # normalize a raw prefix rather than the whole (often huge) prompt.
+        # Falls back to the full prompt if whitespace collapses the prefix.
+        pn = norm(p[:_PROMPT_HEAD_SCAN])
+        if len(p) > _PROMPT_HEAD_SCAN and len(pn) <= 120:
+            pn = norm(p)
 
         # Strong indicators: the reply contains system/chat scaffolding.
-        leak_markers = [
-            "system:",
-            "chat:",
-            "contact context:",
-            "instruction:",
-            "[system injection]",
-        ]
-        if any(m in rn for m in leak_markers):
+        if any(m in rn for m in _LEAK_MARKERS):
             return True
 
         # Heuristic: reply overlaps heavily with start of the prompt (echo/stale extraction).
         # Check first ~120 chars to catch the common failures without false positives.
+        # Only the shorter head can be contained in the longer one.
         pn_head = pn[:120]
         rn_head = rn[:120]
         if pn_head and rn_head:
-            if rn_head in pn_head or pn_head in rn_head:
+            if len(rn_head) <= len(pn_head):
+                if rn_head in pn_head:
+                    return True
+            elif pn_head in rn_head:
                 return True
 
         # Heuristic: reply contains a long slice of the prompt.
-        if len(pn) >= 80 and pn[:80] in rn:
+        if len(pn) >= 80 and len(rn) >= 80 and pn[:80] in rn:
             return True
 
         return False
 
     def _get_failover_chain(self) -> list[str]:
-        """Return the ordered list of providers to try.
+        """Return the provider chain computed once at construction."""
+        return self._failover_chain
+
+    def _build_failover_chain(self) -> list[str]:
+        """Build the ordered list of providers to try.
 
         Primary provider first, then any configured failover providers,
         filtered to those that actually have credentials available.
@@ -209,18 +449,17 @@ class Delegate:
         history = []
 
         chain = self._get_failover_chain()
+        hedge_delay = float(getattr(settings, "LLM_HEDGE_DELAY_SEC", 0) or 0)
+        if hedge_delay > 0 and len(chain) > 1:
+            return self._hedged_reply(chain, system_prompt, history, hedge_delay)
+
         last_error: Exception | None = None
 
         for provider in chain:
             try:
-                raw_text = self._dispatch(provider, system_prompt, history)
-                cleaned = self._clean_output(raw_text)
+                cleaned = self._accept_reply(provider, self._dispatch(provider, system_prompt, history))
                 if cleaned:
-                    if provider != self.provider:
-                        logger.warning("[FAILOVER] Succeeded on fallback provider: %s", provider)
                     return cleaned
-                # Empty after cleaning — treat as failure, try next
-                logger.warning("[FAILOVER] Provider %s returned empty after cleaning", provider)
             except RateLimitError:
                 raise  # Rate limits should propagate immediately for backoff
             except Exception as exc:
@@ -233,6 +472,69 @@ class Delegate:
             raise last_error
         raise RuntimeError("All LLM providers returned empty responses")
 
+    def _accept_reply(self, provider: str, raw_text: str) -> str:
+        """Clean a provider's reply; empty means the next provider should be tried."""
+        # _lotl_reply must validate cleaned text, so it returns it already cleaned
+        cleaned = raw_text if provider in _SELF_CLEANING_PROVIDERS else self._clean_output(raw_text)
+        if cleaned:
+            if provider != self.provider:
+                logger.warning("[FAILOVER] Succeeded on fallback provider: %s", provider)
+            return cleaned
+        # Empty after cleaning — treat as failure, try next
+        logger.warning("[FAILOVER] Provider %s returned empty after cleaning", provider)
+        return ""
+
+    def _hedged_reply(
+        self, chain: list[str], system_prompt: str, history: list, hedge_delay: float
+    ) -> str:
+        """Walk the failover chain, overlapping slow providers with the next one.
+
+        The next provider starts as soon as one fails, or when nothing in flight
+        has answered within ``hedge_delay`` seconds.  The first usable reply wins;
+        calls still running are abandoned (their results are discarded).
+        """
+        pool = ThreadPoolExecutor(max_workers=len(chain), thread_name_prefix="delegate-hedge")
+        pending: dict[Future, str] = {}
+        queued = iter(chain)
+        last_error: Exception | None = None
+
+        def launch() -> bool:
+            provider = next(queued, None)
+            if provider is None:
+                return False
+            pending[pool.submit(self._dispatch, provider, system_prompt, history)] = provider
+            return True
+
+        try:
+            exhausted = not launch()
+            while pending:
+                done, _ = wait(pending, timeout=None if exhausted else hedge_delay, return_when=FIRST_COMPLETED)
+                if not done:
+                    exhausted = not launch()
+                    if not exhausted:
+                        logger.warning("[FAILOVER] No reply after %.1fs; hedging with next provider", hedge_delay)
+                    continue
+                for future in sorted(done, key=lambda f: chain.index(pending[f])):
+                    provider = pending.pop(future)
+                    try:
+                        cleaned = self._accept_reply(provider, future.result())
+                        if cleaned:
+                            return cleaned
+                    except RateLimitError:
+                        raise  # Rate limits should propagate immediately for backoff
+                    except Exception as exc:
+                        last_error = exc
+                        logger.warning("[FAILOVER] Provider %s failed: %s", provider, exc)
+                    if not exhausted:
+                        exhausted = not launch()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        # All providers exhausted
+        if last_error:
+            raise last_error
+        raise RuntimeError("All LLM providers returned empty responses")
+
     def _dispatch(self, provider: str, system_prompt: str, history: list) -> str:
         """Route to the correct provider method."""
         if provider == "openai":
@@ -252,26 +554,6 @@ class Delegate:
         if not settings.GEMINI_API_KEY:
             raise RuntimeError("GEMINI_API_KEY is not set")
 
-        import google.generativeai as genai
-        import re
-        import os
-
-        configure_kwargs = {"api_key": settings.GEMINI_API_KEY}
-        base_url = settings.GEMINI_BASE_URL
-        if base_url:
-            # Clean basics
-            if base_url.startswith("https://"):
-                base_url = base_url.replace("https://", "")
-            if base_url.startswith("http://"):
-                base_url = base_url.replace("http://", "")
-            if base_url.endswith("/"):
-                base_url = base_url[:-1]
-                
-            configure_kwargs["client_options"] = {"api_endpoint": base_url}
-            configure_kwargs["transport"] = "rest"  # Cloudflare/Proxies usually valid via REST
-
-        genai.configure(**configure_kwargs)
-
         # Gemini's SDK uses a single prompt string; we merge system + chat history.
         # Keep it simple and deterministic for texting.
         parts: list[str] = ["SYSTEM:\n" + system_prompt.strip(), "\nCHAT:\n"]
@@ -287,7 +569,7 @@ class Delegate:
 
         prompt = "".join(parts).strip()
 
-        model = genai.GenerativeModel(settings.GEMINI_MODEL)
+        model = _get_gemini_model(settings.GEMINI_API_KEY, settings.GEMINI_BASE_URL, settings.GEMINI_MODEL)
         
         # Build generation config
         generation_config = {
@@ -356,10 +638,9 @@ class Delegate:
                 text = resp.candidates[0].content.parts[0].text
             except Exception:
                 text = ""
-        
-        # Post-process to strip any reasoning/preamble leakage
-        text = self._clean_output(str(text).strip())
-        return text
+
+        # Reasoning/preamble leakage is stripped once, in generate_reply
+        return str(text).strip()
 
     def _openai_reply(self, system_prompt: str, history: list[dict[str, Any]]) -> str:
         if not settings.OPENAI_API_KEY:
@@ -413,11 +694,18 @@ class Delegate:
              # Default retry 60s for Anthropic if headers not visible easily
              raise RateLimitError(provider="anthropic", retry_after_seconds=60.0) from exc
 
+    def _get_lotl_client(self) -> LotLClient:
+        """Return the LotL client, creating it on first use."""
+        if self._lotl_client is None:
+            self._lotl_client = LotLClient(
+                base_url=settings.LOTL_BASE_URL,
+                timeout=settings.LOTL_TIMEOUT,
+            )
+        return self._lotl_client
+
     def _copilot_reply(self, system_prompt: str, history: list[dict[str, Any]]) -> str:
         """Get reply via LotL Copilot Adapter"""
-        from services.lotl_client import LotLClient
-        
-        full_text = f"IMPORTANT INSTRUCTIONS:\n{system_prompt}\n\nCONVERSATION HISTORY:\n"
+        parts = [f"IMPORTANT INSTRUCTIONS:\n{system_prompt}\n\nCONVERSATION HISTORY:\n"]
         for item in history:
             role = item.get("role", "user")
             text = str(item.get("text", "")).strip()
@@ -425,16 +713,14 @@ class Delegate:
                 continue
                 
             if role == "assistant":
-                full_text += f"You: {text}\n"
+                parts.append(f"You: {text}\n")
             else:
-                full_text += f"Contact: {text}\n"
+                parts.append(f"Contact: {text}\n")
                 
-        full_text += "\nYOUR RESPONSE (as 'You'):"
+        parts.append("\nYOUR RESPONSE (as 'You'):")
+        full_text = "".join(parts)
         
-        client = LotLClient(
-            base_url=settings.LOTL_BASE_URL,
-            timeout=settings.LOTL_TIMEOUT,
-        )
+        client = self._get_lotl_client()
         # Copilot usually works better with a fresh conversation per request
         response = client.chat(full_text, platform='copilot', timeout=200, fresh=True)
         return response
@@ -444,12 +730,7 @@ class Delegate:
         LotL (Living off the Land) provider - routes through AI Studio via Chrome CDP.
         Bypasses API quotas entirely by using logged-in browser session.
         """
-        from services.lotl_client import LotLClient
-        
-        client = LotLClient(
-            base_url=settings.LOTL_BASE_URL,
-            timeout=settings.LOTL_TIMEOUT
-        )
+        client = self._get_lotl_client()
         
         # Check if controller is available
         if not client.is_available():
@@ -477,29 +758,12 @@ class Delegate:
             t = str(text or "").strip().lower()
             if not t:
                 return False
-            known = [
-                "stop generation before creating a new chat",
-                "verify it's you",
-                "sign in",
-                "unusual traffic",
-                "captcha",
-                "something went wrong",
-                "an internal error has occurred",
-                "internal error",
-                "error an internal",
-                "server error",
-                "rate limit",
-                "too many requests",
-                "try again later",
-                "model is overloaded",
-                "temporarily unavailable",
-            ]
-            return any(k in t for k in known)
+            return _KNOWN_UI_ERROR_RE.search(t) is not None
         
         def _is_error_response(text: str) -> bool:
             """Detect if response starts with 'error' - clear LotL failure signal."""
             t = str(text or "").strip().lower()
-            return t.startswith("error") or t.startswith("error:")
+            return t.startswith("error")
 
         try:
             # CRITICAL: Use fresh=True to start a new conversation
@@ -512,7 +776,6 @@ class Delegate:
             except TimeoutError as exc:
                 # Timeout: retry on same tab after pause (don't open fresh tab)
                 logger.warning(f"LotL Attempt 1 timed out: {exc}. Retrying on SAME tab...")
-                import time
                 time.sleep(5)
                 # Retry
                 response = client.chat(prompt, platform=platform)
@@ -536,7 +799,6 @@ class Delegate:
                 error_reason = "empty" if not cleaned else cleaned[:50]
                 logger.warning(f"LotL Attempt 1 rejected ({error_reason}). Retrying on SAME tab after pause...")
                 
-                import time
                 time.sleep(5)  # Longer pause to let any stuck generation settle
                 # NO fresh=True, NO new sessionId - reuse same tab/state
                 response = client.chat(prompt, platform=platform)
@@ -51,20 +51,16 @@ def acquire_instance_lock(
     try:
         _try_lock(fd, lock_path)
         # Write PID for diagnostics
-        os.lseek(fd, 0, os.SEEK_SET)
-        os.ftruncate(fd, 0) if hasattr(os, "ftruncate") else None
-        pid_bytes = f"{os.getpid()}\n".encode()
-        os.write(fd, pid_bytes)
+        _write_pid(fd)
 
         logger.info("[LOCK] Instance lock acquired: %s (pid=%s)", lock_path, os.getpid())
         yield lock_path
     finally:
+        # The lock file is left in place: unlinking it would let a process
+        # that opened the old path lock an orphaned inode while a newcomer
+        # creates and locks a fresh file.
         _unlock(fd)
         os.close(fd)
-        try:
-            lock_path.unlink(missing_ok=True)
-        except Exception:
-            pass
         logger.info("[LOCK] Instance lock released.")
 
 
@@ -95,6 +91,16 @@ def _try_lock_windows(fd: int, lock_path: Path) -> None:
         _read_owner_and_raise(lock_path)
 
 
+def _write_pid(fd: int) -> None:
+    pid_bytes = f"{os.getpid()}\n".encode()
+    os.ftruncate(fd, 0)
+    if sys.platform == "win32":
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, pid_bytes)
+    else:
+        os.pwrite(fd, pid_bytes, 0)
+
+
 def _unlock(fd: int) -> None:
     if sys.platform == "win32":
         import msvcrt
@@ -1,13 +1,14 @@
-from typing import Protocol, List, Any
+from typing import Protocol, List, Any, runtime_checkable
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IncomingMessage:
     message_rowid: int | str
     handle: str
     text: str
     service: str
-    date: int = 0
+    # Unix timestamp (seconds) so messages from different transports sort together.
+    date: float = 0.0
 
 class TransportBridge(Protocol):
     def send_message(self, handle: str, message: str, service: str) -> bool:
@@ -20,5 +21,11 @@ class TransportWatcher(Protocol):
         ...
         
     def poll(self) -> List[IncomingMessage]:
-        """Poll the transport for new messages."""
+        """Poll the transport for new messages, oldest first by ``date``."""
+        ...
+
+@runtime_checkable
+class HistoryCapable(Protocol):
+    def fetch_recent_history(self, *, handle: str, limit: int) -> List[dict]:
+        """Return recent messages for *handle* in chronological order."""
         ...
@@ -18,8 +18,15 @@ Usage:
     response = await client.achat("Hello")
 """
 
+import asyncio
 import base64
+import random
+import threading
+import time
 import httpx
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Union, Optional
 
@@ -30,6 +37,111 @@ _NON_RECOVERABLE_KEYWORDS = (
     "unusual traffic", "permission",
 )
 
+# Longest server-requested (Retry-After) wait honoured between chat() attempts
+_MAX_RETRY_AFTER = 60.0
+# Upper bound for the jittered backoff between chat() attempts
+_BACKOFF_CAP = 60.0
+
+
+def _next_backoff(base: float, previous: float, cap: float) -> float:
+    """Decorrelated jitter: spreads retries so concurrent callers don't sync up."""
+    return min(cap, random.uniform(base, previous * 3))
+
+
+def _retry_after_seconds(response: Optional[httpx.Response]) -> Optional[float]:
+    """Parse a numeric ``Retry-After`` header, capped at _MAX_RETRY_AFTER."""
+    if response is None:
+        return None
+    try:
+        value = float(response.headers.get("Retry-After", ""))
+    except (TypeError, ValueError):
+        return None
+    return min(max(value, 0.0), _MAX_RETRY_AFTER)
+
+
+def _compute_backoff(response: Optional[httpx.Response], previous: float, base_delay: float) -> float:
+    """Seconds to wait before the next attempt: Retry-After wins over backoff."""
+    retry_after = _retry_after_seconds(response)
+    if retry_after is not None:
+        return retry_after
+    return _next_backoff(base_delay, previous, _BACKOFF_CAP)
+
+
+# How long an is_available() result is reused before probing /health again
+_HEALTH_TTL = 2.0
+
+_IMAGE_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+
+# Controller route per chat platform; unknown platforms go to Gemini
+_ENDPOINTS = {
+    "gemini": "/gemini",
+    "chatgpt": "/chatgpt",
+    "copilot": "/copilot",
+    "whatsapp": "/whatsapp",
+    "aistudio": "/aistudio",
+}
+
+# These platforms don't support image input in this controller version
+_NO_IMAGE_PLATFORMS = frozenset({"chatgpt", "whatsapp"})
+
+
+# Multi-image requests encode in parallel; reads and base64 release the GIL.
+# Workers are only started on first use.
+_ENCODE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="lotl-b64")
+
+
+@lru_cache(maxsize=64)
+def _encode_file_cached(path_str: str, mtime_ns: int, size: int, mime: str) -> str:
+    """Base64 data URL for an image file; mtime/size in the key invalidate edits."""
+    with open(path_str, "rb") as f:
+        b64 = base64.b64encode(f.read())
+    return (b"data:" + mime.encode("ascii") + b";base64," + b64).decode("ascii")
+
+
+# chat()/achat() attempts per request and the first backoff step
+_CHAT_MAX_RETRIES = 5
+_CHAT_BASE_DELAY = 2.0
+
+
+class _ControllerBusy(RuntimeError):
+    """503 from the controller; keeps the response for its Retry-After."""
+
+    def __init__(self, response: httpx.Response) -> None:
+        super().__init__("LotL Server Busy (503)")
+        self.response = response
+
+
+# Circuit breaker per controller endpoint: after _BREAKER_THRESHOLD consecutive
+# connection/timeout/5xx failures, requests fail fast for a cooldown.  One probe
+# is let through per cooldown window; each failed probe doubles the cooldown.
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0
+_BREAKER_MAX_COOLDOWN = 300.0
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without contacting the controller while its circuit is open."""
+
+
+@dataclass(slots=True)
+class _BreakerState:
+    failures: int = 0
+    open: bool = False
+    opened_at: float = 0.0
+    cooldown: float = _BREAKER_COOLDOWN
+
+
+# Shared by every client instance: keyed by (base_url, endpoint)
+_breakers: dict[tuple[str, str], _BreakerState] = {}
+_breaker_lock = threading.Lock()
+
 
 class LotLClient:
     """
@@ -53,7 +165,166 @@ class LotLClient:
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        # Pooled keep-alive clients shared by every request (created lazily)
+        self._client: Optional[httpx.Client] = None
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client_lock = threading.Lock()
+        # (status, monotonic time, cause) of the last health probe; status None
+        # means the probe itself failed and cause says why
+        self._health_cache: tuple[Optional[str], float, str] = (None, float("-inf"), "")
+
+    def _get_client(self) -> httpx.Client:
+        """Return the shared HTTP client, creating it on first use."""
+        client = self._client
+        if client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(timeout=self.timeout)
+                client = self._client
+        return client
+
+    async def _get_aclient(self) -> httpx.AsyncClient:
+        """Return the shared async client for the running event loop.
+
+        An AsyncClient's connections belong to the loop that opened them, so
+        the previous client is closed and replaced when called from a
+        different loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is not None and self._aclient_loop is not loop:
+            stale, self._aclient, self._aclient_loop = self._aclient, None, None
+            try:
+                await stale.aclose()
+            except Exception as e:
+                # Its loop is usually closed already; the pool is dropped either way
+                print(f"[LotLClient] Closing stale async client failed: {e}")
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(timeout=self.timeout)
+            self._aclient_loop = loop
+        return self._aclient
+
+    def close(self) -> None:
+        """Close the pooled sync client (the async one via ``aclose``)."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close both pooled clients."""
+        self.close()
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+            self._aclient_loop = None
+
+    def __enter__(self) -> "LotLClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
+    def _breaker_allow(self, endpoint: str) -> None:
+        """Raise CircuitOpenError unless the endpoint may be called now."""
+        with _breaker_lock:
+            state = _breakers.get((self.base_url, endpoint))
+            if state is None or not state.open:
+                return
+            now = time.monotonic()
+            remaining = state.opened_at + state.cooldown - now
+            if remaining <= 0:
+                # Half-open: this caller is the probe for the next window
+                state.opened_at = now
+                return
+        raise CircuitOpenError(
+            f"LotL circuit open for {endpoint}; retrying in {remaining:.0f}s"
+        )
+
+    def _breaker_record(self, endpoint: str, ok: bool) -> None:
+        """Close the endpoint's circuit on success; count (or re-open on) failure."""
+        key = (self.base_url, endpoint)
+        with _breaker_lock:
+            if ok:
+                _breakers.pop(key, None)
+                return
+            state = _breakers.setdefault(key, _BreakerState())
+            if state.open:
+                # Only a probe gets through while open, so the probe failed
+                state.cooldown = min(state.cooldown * 2, _BREAKER_MAX_COOLDOWN)
+                state.opened_at = time.monotonic()
+                return
+            state.failures += 1
+            if state.failures >= _BREAKER_THRESHOLD:
+                state.open = True
+                state.opened_at = time.monotonic()
+                print(f"[LotLClient] Circuit open for {endpoint} after {state.failures} failures ({state.cooldown:.0f}s)")
+
+    def _check_preflight(self) -> None:
+        """Skip the retry loop if the controller was just found unreachable."""
+        status, checked_at, cause = self._health_cache
+        if status is None and time.monotonic() - checked_at < _HEALTH_TTL:
+            raise ConnectionError(f"LotL Controller health check failed: {cause}")
+
+    def _read_chat_response(self, response: httpx.Response, endpoint: str) -> str:
+        """Return the reply from a chat response or raise for a retry decision."""
+        # 503 Busy means the controller is up, just mid-generation
+        self._breaker_record(endpoint, response.status_code < 500 or response.status_code == 503)
+        
+        # Handle 503 Busy BEFORE raise_for_status to get proper backoff
+        if response.status_code == 503:
+            try:
+                data = response.json()
+                elapsed = data.get("elapsed", 0)
+                print(f"[LotLClient] Server busy ({elapsed}s elapsed). Waiting before retry...")
+            except:
+                print(f"[LotLClient] Server returned 503 Busy. Waiting before retry...")
+            raise _ControllerBusy(response)
+        
+        # Raise for other 4xx/5xx status codes
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if data.get("success"):
+            reply = data["reply"]
+            # Validate the reply isn't an error message
+            if reply and str(reply).strip().lower().startswith("error"):
+                raise RuntimeError(f"LotL returned error response: {reply[:100]}")
+            return reply
+        else:
+            error_msg = data.get("error", "Unknown error")
+            is_busy = data.get("busy", False)
+            # If server is busy, wait and retry
+            if is_busy or "busy" in error_msg.lower():
+                raise RuntimeError(f"LotL Server Busy: {error_msg}")
+            # If it's a transient error, we'll catch and retry
+            raise RuntimeError(f"LotL API Error: {error_msg}")
+
+    def _classify_failure(self, exc: Exception, endpoint: str) -> Optional[httpx.Response]:
+        """Decide whether a failed chat attempt may be retried.
+
+        Re-raises non-recoverable errors; otherwise returns the busy/5xx
+        response whose Retry-After may set the next wait (or None).
+        """
+        if isinstance(exc, _ControllerBusy):
+            return exc.response
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response
+        if isinstance(exc, (httpx.ConnectError, httpx.TimeoutException)):
+            # Network/Timeout errors - retry with backoff
+            self._breaker_record(endpoint, False)
+            return None
+        if isinstance(exc, RuntimeError):
+            err_lower = str(exc).lower()
+            # Recoverable: transient server/UI issues — retry with backoff
+            if "rate limit" in err_lower or "busy" in err_lower:
+                return None
+            # Non-recoverable: auth failure, CAPTCHA, sign-in gates — fail fast
+            if any(k in err_lower for k in _NON_RECOVERABLE_KEYWORDS):
+                raise exc
+        # Unknown error — retry (LotL UI states are unpredictable)
+        return None
+
     def _encode_image(self, image: Union[str, bytes, Path]) -> str:
         """
         Encode an image to base64 data URL.
@@ -71,24 +342,16 @@ class LotLClient:
         # File path
         if isinstance(image, (str, Path)):
             path = Path(image)
-            if not path.exists():
-                raise FileNotFoundError(f"Image not found: {path}")
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Image not found: {path}") from None
             
             # Detect MIME type
-            suffix = path.suffix.lower()
-            mime_types = {
-                ".png": "image/png",
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".gif": "image/gif",
-                ".webp": "image/webp"
-            }
-            mime = mime_types.get(suffix, "image/png")
-            
-            with open(path, "rb") as f:
-                b64 = base64.b64encode(f.read()).decode()
+            mime = _IMAGE_MIME_TYPES.get(path.suffix.lower(), "image/png")
             
-            return f"data:{mime};base64,{b64}"
+            # Repeat sends of the same screenshot skip the read + encode
+            return _encode_file_cached(str(path.resolve()), st.st_mtime_ns, st.st_size, mime)
         
         # Raw bytes
         if isinstance(image, bytes):
@@ -97,6 +360,31 @@ class LotLClient:
         
         raise ValueError(f"Unsupported image type: {type(image)}")
     
+    def _build_payload(
+        self,
+        prompt: str,
+        images: Optional[list],
+        session_id: Optional[str],
+        fresh: bool,
+        platform: str,
+    ) -> dict:
+        """Request body shared by chat() and achat()."""
+        payload = {"prompt": prompt}
+
+        if session_id:
+            payload["sessionId"] = str(session_id)
+
+        if fresh:
+            payload["fresh"] = True
+        
+        if images and platform not in _NO_IMAGE_PLATFORMS:
+            if len(images) > 1:
+                payload["images"] = list(_ENCODE_POOL.map(self._encode_image, images))
+            else:
+                payload["images"] = [self._encode_image(images[0])]
+        
+        return payload
+    
     def health(self) -> dict:
         """
         Check if the controller is running.
@@ -108,22 +396,32 @@ class LotLClient:
             ConnectionError: If controller is not reachable
         """
         try:
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(f"{self.base_url}/health")
-                return response.json()
+            response = self._get_client().get(f"{self.base_url}/health", timeout=5.0)
+            return response.json()
         except httpx.ConnectError:
             raise ConnectionError(
                 "Cannot connect to LotL Controller. "
                 "Is it running on localhost:3000?"
             )
     
-    def is_available(self) -> bool:
-        """Check if the controller is available."""
+    def is_available(self, force: bool = False) -> bool:
+        """Check if the controller is available.
+
+        The result is cached for _HEALTH_TTL seconds; ``force`` re-probes.
+        """
+        status, checked_at, _ = self._health_cache
+        if not force and time.monotonic() - checked_at < _HEALTH_TTL:
+            return status == "ok"
+        cause = ""
         try:
-            health = self.health()
-            return health.get("status") == "ok"
-        except:
-            return False
+            status = self.health().get("status", "")
+            if status != "ok":
+                cause = f"controller reports status {status!r}"
+        except Exception as e:
+            status = None
+            cause = f"{type(e).__name__}: {e}"
+        self._health_cache = (status, time.monotonic(), cause)
+        return status == "ok"
     
     def chat(
         self,
@@ -152,122 +450,28 @@ class LotLClient:
             ConnectionError: If controller is not reachable
             RuntimeError: If platform returns an error
         """
-        import time
-        import random
-        
-        payload = {"prompt": prompt}
-
-        if session_id:
-            payload["sessionId"] = str(session_id)
-
-        if fresh:
-            payload["fresh"] = True
-        
-        if images:
-            if platform == 'chatgpt' or platform == 'whatsapp':
-                # These platforms don't support image input in this controller version
-                pass 
-            else:
-                payload["images"] = [self._encode_image(img) for img in images]
-        
-        # Determine endpoint
-        endpoint = "/gemini" # Default
-        if platform == 'chatgpt':
-            endpoint = "/chatgpt"
-        elif platform == 'copilot':
-            endpoint = "/copilot"
-        elif platform == 'whatsapp':
-            endpoint = "/whatsapp"
-        elif platform == 'aistudio':
-            endpoint = "/aistudio"
-            
-        max_retries = 5
-        base_delay = 2.0
-        
+        payload = self._build_payload(prompt, images, session_id, fresh, platform)
+        endpoint = _ENDPOINTS.get(platform, "/gemini")
+        self._check_preflight()
+        url = f"{self.base_url}{endpoint}"
+        current_timeout = timeout or self.timeout
+        sleep_time = _CHAT_BASE_DELAY
         last_error = None
         
-        for attempt in range(max_retries):
+        for attempt in range(_CHAT_MAX_RETRIES):
+            # Outside the try: an open circuit must not be retried
+            self._breaker_allow(endpoint)
             try:
-                # Calculate effective timeout for this attempt
-                current_timeout = timeout or self.timeout
-                
-                with httpx.Client(timeout=current_timeout) as client:
-                    response = client.post(
-                        f"{self.base_url}{endpoint}",
-                        json=payload
-                    )
-                    
-                    # Handle 503 Busy BEFORE raise_for_status to get proper backoff
-                    if response.status_code == 503:
-                        try:
-                            data = response.json()
-                            elapsed = data.get("elapsed", 0)
-                            print(f"[LotLClient] Server busy ({elapsed}s elapsed). Waiting before retry...")
-                        except:
-                            print(f"[LotLClient] Server returned 503 Busy. Waiting before retry...")
-                        # Use longer backoff for busy - the current request needs to finish
-                        raise RuntimeError("LotL Server Busy (503)")
-                    
-                    # Raise for other 4xx/5xx status codes
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    
-                    if data.get("success"):
-                        reply = data["reply"]
-                        # Validate the reply isn't an error message
-                        if reply and str(reply).strip().lower().startswith("error"):
-                            raise RuntimeError(f"LotL returned error response: {reply[:100]}")
-                        return reply
-                    else:
-                        error_msg = data.get("error", "Unknown error")
-                        is_busy = data.get("busy", False)
-                        # If server is busy, wait and retry
-                        if is_busy or "busy" in error_msg.lower():
-                            raise RuntimeError(f"LotL Server Busy: {error_msg}")
-                        # If it's a transient error, we'll catch and retry
-                        raise RuntimeError(f"LotL API Error: {error_msg}")
-                        
-            except httpx.HTTPStatusError as e:
-                last_error = e
-                # Handle 503 Busy responses explicitly (shouldn't reach here due to above check)
-                if e.response.status_code == 503:
-                    try:
-                        data = e.response.json()
-                        if data.get("busy"):
-                            print(f"[LotLClient] Server busy (HTTPStatusError path), waiting...")
-                    except:
-                        pass
-                # Will retry with backoff
-                pass
-                        
-            except (httpx.ConnectError, httpx.TimeoutException, httpx.ReadTimeout, ConnectionError) as e:
-                last_error = e
-                # Network/Timeout errors - retry immediately with backoff
-                pass
-                
-            except RuntimeError as e:
-                last_error = e
-                err_lower = str(e).lower()
-                # Recoverable: transient server/UI issues — retry with backoff
-                if "rate limit" in err_lower or "busy" in err_lower:
-                    pass
-                # Non-recoverable: auth failure, CAPTCHA, sign-in gates — fail fast
-                elif any(k in err_lower for k in _NON_RECOVERABLE_KEYWORDS):
-                    raise
-                else:
-                    # Unknown RuntimeError — retry (LotL UI states are unpredictable)
-                    pass
-
+                response = self._get_client().post(url, json=payload, timeout=current_timeout)
+                return self._read_chat_response(response, endpoint)
             except Exception as e:
                 last_error = e
-                # Unexpected error — retry
-                pass
+                retry_response = self._classify_failure(e, endpoint)
             
             # Backoff before next attempt
-            if attempt < max_retries - 1:
-                sleep_time = base_delay * (2 ** attempt) + random.uniform(0, 1)
-                print(f"[LotLClient] Request failed (Attempt {attempt+1}/{max_retries}). Retrying in {sleep_time:.1f}s... Error: {last_error}")
+            if attempt < _CHAT_MAX_RETRIES - 1:
+                sleep_time = _compute_backoff(retry_response, sleep_time, _CHAT_BASE_DELAY)
+                print(f"[LotLClient] Request failed (Attempt {attempt+1}/{_CHAT_MAX_RETRIES}). Retrying in {sleep_time:.1f}s... Error: {last_error}")
                 time.sleep(sleep_time)
         
         # If we get here, we failed all retries
@@ -295,54 +499,43 @@ class LotLClient:
         Returns:
             The AI model's response text
         """
-        payload = {"prompt": prompt}
-
-        if session_id:
-            payload["sessionId"] = str(session_id)
-
-        if fresh:
-            payload["fresh"] = True
+        payload = self._build_payload(prompt, images, session_id, fresh, platform)
+        endpoint = _ENDPOINTS.get(platform, "/gemini")
+        self._check_preflight()
+        url = f"{self.base_url}{endpoint}"
+        current_timeout = timeout or self.timeout
+        sleep_time = _CHAT_BASE_DELAY
+        last_error = None
         
-        if images:
-            if platform == 'chatgpt' or platform == 'whatsapp':
-                pass
-            else:
-                payload["images"] = [self._encode_image(img) for img in images]
+        aclient = await self._get_aclient()
         
-        # Determine endpoint
-        endpoint = "/gemini" # Default
-        if platform == 'chatgpt':
-            endpoint = "/chatgpt"
-        elif platform == 'copilot':
-            endpoint = "/copilot"
-        elif platform == 'whatsapp':
-            endpoint = "/whatsapp"
-        elif platform == 'aistudio':
-            endpoint = "/aistudio"
-
-        try:
-            async with httpx.AsyncClient(timeout=timeout or self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}{endpoint}",
-                    json=payload
-                )
-                data = response.json()
-                
-                if data.get("success"):
-                    return data["reply"]
-                else:
-                    raise RuntimeError(data.get("error", "Unknown error"))
-                    
-        except httpx.ConnectError:
+        for attempt in range(_CHAT_MAX_RETRIES):
+            # Outside the try: an open circuit must not be retried
+            self._breaker_allow(endpoint)
+            try:
+                response = await aclient.post(url, json=payload, timeout=current_timeout)
+                return self._read_chat_response(response, endpoint)
+            except Exception as e:
+                last_error = e
+                retry_response = self._classify_failure(e, endpoint)
+            
+            # Backoff before next attempt without blocking the event loop
+            if attempt < _CHAT_MAX_RETRIES - 1:
+                sleep_time = _compute_backoff(retry_response, sleep_time, _CHAT_BASE_DELAY)
+                print(f"[LotLClient] Async request failed (Attempt {attempt+1}/{_CHAT_MAX_RETRIES}). Retrying in {sleep_time:.1f}s... Error: {last_error}")
+                await asyncio.sleep(sleep_time)
+        
+        if isinstance(last_error, httpx.ConnectError):
             raise ConnectionError(
                 "Cannot connect to LotL Controller. "
                 "Is it running on localhost:3000?"
-            )
-        except httpx.TimeoutException:
+            ) from last_error
+        if isinstance(last_error, httpx.TimeoutException):
             raise TimeoutError(
-                f"Request timed out after {timeout or self.timeout}s. "
+                f"Request timed out after {current_timeout}s. "
                 "Try increasing the timeout or check AI Studio."
-            )
+            ) from last_error
+        raise last_error or RuntimeError("LotL request failed after retries")
 
     def send_whatsapp(self, phone: str, message: str) -> str:
         """
@@ -352,15 +545,14 @@ class LotLClient:
             "prompt": message, 
             "sessionId": phone
         }
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(f"{self.base_url}/whatsapp", json=payload)
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().post(f"{self.base_url}/whatsapp", json=payload)
+        response.raise_for_status()
+        data = response.json()
+        
+        if not data.get("success"):
+            raise RuntimeError(f"WhatsApp Error: {data.get('error')}")
             
-            if not data.get("success"):
-                raise RuntimeError(f"WhatsApp Error: {data.get('error')}")
-                
-            return data.get("reply")
+        return data.get("reply")
 
     def poll_whatsapp(self) -> list[dict]:
         """
@@ -368,16 +560,15 @@ class LotLClient:
         Returns: List of dicts like [{"handle": "+123...", "count": "1"}]
         """
         # Short timeout for polling
-        with httpx.Client(timeout=5.0) as client:
-            try:
-                response = client.get(f"{self.base_url}/whatsapp/poll")
-                if response.status_code == 404:
-                    return [] # No tab open
-                response.raise_for_status()
-                data = response.json()
-                return data.get("unread", [])
-            except Exception:
-                return []
+        try:
+            response = self._get_client().get(f"{self.base_url}/whatsapp/poll", timeout=5.0)
+            if response.status_code == 404:
+                return [] # No tab open
+            response.raise_for_status()
+            data = response.json()
+            return data.get("unread", [])
+        except Exception:
+            return []
 
     def read_whatsapp(self, phone: str) -> str:
         """
@@ -388,15 +579,14 @@ class LotLClient:
             "sessionId": phone,
             "readOnly": True
         }
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(f"{self.base_url}/whatsapp", json=payload)
-            response.raise_for_status()
-            data = response.json()
+        response = self._get_client().post(f"{self.base_url}/whatsapp", json=payload)
+        response.raise_for_status()
+        data = response.json()
+        
+        if not data.get("success"):
+            raise RuntimeError(f"WhatsApp Error: {data.get('error')}")
             
-            if not data.get("success"):
-                raise RuntimeError(f"WhatsApp Error: {data.get('error')}")
-                
-            return data.get("reply")
+        return data.get("reply")
     
     def __repr__(self) -> str:
         return f"LotLClient(base_url='{self.base_url}', timeout={self.timeout})"
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import re
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 
 from config import settings
 
 
-_PHONE_RE = re.compile(r"[^0-9+]")
+# Deletes every ASCII character except 0-9; non-ASCII handles use the regex
+_NON_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(128) if not "0" <= chr(c) <= "9"))
+_NON_DIGIT_RE = re.compile(r"[^0-9]")
 
 
 def canonicalize_handle(handle: str) -> str:
@@ -22,29 +26,49 @@ def canonicalize_handle(handle: str) -> str:
         return ""
 
     # Keep WhatsApp/iMessage phone handles stable.
+    # Only ASCII digits survive; a single leading '+' is re-added.
     if raw.startswith("+") or raw.isdigit():
-        cleaned = _PHONE_RE.sub("", raw)
-        if cleaned.startswith("+"):
-            return "+" + re.sub(r"\D", "", cleaned[1:])
-        return "+" + re.sub(r"\D", "", cleaned)
+        if raw.isascii():
+            return "+" + raw.translate(_NON_DIGITS)
+        return "+" + _NON_DIGIT_RE.sub("", raw)
 
     # Non-phone handles: normalize whitespace only.
     return raw
 
 
-def get_allowlist() -> set[str]:
+# The allowlist may come from a contacts-dir scan; reuse it briefly so new
+# profile files are still picked up within a few seconds.
+_ALLOWLIST_TTL = 5.0
+_allowlist_cache: tuple[frozenset[str], float] = (frozenset(), float("-inf"))
+
+
+def get_allowlist() -> frozenset[str]:
     """Canonical allowlist derived from settings (env or contacts dir)."""
-    return {canonicalize_handle(h) for h in settings.get_target_handles() if canonicalize_handle(h)}
+    global _allowlist_cache
+    allowlist, built_at = _allowlist_cache
+    now = time.monotonic()
+    if now - built_at < _ALLOWLIST_TTL:
+        return allowlist
 
+    canon = (canonicalize_handle(h) for h in settings.get_target_handles())
+    allowlist = frozenset(h for h in canon if h)
+    _allowlist_cache = (allowlist, now)
+    return allowlist
 
-def get_operator_handle() -> str | None:
-    op = settings.OPERATOR_HANDLE
+
+@lru_cache(maxsize=1)
+def _canonical_operator(op: str | None) -> str | None:
     if not op:
         return None
     op_canon = canonicalize_handle(op)
     return op_canon if op_canon else None
 
 
+def get_operator_handle() -> str | None:
+    # Keyed on the raw setting, so a changed OPERATOR_HANDLE is never stale
+    return _canonical_operator(settings.OPERATOR_HANDLE)
+
+
 @dataclass(frozen=True)
 class InboundDecision:
     kind: str  # 'operator' | 'allowlisted' | 'unknown'
@@ -5,25 +5,43 @@ persistent, disk-backed queue of messages scheduled for future delivery.
 
 Each entry has a ``send_after_epoch`` timestamp.  The main loop calls
 ``drain()`` every tick, which sends all entries whose timestamp has passed.
+Entries are kept in a min-heap on that timestamp, so an idle tick only looks
+at the soonest entry.
 
-Entries are persisted via atomic JSON writes so nothing is lost on crash.
+Entries are persisted via atomic JSON writes.  Bursts of changes are
+coalesced: the file is rewritten at most every ``_FLUSH_INTERVAL`` seconds or
+``_FLUSH_MAX_OPS`` changes, the next ``drain()`` writes anything left over,
+and ``flush()`` forces a write on shutdown.
 """
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import json
 import logging
+import random
 import time
-from dataclasses import dataclass, field, asdict
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 
 from utils.atomic import atomic_write_json
 
+try:
+    import orjson
+except ImportError:  # Optional accelerator; stdlib json is the fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Batched persistence: write when either limit is reached
+_FLUSH_INTERVAL = 0.5
+_FLUSH_MAX_OPS = 10
+
 
-@dataclass
+@dataclass(slots=True)
 class ScheduledMessage:
     """A single message awaiting delivery at a future time."""
 
@@ -37,18 +55,32 @@ class ScheduledMessage:
     # Context for logging / operator alerts
     context: str = ""
 
+    # Must list every field above; to_dict() spells them out as well
+    _KNOWN_FIELDS: ClassVar[frozenset[str]] = frozenset({
+        "handle", "text", "service", "send_after_epoch",
+        "created_epoch", "retries", "max_retries", "context",
+    })
+
     def is_due(self) -> bool:
         return time.time() >= self.send_after_epoch
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Flat record: no need for asdict()'s recursive copy
+        return {
+            "handle": self.handle,
+            "text": self.text,
+            "service": self.service,
+            "send_after_epoch": self.send_after_epoch,
+            "created_epoch": self.created_epoch,
+            "retries": self.retries,
+            "max_retries": self.max_retries,
+            "context": self.context,
+        }
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "ScheduledMessage":
         # Accept only known fields to avoid TypeError on schema evolution
-        known = {f.name for f in cls.__dataclass_fields__.values()}
-        filtered = {k: v for k, v in d.items() if k in known}
-        return cls(**filtered)
+        return cls(**{k: v for k, v in d.items() if k in cls._KNOWN_FIELDS})
 
 
 class SendQueue:
@@ -60,7 +92,12 @@ class SendQueue:
 
     def __init__(self, queue_file: Path) -> None:
         self._path = queue_file
-        self._queue: List[ScheduledMessage] = []
+        # (send_after_epoch, seq, entry); seq keeps equal times in FIFO order
+        self._heap: List[Tuple[float, int, ScheduledMessage]] = []
+        self._seq = itertools.count()
+        self._by_handle: Counter[str] = Counter()
+        self._dirty_ops = 0
+        self._last_save = float("-inf")
         self._load()
 
     # ------------------------------------------------------------------
@@ -84,13 +121,14 @@ class SendQueue:
             send_after_epoch=time.time() + delay_seconds,
             context=context,
         )
-        self._queue.append(entry)
-        self._save()
+        self._push(entry)
+        self._by_handle[handle] += 1
+        self._mark_dirty()
         logger.info(
             "[SEND_Q] Enqueued %s (delay=%.1fs, queue_depth=%d)",
             handle,
             delay_seconds,
-            len(self._queue),
+            len(self._heap),
         )
 
     def drain(
@@ -109,16 +147,13 @@ class SendQueue:
                         (exhausted retries).
         """
         sent = 0
-        still_pending: List[ScheduledMessage] = []
+        changed = False
+        now = time.time()
 
-        for entry in self._queue:
-            if not entry.is_due():
-                still_pending.append(entry)
-                continue
-
-            if sent >= max_per_tick:
-                still_pending.append(entry)
-                continue
+        # Stop at the first entry that isn't due yet
+        while self._heap and self._heap[0][0] <= now and sent < max_per_tick:
+            entry = heapq.heappop(self._heap)[2]
+            changed = True
 
             success = False
             try:
@@ -129,6 +164,7 @@ class SendQueue:
             if success:
                 logger.info("[SEND_Q] Delivered to %s", entry.handle)
                 sent += 1
+                self._forget(entry)
             else:
                 entry.retries += 1
                 if entry.retries >= entry.max_retries:
@@ -140,11 +176,14 @@ class SendQueue:
                     if on_failure:
                         on_failure(entry)
                     # Drop from queue
+                    self._forget(entry)
                 else:
-                    # Re-schedule with exponential backoff (10s, 20s, 40s …)
+                    # Re-schedule with exponential backoff (10s, 20s, 40s …) plus
+                    # up to 50% jitter so entries that failed together spread out
                     backoff = 10.0 * (2 ** (entry.retries - 1))
+                    backoff += random.uniform(0, backoff * 0.5)
                     entry.send_after_epoch = time.time() + backoff
-                    still_pending.append(entry)
+                    self._push(entry)
                     logger.warning(
                         "[SEND_Q] Retry %d/%d for %s in %.0fs",
                         entry.retries,
@@ -153,26 +192,53 @@ class SendQueue:
                         backoff,
                     )
 
-        if sent or len(still_pending) != len(self._queue):
-            self._queue = still_pending
-            self._save()
+        if changed:
+            self._mark_dirty()
+        elif self._dirty_ops:
+            self._maybe_flush()
 
         return sent
 
     @property
     def depth(self) -> int:
-        return len(self._queue)
+        return len(self._heap)
 
     def has_pending_for(self, handle: str) -> bool:
-        return any(e.handle == handle for e in self._queue)
+        return self._by_handle[handle] > 0
+
+    def _push(self, entry: ScheduledMessage) -> None:
+        heapq.heappush(self._heap, (entry.send_after_epoch, next(self._seq), entry))
+
+    def _forget(self, entry: ScheduledMessage) -> None:
+        self._by_handle[entry.handle] -= 1
+        if self._by_handle[entry.handle] <= 0:
+            del self._by_handle[entry.handle]
 
     # ------------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------------
 
+    def flush(self) -> None:
+        """Write pending changes to disk now (call on shutdown)."""
+        if self._dirty_ops:
+            self._save()
+
+    def _mark_dirty(self) -> None:
+        self._dirty_ops += 1
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if (
+            self._dirty_ops >= _FLUSH_MAX_OPS
+            or time.monotonic() - self._last_save >= _FLUSH_INTERVAL
+        ):
+            self._save()
+
     def _save(self) -> None:
+        self._last_save = time.monotonic()
         try:
-            atomic_write_json(self._path, [e.to_dict() for e in self._queue])
+            atomic_write_json(self._path, [item[2].to_dict() for item in self._heap])
+            self._dirty_ops = 0
         except Exception as exc:
             logger.error("[SEND_Q] Failed to persist queue: %s", exc)
 
@@ -180,11 +246,16 @@ class SendQueue:
         if not self._path.exists():
             return
         try:
-            raw = json.loads(self._path.read_text(encoding="utf-8"))
+            data = self._path.read_bytes()
+            raw = orjson.loads(data) if orjson is not None else json.loads(data)
             if isinstance(raw, list):
-                self._queue = [ScheduledMessage.from_dict(d) for d in raw if isinstance(d, dict)]
-                if self._queue:
-                    logger.info("[SEND_Q] Loaded %d pending sends from disk", len(self._queue))
+                entries = [ScheduledMessage.from_dict(d) for d in raw if isinstance(d, dict)]
+                self._heap = [(e.send_after_epoch, next(self._seq), e) for e in entries]
+                heapq.heapify(self._heap)
+                self._by_handle = Counter(e.handle for e in entries)
+                if self._heap:
+                    logger.info("[SEND_Q] Loaded %d pending sends from disk", len(self._heap))
         except Exception as exc:
             logger.warning("[SEND_Q] Failed to load queue: %s", exc)
-            self._queue = []
+            self._heap = []
+            self._by_handle = Counter()
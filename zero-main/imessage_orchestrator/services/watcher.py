@@ -13,10 +13,23 @@ from .interfaces import IncomingMessage
 
 logger = logging.getLogger(__name__)
 
+# iMessage stores dates as nanoseconds since 2001-01-01 (Apple epoch)
+APPLE_EPOCH_OFFSET = 978307200  # Seconds between Unix epoch (1970) and Apple epoch (2001)
+
+
+def _apple_to_unix(raw_date: int) -> float:
+    """Convert a chat.db ``message.date`` to a Unix timestamp in seconds."""
+    # Check if it's in nanoseconds (very large number) or already seconds
+    if raw_date > 1e12:  # Nanoseconds
+        return (raw_date / 1e9) + APPLE_EPOCH_OFFSET
+    return raw_date + APPLE_EPOCH_OFFSET  # Already in seconds from Apple epoch
+
 
 class iMessageWatcher:
     """Ingress service: polls chat.db for new inbound messages."""
 
+    transport_name = "iMessage"
+
     def __init__(
         self,
         *,
@@ -94,7 +107,7 @@ class iMessageWatcher:
             AND m.is_from_me = 0
             AND {clause}
             AND COALESCE(m.text, '') <> ''
-        ORDER BY m.ROWID ASC
+        ORDER BY m.date ASC, m.ROWID ASC
         """
 
         with connect_readonly(
@@ -115,7 +128,7 @@ class iMessageWatcher:
                     handle=str(r["handle"]),
                     text=str(r["text"]).strip(),
                     service=str(r["service"]),
-                    date=int(r["date"] if r["date"] else 0),
+                    date=_apple_to_unix(r["date"]) if r["date"] else 0.0,
                 )
             )
 
@@ -238,12 +251,6 @@ class iMessageWatcher:
         NOTE: Reading from chat.db does NOT trigger read receipts.
         Read receipts are only sent when iMessage UI marks the conversation as viewed.
         """
-        import time
-        from datetime import datetime
-        
-        # iMessage stores dates as nanoseconds since 2001-01-01 (Apple epoch)
-        APPLE_EPOCH_OFFSET = 978307200  # Seconds between Unix epoch (1970) and Apple epoch (2001)
-        
         query = """
         SELECT
             m.ROWID AS message_rowid,
@@ -267,20 +274,23 @@ class iMessageWatcher:
         ) as conn:
             rows = fetch_all(conn, query, (handle, handle, limit))
 
+        return self._timestamped_messages(reversed(rows))
+
+    def _timestamped_messages(self, rows) -> list[dict[str, Any]]:
+        """Convert chronologically ordered chat.db rows into timestamped context dicts."""
+        import time
+        from datetime import datetime
+
         messages: list[dict[str, Any]] = []
         now = time.time()
         
-        for r in reversed(rows):  # Reverse to get chronological order
+        for r in rows:
             raw_date = r["date"]
             
             # Convert Apple timestamp to Unix timestamp
             # chat.db stores dates in nanoseconds since 2001-01-01
             if raw_date and raw_date > 0:
-                # Check if it's in nanoseconds (very large number) or already seconds
-                if raw_date > 1e12:  # Nanoseconds
-                    unix_ts = (raw_date / 1e9) + APPLE_EPOCH_OFFSET
-                else:  # Already in seconds from Apple epoch
-                    unix_ts = raw_date + APPLE_EPOCH_OFFSET
+                unix_ts = _apple_to_unix(raw_date)
             else:
                 unix_ts = now  # Fallback
             
@@ -21,6 +21,8 @@ class WhatsAppWatcher:
     - Tracks failed reads so unread notifications are not lost.
     """
 
+    transport_name = "WhatsApp"
+
     def __init__(self, lotl_client: LotLClient = None) -> None:
         self.client = lotl_client if lotl_client else LotLClient(base_url=settings.LOTL_BASE_URL)
         self._store = WhatsAppMessageStore(
@@ -70,7 +72,7 @@ class WhatsAppWatcher:
                 handle=handle,
                 text=f"__UNREAD_PENDING__:{handle}",
                 service="WhatsApp",
-                date=int(time.time() * 1000000000)
+                date=time.time()
             ))
 
         return messages
@@ -0,0 +1,184 @@
+"""Tests for AnalystService response parsing and unknown-contact normalization."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+class TestStripFences:
+    """Verify markdown fences are removed from JSON replies."""
+
+    def test_json_fence(self) -> None:
+        from services.analyst_service import _strip_fences
+
+        assert _strip_fences('```json\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_uppercase_language_tag(self) -> None:
+        from services.analyst_service import _strip_fences
+
+        assert _strip_fences('```JSON {"a": 1} ```') == '{"a": 1}'
+
+    def test_unterminated_fence(self) -> None:
+        from services.analyst_service import _strip_fences
+
+        assert _strip_fences('```json\n{"a": 1}\n') == '{"a": 1}'
+        assert _strip_fences('```\n{"a": "x```y"}') == '{"a": "x```y"}'
+
+    def test_plain_text_untouched(self) -> None:
+        from services.analyst_service import _strip_fences
+
+        assert _strip_fences('  {"a": 1}\n') == '{"a": 1}'
+
+
+class TestUnknownContactNormalization:
+    """Verify triage output is coerced into the fixed schema."""
+
+    def test_probabilities_clamped_and_defaulted(self) -> None:
+        from services.analyst_service import AnalystService
+
+        result = AnalystService._normalize_unknown_contact_result({
+            "classification": "not-a-real-class",
+            "confidence": "2.5",
+            "demographics": {"p_male": "0.7", "p_female": -1, "p_dating": "bad"},
+        })
+
+        assert result["classification"] == "unknown"
+        assert result["confidence"] == 1.0
+        belief = result["belief_state"]
+        assert belief["p_male"] == 0.7
+        assert belief["p_female"] == 0.0
+        assert belief["p_dating"] == 0.0
+        assert belief["p_friendship"] == 0.0
+        assert belief["age_estimate"] == "unknown"
+
+    def test_non_dict_returns_safe_fallback(self) -> None:
+        from services.analyst_service import AnalystService
+
+        result = AnalystService._normalize_unknown_contact_result(None)
+
+        assert result["classification"] == "unknown"
+        assert result["risk_flags"] == ["analysis_failed"]
+        assert result["suggested_reply"]
+
+
+class TestAnalysisCache:
+    """Verify identical analysis requests are served from the in-memory LRU."""
+
+    def _make_service(self):
+        from services.analyst_service import AnalystService
+
+        with patch("services.analyst_service.settings") as mock_settings:
+            mock_settings.LLM_PROVIDER = "lotl"
+            mock_settings.GEMINI_API_KEY = None
+            return AnalystService(api_key=None, lotl_client=MagicMock())
+
+    def test_success_is_cached_and_copied(self) -> None:
+        service = self._make_service()
+        calls = []
+
+        def fake_lotl(prompt, content, profile, *, platform="gemini"):
+            calls.append(content)
+            return {"facts": [{"fact": "likes tea"}]}
+
+        with patch.object(service, "_lotl_analyze", side_effect=fake_lotl):
+            first = service._run_analysis("SYS", "log")
+            first["facts"].append({"fact": "mutated"})
+            second = service._run_analysis("SYS", "log")
+
+        assert len(calls) == 1
+        assert second == {"facts": [{"fact": "likes tea"}]}
+
+    def test_empty_result_not_cached(self) -> None:
+        service = self._make_service()
+
+        with patch.object(service, "_lotl_analyze", return_value={}) as mock_lotl:
+            service._run_analysis("SYS", "log")
+            service._run_analysis("SYS", "log")
+
+        assert mock_lotl.call_count == 2
+
+
+class TestAnalyzeBatch:
+    """Verify batched triage matches results by id and falls back per contact."""
+
+    _CONTACTS = [
+        {"handle": "+15550000000", "inbound_text": "hi"},
+        {"handle": "+15550000001", "inbound_text": "buy now"},
+        {"handle": "+15550000002", "inbound_text": "meeting?"},
+    ]
+
+    def _make_service(self):
+        from services.analyst_service import AnalystService
+
+        with patch("services.analyst_service.settings") as mock_settings:
+            mock_settings.LLM_PROVIDER = "lotl"
+            mock_settings.GEMINI_API_KEY = None
+            return AnalystService(api_key=None, lotl_client=MagicMock())
+
+    def test_well_formed_batch_uses_one_call(self) -> None:
+        service = self._make_service()
+        reply = {"results": [
+            {"id": 0, "classification": "benign_chat"},
+            {"id": 1, "classification": "spam"},
+            {"id": 2, "classification": "business"},
+        ]}
+        with patch.object(service, "_run_analysis", return_value=reply) as mock_run, \
+                patch.object(service, "analyze_unknown_contact") as mock_single:
+            results = service.analyze_batch(self._CONTACTS)
+
+        assert mock_run.call_count == 1
+        mock_single.assert_not_called()
+        assert [r["classification"] for r in results] == ["benign_chat", "spam", "business"]
+
+    def test_short_and_misordered_results_fall_back_per_contact(self) -> None:
+        service = self._make_service()
+        reply = {"results": [
+            {"id": 2, "classification": "business"},
+            {"id": True, "classification": "scam"},
+            {"id": 0, "classification": "benign_chat"},
+        ]}
+        fallback = {"classification": "unknown", "handle_seen": None}
+
+        def single(*, handle, inbound_text):
+            return {**fallback, "handle_seen": handle}
+
+        with patch.object(service, "_run_analysis", return_value=reply), \
+                patch.object(service, "analyze_unknown_contact", side_effect=single) as mock_single:
+            results = service.analyze_batch(self._CONTACTS)
+
+        mock_single.assert_called_once_with(handle="+15550000001", inbound_text="buy now")
+        assert results[0]["classification"] == "benign_chat"
+        assert results[1]["handle_seen"] == "+15550000001"
+        assert results[2]["classification"] == "business"
+
+    def test_non_json_reply_falls_back_per_contact(self) -> None:
+        service = self._make_service()
+        service.lotl.is_available.return_value = True
+
+        def chat(prompt, **kwargs):
+            if "BATCH MODE" in prompt:
+                return "Sorry, I can't help with that."
+            return '{"classification": "benign_chat", "confidence": 0.8}'
+
+        service.lotl.chat.side_effect = chat
+        results = service.analyze_batch(self._CONTACTS)
+
+        assert service.lotl.chat.call_count == 1 + len(self._CONTACTS)
+        assert [r["classification"] for r in results] == ["benign_chat"] * 3
+
+    def test_provider_exception_falls_back_per_contact(self) -> None:
+        service = self._make_service()
+        single = {"classification": "business"}
+        with patch.object(service, "_run_analysis", side_effect=RuntimeError("boom")), \
+                patch.object(service, "analyze_unknown_contact", return_value=single) as mock_single:
+            results = service.analyze_batch(self._CONTACTS)
+
+        assert mock_single.call_count == 3
+        assert results == [single] * 3
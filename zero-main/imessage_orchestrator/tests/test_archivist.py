@@ -0,0 +1,303 @@
+"""Tests for Archivist profile IO and LLM context shaping."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+class TestFilterForLlmContext:
+    """Verify orchestrator-only state never reaches the Delegate payload."""
+
+    def test_strips_orchestrator_fields(self, tmp_path: Path) -> None:
+        from services.archivist import Archivist
+
+        archivist = Archivist(contacts_dir=tmp_path)
+        profile = archivist.load_profile("+15550001111")
+        profile["operational_state"]["compliance_score"] = 0.9
+        profile["operator_context"] = "met at work"
+
+        filtered = archivist._filter_for_llm_context(profile)
+
+        assert "pacing_engine" not in filtered
+        assert "requires_approval" not in filtered
+        assert "handle" not in filtered["identity_matrix"]
+        assert "last_interaction_epoch" not in filtered["identity_matrix"]
+        assert "compliance_score" not in filtered["operational_state"]
+        assert filtered["operator_context"] == "met at work"
+
+
+class TestProfileRoundTrip:
+    """Verify profiles persist and reload with defaults merged in."""
+
+    def test_update_then_load(self, tmp_path: Path) -> None:
+        from services.archivist import Archivist
+
+        archivist = Archivist(contacts_dir=tmp_path)
+        profile = archivist.load_profile("15550001111")
+        profile["operator_context"] = "café owner"
+        archivist.update_profile("+15550001111", profile)
+
+        reloaded = archivist.load_profile("+15550001111")
+
+        assert reloaded["identity_matrix"]["handle"] == "+15550001111"
+        assert reloaded["operator_context"] == "café owner"
+        assert "pacing_engine" in reloaded
+
+    def test_handles_are_stripped_at_the_api_boundary(self, tmp_path: Path) -> None:
+        from services.archivist import Archivist
+
+        archivist = Archivist(contacts_dir=tmp_path)
+        archivist.update_profile(" +15550001111\n", archivist.load_profile("15550001111 "))
+
+        assert (tmp_path / "+15550001111.json").exists()
+        assert archivist.has_profile(" 15550001111")
+        assert archivist.load_profile("\t+15550001111")["identity_matrix"]["handle"] == "+15550001111"
+
+    def test_new_templates_do_not_share_state(self, tmp_path: Path) -> None:
+        from services.archivist import DEFAULT_PROFILE_TEMPLATE, Archivist
+
+        archivist = Archivist(contacts_dir=tmp_path)
+        first = archivist.load_profile("+15550002222")
+        first["knowledge_graph"].append("mutated")
+        second = archivist.load_profile("+15550003333")
+
+        assert second["knowledge_graph"] == []
+        assert DEFAULT_PROFILE_TEMPLATE["knowledge_graph"] == []
+
+
+    def test_merge_fills_nested_defaults_without_aliasing(self, tmp_path: Path) -> None:
+        import json
+
+        from services.archivist import DEFAULT_PROFILE_TEMPLATE, Archivist
+
+        (tmp_path / "+15550004444.json").write_text(
+            json.dumps({
+                "identity_matrix": {"name": "Sam"},
+                "operational_state": {"narrative_arc": None},
+            }),
+            encoding="utf-8",
+        )
+        archivist = Archivist(contacts_dir=tmp_path)
+
+        profile = archivist.load_profile("+15550004444")
+        profile["psychometric_profile"]["emotional_events"].append({"emotion": "joy"})
+        other = archivist.load_profile("+15550004444")
+
+        assert profile["identity_matrix"]["name"] == "Sam"
+        assert profile["identity_matrix"]["personal_information"]["occupation"] == "Unknown"
+        assert profile["pacing_engine"]["quiet_hours"]["start_hour"] == 23
+        assert profile["operational_state"]["narrative_arc"] is None
+        assert other["psychometric_profile"]["emotional_events"] == []
+        assert DEFAULT_PROFILE_TEMPLATE["psychometric_profile"]["emotional_events"] == []
+
+    def test_merge_copies_non_empty_mutable_defaults(self, tmp_path: Path) -> None:
+        from unittest.mock import patch
+
+        from services import archivist as archivist_mod
+
+        default = ["seed", {"nested": []}]
+        archivist = archivist_mod.Archivist(contacts_dir=tmp_path)
+        with patch.object(archivist_mod, "_DEFAULT_PATHS", [((), "tags", default, True)]):
+            merged = archivist._merge_defaults({}, "+15550005555")
+
+        assert merged["tags"] == ["seed", {"nested": []}]
+        assert merged["tags"] is not default
+        assert merged["tags"][1]["nested"] is not default[1]["nested"]
+
+
+class TestBuildContextPayload:
+    """Verify the Delegate system instruction is assembled in order."""
+
+    def test_sections_and_length_mirroring(self, tmp_path: Path) -> None:
+        from config.prompts import PROACTIVE_INITIATION_INJECTION
+        from services.archivist import Archivist
+
+        archivist = Archivist(contacts_dir=tmp_path)
+        profile = archivist.load_profile("+15550001111")
+        messages = [
+            {"sender": "them", "text": "x" * 40, "time_ago": "5m ago"},
+            {"role": "assistant", "text": "ok", "time_ago": "4m ago"},
+            {"is_from_me": 0, "text": "y" * 60, "time_ago": "1m ago"},
+        ]
+
+        payload = archivist.build_context_payload(
+            profile, messages, analyst_report=' {"mood": "calm"} ', is_proactive=True
+        )
+        text = payload["system_instruction"]
+
+        assert PROACTIVE_INITIATION_INJECTION in text
+        assert text.index("## CURRENT TIME") < text.index("## CONTEXT REPORT")
+        assert '```json\n{"mood": "calm"}\n```' in text
+        assert text.index("## CONTACT PROFILE") < text.index("## RECENT CONVERSATION")
+        assert "[5m ago] THEY: " in text
+        assert "[4m ago] ME: ok" in text
+        assert "Target length: ~50 characters" in text
+        assert payload["contact"] is profile
+
+
+    def test_peek_profile_caches_until_file_changes(self, tmp_path: Path) -> None:
+        from unittest.mock import patch
+
+        from services import archivist as archivist_mod
+
+        archivist = archivist_mod.Archivist(contacts_dir=tmp_path)
+        profile = archivist.load_profile("+15550001111")
+        archivist.update_profile("+15550001111", profile)
+
+        with patch.object(archivist_mod, "_loads", wraps=archivist_mod._loads) as spy:
+            first = archivist.peek_profile("+15550001111")
+            second = archivist.peek_profile("15550001111")
+            assert spy.call_count == 1
+            assert second is first
+
+            profile["operator_context"] = "updated"
+            archivist.update_profile("+15550001111", profile)
+            third = archivist.peek_profile("+15550001111")
+
+        assert spy.call_count == 2
+        assert third["operator_context"] == "updated"
+
+
+class TestLegacyDuplicates:
+    """Verify numeric-only duplicate profiles are reconciled at startup."""
+
+    def test_force_trigger_mirrored_and_legacy_archived(self, tmp_path: Path) -> None:
+        import json
+
+        from services.archivist import Archivist
+
+        (tmp_path / "15550001111.json").write_text(
+            json.dumps({"pacing_engine": {"force_trigger": True}}), encoding="utf-8"
+        )
+        (tmp_path / "+15550001111.json").write_text(json.dumps({}), encoding="utf-8")
+        (tmp_path / "friend@example.com.json").write_text(json.dumps({}), encoding="utf-8")
+
+        archivist = Archivist(contacts_dir=tmp_path)
+
+        assert not (tmp_path / "15550001111.json").exists()
+        assert (tmp_path / "_legacy" / "15550001111.json").exists()
+        assert archivist.load_profile("+15550001111")["pacing_engine"]["force_trigger"] is True
+        assert archivist.get_all_handles() == ["+15550001111", "friend@example.com"]
+
+
+class TestEmotionalCarryover:
+    """Verify emotional events decay from their stored detection time."""
+
+    def test_epoch_and_legacy_iso_events(self, tmp_path: Path) -> None:
+        import datetime
+
+        from services.archivist import Archivist
+
+        archivist = Archivist(contacts_dir=tmp_path)
+        profile = archivist.load_profile("+15550001111")
+        now = datetime.datetime.now(datetime.timezone.utc)
+        profile["psychometric_profile"]["emotional_events"] = [
+            {"emotion": "joy", "intensity": 0.9, "context": "promotion",
+             "detected_at_epoch": now.timestamp() - 3600},
+            {"emotion": "grief", "intensity": 0.8, "context": "loss",
+             "detected_at": (now - datetime.timedelta(hours=2)).isoformat()},
+            {"emotion": "anger", "intensity": 0.9, "context": "old",
+             "detected_at_epoch": now.timestamp() - 30 * 86400},
+            {"emotion": "broken", "detected_at": "not-a-date"},
+        ]
+
+        text = archivist._get_active_emotional_context(profile)
+
+        assert "**Joy** (strong, 1 hours ago): promotion" in text
+        assert "**Grief**" in text
+        assert "Anger" not in text
+        assert "Broken" not in text
+
+    def test_future_events_do_not_gain_intensity(self, tmp_path: Path) -> None:
+        import datetime
+
+        from services.archivist import Archivist
+
+        archivist = Archivist(contacts_dir=tmp_path)
+        profile = archivist.load_profile("+15550001111")
+        future = datetime.datetime.now().timestamp() + 10 * 86400
+        profile["psychometric_profile"]["emotional_events"] = [
+            {"emotion": "worry", "intensity": 0.15, "detected_at_epoch": future},
+            {"emotion": "joy", "intensity": 0.5, "context": "skewed", "detected_at_epoch": future},
+        ]
+
+        text = archivist._get_active_emotional_context(profile)
+
+        assert "Worry" not in text
+        assert "**Joy** (moderate, 0 hours ago): skewed" in text
+
+    def test_proactive_without_history_uses_fast_path(self, tmp_path: Path) -> None:
+        from unittest.mock import patch
+
+        from config.prompts import PROACTIVE_INITIATION_INJECTION
+        from services.archivist import Archivist
+
+        archivist = Archivist(contacts_dir=tmp_path)
+        profile = archivist.load_profile("+15550001111")
+
+        with patch.object(archivist, "_fast_proactive", wraps=archivist._fast_proactive) as spy:
+            text = archivist.build_context_payload(profile, [], is_proactive=True)["system_instruction"]
+
+        spy.assert_called_once_with(profile)
+        assert PROACTIVE_INITIATION_INJECTION in text
+        assert "## CURRENT TIME" in text
+        assert "## CONTACT PROFILE (JSON)" in text
+        assert "## RECENT CONVERSATION" not in text
+        assert text.endswith("No reasoning output.\n")
+
+    def test_profile_json_reused_until_profile_saved(self, tmp_path: Path) -> None:
+        from unittest.mock import patch
+
+        from services import archivist as archivist_mod
+
+        archivist = archivist_mod.Archivist(contacts_dir=tmp_path)
+        profile = archivist.load_profile("+15550001111")
+        archivist.update_profile("+15550001111", profile)
+
+        with patch.object(archivist_mod, "_dumps_indented", wraps=archivist_mod._dumps_indented) as spy:
+            first = archivist._filtered_profile_json(profile)
+            second = archivist._filtered_profile_json(archivist.load_profile("+15550001111"))
+            assert spy.call_count == 1
+            assert second == first
+
+            # Saving through update_profile drops the cached text.
+            profile["operator_context"] = "saved note"
+            archivist.update_profile("+15550001111", profile)
+            assert "saved note" in archivist._filtered_profile_json(profile)
+            assert spy.call_count == 2
+
+    def test_invalid_timezone_falls_back(self, tmp_path: Path) -> None:
+        from services.archivist import Archivist
+
+        archivist = Archivist(contacts_dir=tmp_path)
+        profile = archivist.load_profile("+15550001111")
+
+        for bad in ("Mars/Olympus_Mons", "", None):
+            profile["identity_matrix"]["timezone"] = bad
+            assert "## CURRENT TIME" in archivist._current_time_section(profile)
+            assert archivist._compute_immediate_context(profile)["current_day_of_week"]
+
+    def test_many_duplicates_reconciled_in_parallel(self, tmp_path: Path) -> None:
+        import json
+
+        from services.archivist import Archivist
+
+        stems = [f"1555000{i:04d}" for i in range(10)]
+        for stem in stems:
+            (tmp_path / f"{stem}.json").write_text(
+                json.dumps({"pacing_engine": {"force_trigger": True}}), encoding="utf-8"
+            )
+            (tmp_path / f"+{stem}.json").write_text(json.dumps({}), encoding="utf-8")
+
+        archivist = Archivist(contacts_dir=tmp_path)
+
+        assert archivist.get_all_handles() == sorted("+" + s for s in stems)
+        for stem in stems:
+            assert (tmp_path / "_legacy" / f"{stem}.json").exists()
+            assert archivist.load_profile(stem)["pacing_engine"]["force_trigger"] is True
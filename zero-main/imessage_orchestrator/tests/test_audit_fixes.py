@@ -63,6 +63,19 @@ class TestAtomicWriteJson:
         atomic_write_json(target, {"created": True})
         assert target.exists()
 
+    def test_write_bytes_replaces_and_cleans_up_on_failure(self, tmp_path: Path) -> None:
+        from utils.atomic import atomic_write_bytes
+
+        target = tmp_path / "test.json"
+        atomic_write_bytes(target, b'{"v": 1}')
+        assert target.read_bytes() == b'{"v": 1}'
+
+        with patch("utils.atomic.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                atomic_write_bytes(target, b'{"v": 2}')
+        assert target.read_bytes() == b'{"v": 1}'
+        assert not target.with_suffix(".json.tmp").exists()
+
 
 # ---------------------------------------------------------------------------
 # Module 3: watcher.py uses atomic_write_json for save_state
@@ -243,10 +256,7 @@ class TestLotLErrorClassification:
             return mock_response
 
         with patch("httpx.Client") as MockClient:
-            mock_ctx = MagicMock()
-            mock_ctx.post = mock_post
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_ctx)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value.post = mock_post
 
             with pytest.raises(RuntimeError, match="(?i)captcha"):
                 client.chat("test prompt")
@@ -276,10 +286,7 @@ class TestLotLErrorClassification:
             return mock_response
 
         with patch("httpx.Client") as MockClient:
-            mock_ctx = MagicMock()
-            mock_ctx.post = mock_post
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_ctx)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value.post = mock_post
 
             with pytest.raises(RuntimeError):
                 client.chat("test prompt")
@@ -308,10 +315,7 @@ class TestLotLErrorClassification:
             return mock_response
 
         with patch("httpx.Client") as MockClient:
-            mock_ctx = MagicMock()
-            mock_ctx.post = mock_post
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_ctx)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value.post = mock_post
 
             with patch("time.sleep"):  # Skip actual delays
                 with pytest.raises(RuntimeError):
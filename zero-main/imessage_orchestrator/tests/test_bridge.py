@@ -0,0 +1,282 @@
+"""Tests for the iMessage AppleScript bridge."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+def _completed(stdout: bytes = b"SUCCESS: imsg_chat\n", returncode: int = 0, stderr: bytes = b"") -> MagicMock:
+    result = MagicMock()
+    result.returncode = returncode
+    result.stdout = stdout
+    result.stderr = stderr
+    return result
+
+
+class TestNormalizeHandle:
+    """Verify US phone numbers gain a +1 prefix and other handles pass through."""
+
+    def test_normalization_cases(self) -> None:
+        from services.bridge import _normalize_handle
+
+        assert _normalize_handle("5551234567") == "+15551234567"
+        assert _normalize_handle("15551234567") == "+15551234567"
+        assert _normalize_handle("555-123 4567") == "+15551234567"
+        assert _normalize_handle("1 555-123-4567") == "+15551234567"
+        assert _normalize_handle("+447700900123") == "+447700900123"
+        assert _normalize_handle("friend@example.com") == "friend@example.com"
+        assert _normalize_handle("123") == "123"
+
+
+class TestCompiledSendScript:
+    """Verify the send routine is compiled once and fed argv."""
+
+    def test_compiled_script_reused_with_argv(self, tmp_path: Path) -> None:
+        from services.bridge import _SEND_OK, iMessageBridge
+
+        calls = []
+        inputs = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            inputs.append(kwargs.get("input"))
+            if cmd[0] == "osacompile":
+                Path(cmd[2]).write_bytes(b"compiled")
+            return _completed()
+
+        bridge = iMessageBridge()
+        with patch("services.bridge.subprocess.run", side_effect=fake_run), \
+             patch("services.bridge.tempfile.mkdtemp", return_value=str(tmp_path)):
+            assert bridge._try_send("5551234567", 'say "hi"') == _SEND_OK
+            assert bridge._try_send("5551234567", "again") == _SEND_OK
+
+        assert [c[0] for c in calls] == ["osacompile", "osascript", "osascript"]
+        assert calls[1][:3] == ["osascript", str(tmp_path / "send.scpt"), "+15551234567"]
+        assert calls[1][3:] == ["imsg_chat", "sms_chat", "imsg_buddy", "sms_buddy"]
+        # The message travels on stdin, never in argv (visible via ps).
+        assert inputs[1] == 'say "hi"'.encode("utf-8")
+        assert all('say "hi"' not in arg for arg in calls[1])
+        # The winning strategy is remembered, so the next send tries only that one.
+        assert calls[2][3:] == ["imsg_chat"]
+
+    def test_falls_back_to_inline_script(self) -> None:
+        from services.bridge import _SEND_OK, iMessageBridge
+
+        bridge = iMessageBridge()
+        with patch("services.bridge.subprocess.run") as mock_run:
+            mock_run.side_effect = [_completed(returncode=1), _completed()]
+            assert bridge._try_send("+15551234567", 'say "hi"') == _SEND_OK
+
+        cmd = mock_run.call_args_list[1].args[0]
+        script = mock_run.call_args_list[1].kwargs["input"].decode("utf-8")
+        assert cmd == ["osascript", "-"]
+        assert 'send "say \\"hi\\"" to theChat' in script
+
+    def test_inline_script_keeps_dollar_signs_literal(self) -> None:
+        from services.bridge import _build_inline_script
+
+        script = _build_inline_script(("imsg_buddy",), "+15551234567", "owe you $5 $HANDLE").decode("utf-8")
+
+        assert 'send "owe you $5 $HANDLE" to buddy "+15551234567"' in script
+
+    def test_error_output_is_a_failure(self) -> None:
+        from services.bridge import _SEND_OK, iMessageBridge
+
+        bridge = iMessageBridge()
+        bridge._compile_attempted = True  # Skip osacompile
+        with patch("services.bridge.subprocess.run", return_value=_completed(b"ERROR: All strategies failed.")):
+            assert bridge._try_send("+15551234567", "hi") != _SEND_OK
+
+    def test_failed_stdin_read_is_reported_as_failure(self, tmp_path: Path) -> None:
+        from services.bridge import _SEND_OK, _SEND_SCRIPT_SOURCE, iMessageBridge
+
+        # The read failure returns before the strategy loop can send anything
+        read_error = _SEND_SCRIPT_SOURCE.index('return "ERROR: could not read message from stdin"')
+        assert read_error < _SEND_SCRIPT_SOURCE.index("repeat with i from 2")
+
+        def fake_run(cmd, **kwargs):
+            if cmd[0] == "osacompile":
+                Path(cmd[2]).write_bytes(b"compiled")
+                return _completed()
+            return _completed(b"ERROR: could not read message from stdin\n")
+
+        bridge = iMessageBridge()
+        with patch("services.bridge.subprocess.run", side_effect=fake_run), \
+             patch("services.bridge.tempfile.mkdtemp", return_value=str(tmp_path)):
+            assert bridge._try_send("+15551234567", "hi") != _SEND_OK
+
+        assert "+15551234567" not in bridge._strategy
+
+    def test_stderr_drives_failure_classification(self) -> None:
+        from services.bridge import _SEND_PERMANENT, iMessageBridge
+
+        bridge = iMessageBridge()
+        bridge._compile_attempted = True  # Skip osacompile
+        failed = _completed(
+            b"", returncode=1,
+            stderr=b"execution error: Not authorized to send Apple events to Messages. (-1743)\n",
+        )
+        with patch("services.bridge.subprocess.run", return_value=failed) as mock_run:
+            assert bridge._try_send("+15551234567", "hi") == _SEND_PERMANENT
+
+        assert mock_run.call_args.kwargs["capture_output"] is True
+
+    def test_stderr_warning_does_not_mask_error_result(self) -> None:
+        from services.bridge import _SEND_OK, iMessageBridge
+
+        bridge = iMessageBridge()
+        bridge._compile_attempted = True  # Skip osacompile
+        result = _completed(
+            b"ERROR: All strategies failed. Can't get buddy id \"x\".\n",
+            stderr=b"osascript: warning: scripting addition is deprecated\n",
+        )
+        with patch("services.bridge.subprocess.run", return_value=result), \
+             patch("services.bridge.logger") as mock_logger:
+            assert bridge._try_send("+15551234567", "hi") != _SEND_OK
+
+        assert "scripting addition is deprecated" in mock_logger.error.call_args.args[0]
+
+
+class TestScriptingBridgeSend:
+    """Verify the in-process ScriptingBridge path and its osascript fallback."""
+
+    def test_existing_chat_sends_without_osascript(self) -> None:
+        from services.bridge import _SEND_OK, iMessageBridge
+
+        bridge = iMessageBridge()
+        app = MagicMock()
+        chat = object()
+        app.chats.return_value.objectWithID_.return_value.get.return_value = chat
+        bridge._messages_app = app
+
+        with patch("services.bridge.subprocess.run") as mock_run:
+            assert bridge._try_send("5551234567", "hi") == _SEND_OK
+
+        app.chats.return_value.objectWithID_.assert_called_once_with("iMessage;-;+15551234567")
+        app.send_to_.assert_called_once_with("hi", chat)
+        mock_run.assert_not_called()
+
+    def test_unresolved_chat_falls_back_to_osascript(self) -> None:
+        from services.bridge import _SEND_OK, iMessageBridge
+
+        bridge = iMessageBridge()
+        app = MagicMock()
+        app.chats.return_value.objectWithID_.return_value.get.return_value = None
+        bridge._messages_app = app
+        bridge._compile_attempted = True  # Skip osacompile
+
+        with patch("services.bridge.subprocess.run", return_value=_completed()) as mock_run:
+            assert bridge._try_send("+15551234567", "hi") == _SEND_OK
+
+        app.send_to_.assert_not_called()
+        assert mock_run.call_args.args[0] == ["osascript", "-"]
+
+
+class TestStrategyCache:
+    """Verify the winning AppleScript strategy is remembered per handle."""
+
+    def test_cached_strategy_failure_falls_back_to_cascade(self) -> None:
+        from services.bridge import _SEND_OK, iMessageBridge
+
+        bridge = iMessageBridge()
+        bridge._compile_attempted = True  # Inline script path
+        outputs = [
+            _completed(b"SUCCESS: sms_buddy\n"),
+            _completed(b"ERROR: All strategies failed. gone\n"),
+            _completed(b"SUCCESS: sms_chat\n"),
+        ]
+        with patch("services.bridge.subprocess.run", side_effect=outputs) as mock_run:
+            assert bridge._try_send("+15551234567", "one") == _SEND_OK
+            assert bridge._strategy["+15551234567"] == "sms_buddy"
+            assert bridge._try_send("+15551234567", "two") == _SEND_OK
+
+        scripts = [c.kwargs["input"].decode("utf-8") for c in mock_run.call_args_list]
+        assert "chat id" not in scripts[1]
+        assert 'buddy "+15551234567" of (1st service whose service type is SMS)' in scripts[1]
+        assert scripts[2].count("try") >= 4
+        assert bridge._strategy["+15551234567"] == "sms_chat"
+
+    def test_chat_db_service_seeds_first_strategy(self, tmp_path: Path) -> None:
+        import sqlite3
+
+        from services.bridge import _SEND_OK, iMessageBridge
+
+        db = tmp_path / "chat.db"
+        conn = sqlite3.connect(db)
+        conn.execute("CREATE TABLE chat (ROWID INTEGER PRIMARY KEY, chat_identifier TEXT, service_name TEXT)")
+        conn.execute("INSERT INTO chat VALUES (1, '+15551234567', 'SMS')")
+        conn.commit()
+        conn.close()
+
+        bridge = iMessageBridge()
+        bridge._compile_attempted = True  # Inline script path
+        bridge._chat_db_enabled = True
+        with patch("services.bridge.settings.CHAT_DB_PATH", db), \
+             patch("services.bridge.subprocess.run", return_value=_completed(b"SUCCESS: sms_chat\n")) as mock_run:
+            assert bridge._try_send("5551234567", "hi") == _SEND_OK
+
+        script = mock_run.call_args.kwargs["input"].decode("utf-8")
+        assert mock_run.call_count == 1
+        assert '"SMS;-;" & "+15551234567"' in script
+        assert "iMessage" not in script
+
+
+class TestRetryClassification:
+    """Verify permanent failures abort retries and trip the per-handle breaker."""
+
+    def _bridge(self):
+        from services.bridge import iMessageBridge
+
+        bridge = iMessageBridge()
+        bridge._compile_attempted = True  # Inline script path
+        return bridge
+
+    def test_classify_send_error(self) -> None:
+        from services.bridge import _SEND_PERMANENT, _SEND_TRANSIENT, _classify_send_error
+
+        assert _classify_send_error("ERROR: All strategies failed. Can't get buddy id \"x\". (-1728)") == _SEND_PERMANENT
+        assert _classify_send_error("execution error: AppleEvent timed out. (-1712)") == _SEND_TRANSIENT
+
+    def test_permanent_error_is_not_retried(self) -> None:
+        bridge = self._bridge()
+        with patch("services.bridge.subprocess.run",
+                   return_value=_completed(b"ERROR: All strategies failed. Can't get buddy. (-1728)")) as mock_run, \
+             patch("services.bridge.time.sleep") as mock_sleep:
+            assert not bridge.send_message("+15551234567", "hi")
+
+        assert mock_run.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_transient_error_backs_off_with_jitter(self) -> None:
+        bridge = self._bridge()
+        outputs = [_completed(b"ERROR: All strategies failed. timed out (-1712)"), _completed()]
+        with patch("services.bridge.subprocess.run", side_effect=outputs), \
+             patch("services.bridge.settings") as mock_settings, \
+             patch("services.bridge.time.sleep") as mock_sleep:
+            mock_settings.BRIDGE_SEND_RETRIES = 3
+            mock_settings.BRIDGE_SEND_BACKOFF = 1.0
+            mock_settings.BRIDGE_SEND_BACKOFF_CAP = 2.0
+            assert bridge.send_message("+15551234567", "hi")
+
+        assert 1.0 <= mock_sleep.call_args.args[0] <= 2.0
+
+    def test_breaker_opens_after_repeated_permanent_failures(self) -> None:
+        bridge = self._bridge()
+        with patch("services.bridge.subprocess.run",
+                   return_value=_completed(b"ERROR: All strategies failed. Can't get buddy. (-1728)")) as mock_run, \
+             patch("services.bridge.settings") as mock_settings:
+            mock_settings.BRIDGE_SEND_RETRIES = 3
+            mock_settings.BRIDGE_BREAKER_THRESHOLD = 2
+            mock_settings.BRIDGE_BREAKER_COOLDOWN = 60.0
+            for _ in range(3):
+                assert not bridge.send_message("5551234567", "hi")
+
+        # Third send short-circuits on the open breaker.
+        assert mock_run.call_count == 2
@@ -0,0 +1,237 @@
+"""Tests for CompositeWatcher fan-out and delegation."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+def _msg(handle: str, date: int, text: str = "hi"):
+    from services.interfaces import IncomingMessage
+
+    return IncomingMessage(message_rowid=date, handle=handle, text=text, service="iMessage", date=date)
+
+
+class TestPollNewMessages:
+    """Verify messages from all watchers are combined in date order."""
+
+    def test_merges_watchers_by_date(self) -> None:
+        from services.composite_watcher import CompositeWatcher
+
+        imsg = MagicMock()
+        imsg.poll.return_value = [_msg("+1", 1), _msg("+1", 5)]
+        wa = MagicMock()
+        wa.poll.return_value = [_msg("wa", 3)]
+
+        composite = CompositeWatcher([imsg, wa])
+        dates = [m.date for m in composite.poll_new_messages()]
+
+        assert dates == [1, 3, 5]
+
+    def test_poll_errors_propagate(self) -> None:
+        import pytest
+
+        from services.composite_watcher import CompositeWatcher
+
+        ok = MagicMock()
+        ok.poll.return_value = []
+        broken = MagicMock()
+        broken.poll.side_effect = RuntimeError("db locked")
+
+        with pytest.raises(RuntimeError):
+            CompositeWatcher([ok, broken]).poll_new_messages()
+
+
+class TestCapabilityDispatch:
+    """Verify optional watcher methods are resolved once and skipped when absent."""
+
+    def test_only_capable_watchers_are_called(self) -> None:
+        from services.composite_watcher import CompositeWatcher
+
+        class Minimal:
+            def initialize(self) -> None:
+                pass
+
+            def poll(self):
+                return []
+
+        rich = MagicMock()
+        rich.fetch_recent_history.return_value = [{"role": "user", "text": "yo"}]
+        rich.read_message.return_value = "hello"
+
+        composite = CompositeWatcher([Minimal(), rich])
+        composite.load_state()
+
+        rich.load_state.assert_called_once_with()
+        rich.verify_permissions.assert_called_once_with()
+        assert composite.fetch_recent_history(handle="+1", limit=5) == [{"role": "user", "text": "yo"}]
+        assert composite.read_message("+1") == "hello"
+
+
+class TestHistoryCache:
+    """Verify recent history is memoized briefly and invalidated on activity."""
+
+    def test_repeat_lookup_hits_cache(self) -> None:
+        from services.composite_watcher import CompositeWatcher
+
+        w = MagicMock()
+        w.fetch_recent_history.return_value = [{"role": "user", "text": "a"}]
+        composite = CompositeWatcher([w])
+
+        first = composite.fetch_recent_history(handle="+1", limit=5)
+        first.append({"role": "user", "text": "mutated"})
+        second = composite.fetch_recent_history(handle="+1", limit=5)
+
+        assert w.fetch_recent_history.call_count == 1
+        assert second == [{"role": "user", "text": "a"}]
+
+    def test_expired_entry_is_refetched(self) -> None:
+        from unittest.mock import patch
+
+        from services import composite_watcher
+        from services.composite_watcher import CompositeWatcher
+
+        w = MagicMock()
+        w.fetch_recent_history.return_value = [{"role": "user", "text": "a"}]
+        composite = CompositeWatcher([w])
+
+        with patch.object(composite_watcher.time, "monotonic", side_effect=[100.0, 103.0]):
+            composite.fetch_recent_history(handle="+1", limit=5)
+            composite.fetch_recent_history(handle="+1", limit=5)
+
+        assert w.fetch_recent_history.call_count == 2
+
+    def test_invalidate_and_inbound_poll_drop_entry(self) -> None:
+        from services.composite_watcher import CompositeWatcher
+
+        w = MagicMock()
+        w.fetch_recent_history.return_value = [{"role": "user", "text": "a"}]
+        w.poll.return_value = [_msg("+1", 1)]
+        composite = CompositeWatcher([w])
+
+        composite.fetch_recent_history(handle="+1", limit=5)
+        composite.invalidate("+1")
+        composite.fetch_recent_history(handle="+1", limit=5)
+        composite.poll_new_messages()
+        composite.fetch_recent_history(handle="+1", limit=5)
+
+        assert w.fetch_recent_history.call_count == 3
+
+
+class TestFetchLastMessagesWithTimestamps:
+    """Verify timestamped lookups prefer native watchers and fall back to history."""
+
+    def test_native_watcher_then_history_fallback(self) -> None:
+        from services.composite_watcher import CompositeWatcher
+
+        class NativeOnly:
+            def initialize(self) -> None:
+                pass
+
+            def poll(self):
+                return []
+
+            def fetch_last_messages_with_timestamps(self, *, handle, limit):
+                return [{"text": "native"}] if handle == "+1" else []
+
+        class HistoryOnly:
+            def initialize(self) -> None:
+                pass
+
+            def poll(self):
+                return []
+
+            def fetch_recent_history(self, *, handle, limit):
+                return [{"role": "assistant", "text": f"hist {handle}"}]
+
+        composite = CompositeWatcher([NativeOnly(), HistoryOnly()])
+
+        assert composite.fetch_last_messages_with_timestamps(handle="+1") == [{"text": "native"}]
+        fallback = composite.fetch_last_messages_with_timestamps(handle="wa", limit=3)
+        assert fallback[0]["text"] == "hist wa"
+        assert fallback[0]["sender"] == "Me"
+
+
+class TestHistoryRouting:
+    """Verify history lookups go to the transport that owns the handle first."""
+
+    def _watcher(self, name: str, calls: list):
+        class Source:
+            transport_name = name
+
+            def initialize(self) -> None:
+                pass
+
+            def poll(self):
+                return []
+
+            def fetch_recent_history(self, *, handle, limit):
+                calls.append(name)
+                return [{"role": "user", "text": name}]
+
+        return Source()
+
+    def test_jid_routes_to_whatsapp_first(self) -> None:
+        from services.composite_watcher import CompositeWatcher
+
+        calls: list = []
+        composite = CompositeWatcher([self._watcher("iMessage", calls), self._watcher("WhatsApp", calls)])
+
+        assert composite.fetch_recent_history(handle="1555@s.whatsapp.net", limit=5)[0]["text"] == "WhatsApp"
+        assert composite.fetch_recent_history(handle="+15551234567", limit=5)[0]["text"] == "iMessage"
+        assert calls == ["WhatsApp", "iMessage"]
+
+
+class TestDuplicateSuppression:
+    """Verify a message seen by two watchers (or polled twice) is emitted once."""
+
+    def test_duplicate_across_watchers_dropped(self) -> None:
+        from services.composite_watcher import CompositeWatcher
+
+        a = MagicMock()
+        a.poll.return_value = [_msg("+1", 5, "same")]
+        b = MagicMock()
+        b.poll.return_value = [_msg("+1", 5, "same"), _msg("+1", 6, "other")]
+
+        composite = CompositeWatcher([a, b])
+
+        assert [m.text for m in composite.poll_new_messages()] == ["same", "other"]
+
+    def test_repolled_message_dropped(self) -> None:
+        from services.composite_watcher import CompositeWatcher
+
+        w = MagicMock()
+        w.poll.return_value = [_msg("+1", 7, "again")]
+        composite = CompositeWatcher([w])
+
+        assert [m.text for m in composite.poll_new_messages()] == ["again"]
+        assert composite.poll_new_messages() == []
+
+
+class TestSingleWatcherFastPath:
+    """Verify a lone watcher is delegated to directly while keeping dedupe/cache upkeep."""
+
+    def test_single_watcher_delegates(self) -> None:
+        from services.composite_watcher import CompositeWatcher
+
+        w = MagicMock()
+        w.poll.side_effect = [[], [_msg("+1", 2), _msg("+1", 1)], [_msg("+1", 2)]]
+        w.fetch_recent_history.return_value = [{"role": "user", "text": "a"}]
+        composite = CompositeWatcher([w])
+
+        composite.initialize()
+        assert composite.poll_new_messages() == []
+        composite.fetch_recent_history(handle="+1", limit=5)
+        # Watcher order is kept as-is; the cached history is invalidated.
+        assert [m.date for m in composite.poll_new_messages()] == [2, 1]
+        composite.fetch_recent_history(handle="+1", limit=5)
+        assert composite.poll_new_messages() == []
+
+        w.initialize.assert_called_once_with()
+        assert w.fetch_recent_history.call_count == 2
@@ -0,0 +1,290 @@
+"""Tests for Delegate output cleaning and prompt-leak detection."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+def _clean(text: str) -> str:
+    from services.delegate import Delegate
+
+    return Delegate.__new__(Delegate)._clean_output(text)
+
+
+class TestCleanOutput:
+    """Verify reasoning, analyst markers and UI artifacts never reach the contact."""
+
+    def test_plain_reply_untouched(self) -> None:
+        assert _clean("  hey whats up  ") == "hey whats up"
+
+    def test_analyst_sections_removed(self) -> None:
+        text = "⏰ TIME CHECK: it's late\n📊 DYNAMICS: warm\n\nnight!"
+
+        assert _clean(text) == "night!"
+
+    def test_thinking_tags_and_headers_removed(self) -> None:
+        assert _clean("<thinking>plan stuff</thinking>\n\nhey babe") == "hey babe"
+        assert _clean("Strategy: be cool\n\nhaha yeah") == "haha yeah"
+
+    def test_dotted_capital_i_is_not_fast_pathed(self) -> None:
+        # re.IGNORECASE matches 'İ' to 'i' but casefold() turns it into 'i̇'
+        assert _clean("yo TACTİCAL CONTEXT secret") == "yo"
+
+    def test_prefix_and_quotes_stripped(self) -> None:
+        assert _clean("Response: hey you") == "hey you"
+        assert _clean('"quoted reply"') == "quoted reply"
+        assert _clean("Here's my draft: lol ok") == "lol ok"
+
+
+class TestPromptLeak:
+    """Verify prompt echoes are flagged without tripping on normal replies."""
+
+    def test_scaffolding_marker_is_leak(self) -> None:
+        from services.delegate import Delegate
+
+        assert Delegate._looks_like_prompt_leak(reply_text="system: do this", sent_prompt="x" * 200)
+
+    def test_prompt_head_echo_is_leak(self) -> None:
+        from services.delegate import Delegate
+
+        prompt = "You are a helpful assistant named Bob and you reply to texts"
+        reply = "You are a helpful   assistant named Bob and you reply"
+
+        assert Delegate._looks_like_prompt_leak(reply_text=reply, sent_prompt=prompt)
+
+    def test_normal_reply_is_not_leak(self) -> None:
+        from services.delegate import Delegate
+
+        prompt = "SYSTEM:\n" + "long prompt " * 500
+
+        assert not Delegate._looks_like_prompt_leak(reply_text="normal reply here", sent_prompt=prompt)
+
+
+class TestGeminiModelCache:
+    """Verify the Gemini SDK is configured and the model built once per settings tuple."""
+
+    def test_model_reused_across_calls(self) -> None:
+        from unittest.mock import MagicMock, patch
+
+        from services import delegate
+
+        genai = MagicMock()
+        delegate._get_gemini_model.cache_clear()
+        with patch.object(delegate, "_get_genai", return_value=genai):
+            first = delegate._get_gemini_model("key", "https://proxy.example.com/", "gemini-x")
+            second = delegate._get_gemini_model("key", "https://proxy.example.com/", "gemini-x")
+        delegate._get_gemini_model.cache_clear()
+
+        assert first is second
+        genai.configure.assert_called_once_with(
+            api_key="key",
+            client_options={"api_endpoint": "proxy.example.com"},
+            transport="rest",
+        )
+        genai.GenerativeModel.assert_called_once_with("gemini-x")
+
+
+class TestFailoverChain:
+    """Verify the provider chain is built once at construction."""
+
+    def test_chain_built_once(self) -> None:
+        from unittest.mock import patch
+
+        from services.delegate import Delegate
+
+        with patch("services.delegate.settings") as mock_settings:
+            mock_settings.LLM_PROVIDER = "gemini"
+            mock_settings.LLM_FAILOVER_CHAIN = []
+            mock_settings.GEMINI_API_KEY = "g"
+            mock_settings.OPENAI_API_KEY = None
+            mock_settings.ANTHROPIC_API_KEY = "a"
+            delegate = Delegate()
+
+        with patch.object(Delegate, "_build_failover_chain") as mock_build:
+            assert delegate._get_failover_chain() == ["gemini", "anthropic", "lotl"]
+            assert delegate._get_failover_chain() is delegate._get_failover_chain()
+        mock_build.assert_not_called()
+
+
+class TestReasoningBlock:
+    """Verify the startswith fast path agrees with the reasoning regex."""
+
+    def test_matches_regex(self) -> None:
+        from services.delegate import _REASONING_RE, _is_reasoning_block
+
+        samples = [
+            "Thinking about it",
+            "**Plan**",
+            "okay, I'm going to",
+            "I'm now drafting",
+            "Okay see you then",
+            "ſtrategy notes",
+            "hey what's up",
+        ]
+        for sample in samples:
+            assert _is_reasoning_block(sample) == bool(_REASONING_RE.match(sample)), sample
+
+
+class TestThinkingBlocks:
+    """Verify Gemini "Thinking" blocks are dropped up to the first message line."""
+
+    def test_block_removed_until_greeting(self) -> None:
+        from services.delegate import _strip_thinking_blocks
+
+        text = "Thinking Analyzing Persona\nOkay I'm working on it\nHey what's up"
+
+        assert _strip_thinking_blocks(text) == "\nHey what's up"
+
+    def test_mid_text_block_takes_preceding_newline(self) -> None:
+        from services.delegate import _strip_thinking_blocks
+
+        text = "lol\n\n  Evaluating Tone\nmore notes\nYeah for sure"
+
+        assert _strip_thinking_blocks(text) == "lol\nYeah for sure"
+
+    def test_header_needs_capitalized_word(self) -> None:
+        from services.delegate import _strip_thinking_blocks
+
+        assert _strip_thinking_blocks("Thinking: about you") == "Thinking: about you"
+
+    def test_long_blank_run_is_linear(self) -> None:
+        from services.delegate import _strip_thinking_blocks
+
+        text = "x" + "\n" * 50000 + "y"
+
+        assert _strip_thinking_blocks(text) is text
+
+
+class TestPromptEchoGuards:
+    """Verify the length-guarded echo checks keep both containment directions."""
+
+    def test_short_reply_inside_prompt_head_is_leak(self) -> None:
+        from services.delegate import Delegate
+
+        assert Delegate._looks_like_prompt_leak(reply_text="You are Roel", sent_prompt="You are Roel, a friend.")
+
+    def test_reply_wrapping_prompt_head_is_leak(self) -> None:
+        from services.delegate import Delegate
+
+        assert Delegate._looks_like_prompt_leak(reply_text="sure: be brief. ok", sent_prompt="be brief.")
+
+
+class TestHedgedFailover:
+    """Verify a slow primary is overlapped with the next provider when hedging is on."""
+
+    def _make_delegate(self):
+        from unittest.mock import patch
+
+        from services.delegate import Delegate
+
+        with patch("services.delegate.settings") as mock_settings:
+            mock_settings.LLM_PROVIDER = "lotl"
+            mock_settings.LLM_FAILOVER_CHAIN = ["openai", "anthropic"]
+            return Delegate()
+
+    def _reply(self, delegate, dispatch, hedge_delay: float) -> str:
+        from unittest.mock import patch
+
+        with patch("services.delegate.settings") as mock_settings, \
+                patch.object(delegate, "_dispatch", side_effect=dispatch):
+            mock_settings.LLM_HEDGE_DELAY_SEC = hedge_delay
+            return delegate.generate_reply({"system_instruction": "SYS"})
+
+    def test_slow_primary_is_hedged(self) -> None:
+        import threading
+
+        release = threading.Event()
+        calls = []
+
+        def dispatch(provider, system_prompt, history):
+            calls.append(provider)
+            if provider == "lotl":
+                release.wait(2)
+                return "late reply"
+            return f"hi from {provider}"
+
+        delegate = self._make_delegate()
+        try:
+            assert self._reply(delegate, dispatch, 0.05) == "hi from openai"
+        finally:
+            release.set()
+        assert calls == ["lotl", "openai"]
+
+    def test_failure_starts_next_without_waiting(self) -> None:
+        import time
+
+        def dispatch(provider, system_prompt, history):
+            if provider == "lotl":
+                raise RuntimeError("down")
+            return f"hi from {provider}"
+
+        delegate = self._make_delegate()
+        started = time.monotonic()
+
+        assert self._reply(delegate, dispatch, 5.0) == "hi from openai"
+        assert time.monotonic() - started < 1.0
+
+    def test_rate_limit_propagates(self) -> None:
+        import pytest
+
+        from services.delegate import RateLimitError
+
+        def dispatch(provider, system_prompt, history):
+            raise RateLimitError(provider=provider, retry_after_seconds=1.0)
+
+        with pytest.raises(RateLimitError):
+            self._reply(self._make_delegate(), dispatch, 0.05)
+
+
+class TestSingleClean:
+    """Verify each reply goes through _clean_output exactly once."""
+
+    def test_gemini_reply_cleaned_once(self) -> None:
+        from unittest.mock import MagicMock, patch
+
+        from services.delegate import Delegate
+
+        delegate = Delegate.__new__(Delegate)
+        delegate.provider = "gemini"
+        model = MagicMock()
+        model.generate_content.return_value.text = "Response: hey you"
+        with patch("services.delegate.settings") as mock_settings, \
+                patch("services.delegate._get_gemini_model", return_value=model), \
+                patch.object(Delegate, "_clean_output", wraps=delegate._clean_output) as mock_clean:
+            mock_settings.GEMINI_MODEL = "gemini-x"
+            raw = delegate._dispatch("gemini", "SYS", [])
+            reply = delegate._accept_reply("gemini", raw)
+
+        assert reply == "hey you"
+        assert mock_clean.call_count == 1
+
+    def test_lotl_reply_not_recleaned(self) -> None:
+        from unittest.mock import patch
+
+        from services.delegate import Delegate
+
+        delegate = Delegate.__new__(Delegate)
+        delegate.provider = "lotl"
+        with patch.object(Delegate, "_clean_output") as mock_clean:
+            assert delegate._accept_reply("lotl", "already clean") == "already clean"
+        mock_clean.assert_not_called()
+
+
+class TestCleanOutputCache:
+    """Verify identical raw replies are cleaned once."""
+
+    def test_repeat_is_cache_hit(self) -> None:
+        from services.delegate import _clean_output_impl
+
+        raw = "Strategy: be warm\n\nsee you at 8"
+        _clean_output_impl.cache_clear()
+
+        assert _clean(raw) == "see you at 8"
+        assert _clean(raw) == "see you at 8"
+        assert _clean_output_impl.cache_info().hits == 1
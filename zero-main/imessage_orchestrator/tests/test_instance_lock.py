@@ -0,0 +1,42 @@
+"""Tests for the single-instance file lock."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="flock semantics")
+class TestInstanceLock:
+    """Verify the PID is recorded and the lock file survives release."""
+
+    def test_pid_written_and_file_kept(self, tmp_path: Path) -> None:
+        from services.instance_lock import acquire_instance_lock
+
+        (tmp_path / "orchestrator.lock").write_text("99999999 stale owner\n")
+
+        with acquire_instance_lock(tmp_path) as lock_path:
+            assert lock_path.read_text() == f"{os.getpid()}\n"
+
+        assert lock_path.exists()
+
+    def test_second_acquire_fails_without_removing_file(self, tmp_path: Path) -> None:
+        from services.instance_lock import InstanceAlreadyRunning, acquire_instance_lock
+
+        with acquire_instance_lock(tmp_path) as lock_path:
+            with pytest.raises(InstanceAlreadyRunning, match=str(os.getpid())):
+                with acquire_instance_lock(tmp_path):
+                    pass
+            assert lock_path.exists()
+
+        # Released: the same path can be locked again
+        with acquire_instance_lock(tmp_path):
+            pass
@@ -0,0 +1,386 @@
+"""Tests for LotLClient connection reuse and request handling."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+def _ok_response(payload: dict) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.raise_for_status.return_value = None
+    response.json.return_value = payload
+    return response
+
+
+class TestConnectionPooling:
+    """Verify every request goes through one pooled client per instance."""
+
+    def test_sync_calls_share_one_client(self) -> None:
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        with patch("httpx.Client") as MockClient:
+            pooled = MockClient.return_value
+            pooled.get.return_value = _ok_response({"status": "ok", "unread": []})
+            pooled.post.return_value = _ok_response({"success": True, "reply": "hi"})
+
+            assert client.is_available()
+            assert client.poll_whatsapp() == []
+            assert client.send_whatsapp("+15550001111", "yo") == "hi"
+            assert client.chat("prompt") == "hi"
+
+            client.close()
+
+        MockClient.assert_called_once()
+        pooled.close.assert_called_once()
+        assert pooled.get.call_args_list[0].kwargs["timeout"] == 5.0
+
+    def test_async_client_reused_within_loop(self) -> None:
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+
+        async def run_twice() -> list[str]:
+            replies = [await client.achat("a"), await client.achat("b")]
+            await client.aclose()
+            return replies
+
+        with patch("httpx.AsyncClient") as MockAsync:
+            pooled = MockAsync.return_value
+            pooled.post = AsyncMock(return_value=_ok_response({"success": True, "reply": "ok"}))
+            pooled.aclose = AsyncMock()
+
+            assert asyncio.run(run_twice()) == ["ok", "ok"]
+
+        MockAsync.assert_called_once()
+        pooled.aclose.assert_awaited_once()
+
+    def test_new_event_loop_gets_new_async_client(self) -> None:
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+
+        def make_client(**kwargs):
+            pooled = MagicMock()
+            pooled.post = AsyncMock(return_value=_ok_response({"success": True, "reply": "ok"}))
+            pooled.aclose = AsyncMock()
+            return pooled
+
+        with patch("httpx.AsyncClient", side_effect=make_client) as MockAsync:
+            asyncio.run(client.achat("a"))
+            first = client._aclient
+            asyncio.run(client.achat("b"))
+
+        assert MockAsync.call_count == 2
+        # The first loop's pool is closed, not leaked, when the loop changes
+        first.aclose.assert_awaited_once()
+        assert client._aclient is not first
+
+    def test_sync_client_created_once_across_threads(self) -> None:
+        import threading
+        import time
+
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+
+        def slow_client(**kwargs):
+            time.sleep(0.02)
+            return MagicMock()
+
+        with patch("httpx.Client", side_effect=slow_client) as MockClient:
+            threads = [threading.Thread(target=client._get_client) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        MockClient.assert_called_once()
+
+
+class TestCircuitBreaker:
+    """Verify a hard-down controller trips the breaker and is probed after cooldown."""
+
+    def teardown_method(self) -> None:
+        from services import lotl_client
+
+        lotl_client._breakers.clear()
+
+    def _failing_client(self):
+        import httpx
+
+        from services import lotl_client
+
+        lotl_client._breakers.clear()
+        client = lotl_client.LotLClient(base_url="http://localhost:9999", timeout=5)
+        post = MagicMock(side_effect=httpx.ConnectError("refused"))
+        return client, post
+
+    def test_trips_after_threshold_and_fails_fast(self) -> None:
+        import httpx
+        import pytest
+
+        from services.lotl_client import CircuitOpenError
+
+        client, post = self._failing_client()
+        with patch("httpx.Client") as MockClient, patch("time.sleep"):
+            MockClient.return_value.post = post
+            with pytest.raises(httpx.ConnectError):
+                client.chat("prompt")
+            assert post.call_count == 5
+
+            with pytest.raises(CircuitOpenError):
+                client.chat("prompt")
+        assert post.call_count == 5
+
+    def test_probe_after_cooldown(self) -> None:
+        import httpx
+        import pytest
+
+        from services import lotl_client
+
+        client, post = self._failing_client()
+        with patch("httpx.Client") as MockClient, patch("time.sleep"):
+            MockClient.return_value.post = post
+            with pytest.raises(httpx.ConnectError):
+                client.chat("prompt")
+
+            state = lotl_client._breakers[(client.base_url, "/gemini")]
+            state.opened_at -= state.cooldown + 1
+
+            # Failed probe: back to open with a doubled cooldown
+            with pytest.raises(lotl_client.CircuitOpenError):
+                client.chat("prompt")
+            assert post.call_count == 6
+            assert state.cooldown == 2 * lotl_client._BREAKER_COOLDOWN
+
+            # Successful probe closes the circuit
+            state.opened_at -= state.cooldown + 1
+            post.side_effect = None
+            post.return_value = _ok_response({"success": True, "reply": "back"})
+            assert client.chat("prompt") == "back"
+        assert lotl_client._breakers == {}
+
+
+class TestRetryAfter:
+    """Verify a busy controller's Retry-After replaces the exponential backoff."""
+
+    def test_retry_after_header_sets_sleep(self) -> None:
+        import httpx
+
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        busy = httpx.Response(503, headers={"Retry-After": "3"}, json={"busy": True, "elapsed": 40})
+        post = MagicMock(side_effect=[busy, _ok_response({"success": True, "reply": "done"})])
+
+        with patch("httpx.Client") as MockClient, patch("time.sleep") as mock_sleep:
+            MockClient.return_value.post = post
+            assert client.chat("prompt") == "done"
+
+        mock_sleep.assert_called_once_with(3.0)
+
+    def test_backoff_without_header_and_cap(self) -> None:
+        import httpx
+
+        from services.lotl_client import _BACKOFF_CAP, _MAX_RETRY_AFTER, _compute_backoff
+
+        plain = httpx.Response(503)
+        huge = httpx.Response(503, headers={"Retry-After": "9999"})
+        dated = httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+        # Decorrelated jitter: between the base and three times the previous wait
+        assert 2.0 <= _compute_backoff(plain, 4.0, 2.0) <= 12.0
+        assert 2.0 <= _compute_backoff(dated, 2.0, 2.0) <= 6.0
+        assert _compute_backoff(plain, 1000.0, 2.0) <= _BACKOFF_CAP
+        assert _compute_backoff(huge, 2.0, 2.0) == _MAX_RETRY_AFTER
+
+
+class TestAsyncRetries:
+    """Verify achat retries like chat without blocking the event loop."""
+
+    def test_busy_then_success(self) -> None:
+        import httpx
+
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        busy = httpx.Response(503, headers={"Retry-After": "3"}, json={"busy": True})
+        with patch("httpx.AsyncClient") as MockAsync, \
+                patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep, \
+                patch("time.sleep") as blocking_sleep:
+            MockAsync.return_value.post = AsyncMock(
+                side_effect=[busy, _ok_response({"success": True, "reply": "done"})]
+            )
+            assert asyncio.run(client.achat("prompt")) == "done"
+
+        mock_sleep.assert_awaited_once_with(3.0)
+        blocking_sleep.assert_not_called()
+
+    def test_non_recoverable_error_fails_fast(self) -> None:
+        import pytest
+
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        captcha = _ok_response({"success": False, "error": "CAPTCHA required"})
+        with patch("httpx.AsyncClient") as MockAsync, \
+                patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            post = MockAsync.return_value.post = AsyncMock(return_value=captcha)
+            with pytest.raises(RuntimeError, match="CAPTCHA"):
+                asyncio.run(client.achat("prompt"))
+
+        assert post.await_count == 1
+        mock_sleep.assert_not_awaited()
+
+    def test_exhausted_connect_errors_map_to_connection_error(self) -> None:
+        import httpx
+        import pytest
+
+        from services import lotl_client
+
+        lotl_client._breakers.clear()
+        client = lotl_client.LotLClient(base_url="http://localhost:9999", timeout=5)
+        try:
+            with patch("httpx.AsyncClient") as MockAsync, \
+                    patch("asyncio.sleep", new_callable=AsyncMock):
+                post = MockAsync.return_value.post = AsyncMock(
+                    side_effect=httpx.ConnectError("refused")
+                )
+                with pytest.raises(ConnectionError):
+                    asyncio.run(client.achat("prompt"))
+            assert post.await_count == lotl_client._CHAT_MAX_RETRIES
+        finally:
+            lotl_client._breakers.clear()
+
+
+class TestPlatformRouting:
+    """Verify platforms map to controller routes and image support."""
+
+    def test_endpoint_and_image_handling(self) -> None:
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        image = "data:image/png;base64,AAAA"
+        with patch("httpx.Client") as MockClient:
+            post = MockClient.return_value.post
+            post.return_value = _ok_response({"success": True, "reply": "ok"})
+
+            client.chat("p", images=[image], platform="whatsapp")
+            client.chat("p", images=[image], platform="copilot", fresh=True)
+            client.chat("p", platform="unknown")
+
+        whatsapp, copilot, fallback = post.call_args_list
+        assert whatsapp.args[0] == "http://localhost:9999/whatsapp"
+        assert whatsapp.kwargs["json"] == {"prompt": "p"}
+        assert copilot.args[0] == "http://localhost:9999/copilot"
+        assert copilot.kwargs["json"] == {"prompt": "p", "fresh": True, "images": [image]}
+        assert fallback.args[0] == "http://localhost:9999/gemini"
+
+
+class TestImageEncoding:
+    """Verify image files are encoded once until they change on disk."""
+
+    def test_file_encode_cached_until_modified(self, tmp_path: Path) -> None:
+        import base64
+        import os
+
+        from services.lotl_client import LotLClient, _encode_file_cached
+
+        _encode_file_cached.cache_clear()
+        image = tmp_path / "shot.jpg"
+        image.write_bytes(b"first")
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+
+        url = client._encode_image(image)
+        assert url == "data:image/jpeg;base64," + base64.b64encode(b"first").decode()
+        assert client._encode_image(str(image)) == url
+        assert _encode_file_cached.cache_info().hits == 1
+
+        image.write_bytes(b"second!")
+        os.utime(image, ns=(0, 1))
+        assert base64.b64decode(client._encode_image(image).split(",", 1)[1]) == b"second!"
+
+    def test_multiple_images_keep_order(self, tmp_path: Path) -> None:
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        paths = []
+        for i in range(6):
+            paths.append(tmp_path / f"{i}.png")
+            paths[-1].write_bytes(bytes([i]) * 64)
+
+        payload = client._build_payload("p", paths, None, False, "gemini")
+
+        assert payload["images"] == [client._encode_image(p) for p in paths]
+
+    def test_missing_file_raises(self, tmp_path: Path) -> None:
+        import pytest
+
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        with pytest.raises(FileNotFoundError, match="Image not found"):
+            client._encode_image(tmp_path / "missing.png")
+
+
+class TestHealthCache:
+    """Verify availability checks are cached and an unreachable controller fails fast."""
+
+    def test_is_available_cached_within_ttl(self) -> None:
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        with patch.object(client, "health", return_value={"status": "ok"}) as mock_health:
+            assert client.is_available()
+            assert client.is_available()
+            assert client.is_available(force=True)
+
+        assert mock_health.call_count == 2
+
+    def test_chat_fails_fast_after_unreachable_probe(self) -> None:
+        import pytest
+
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        with patch.object(client, "health", side_effect=ConnectionError("down")), \
+                patch("httpx.Client") as MockClient:
+            assert not client.is_available()
+            with pytest.raises(ConnectionError, match="ConnectionError: down"):
+                client.chat("prompt")
+
+        MockClient.return_value.post.assert_not_called()
+
+    def test_preflight_reports_probe_failure_cause(self) -> None:
+        import pytest
+
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        with patch.object(client, "health", side_effect=ValueError("Expecting value")):
+            assert not client.is_available()
+        with pytest.raises(ConnectionError, match="ValueError: Expecting value") as excinfo:
+            client.chat("prompt")
+        assert "Cannot connect" not in str(excinfo.value)
+
+    def test_unhealthy_status_recorded_without_failing_fast(self) -> None:
+        from services.lotl_client import LotLClient
+
+        client = LotLClient(base_url="http://localhost:9999", timeout=5)
+        with patch.object(client, "health", return_value={"status": "degraded"}):
+            assert not client.is_available()
+        assert client._health_cache[2] == "controller reports status 'degraded'"
+
+        with patch("httpx.Client") as MockClient:
+            MockClient.return_value.post.return_value = _ok_response({"success": True, "reply": "ok"})
+            assert client.chat("prompt") == "ok"
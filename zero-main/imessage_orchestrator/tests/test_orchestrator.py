@@ -0,0 +1,77 @@
+"""Tests for orchestrator routing of unknown senders."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+class TestUnknownTriageBatching:
+    """Verify one poll's unknown senders are triaged in a single batch call."""
+
+    def _make_orchestrator(self):
+        from orchestrator import Orchestrator
+
+        orch = Orchestrator.__new__(Orchestrator)
+        orch.analyst = MagicMock()
+        orch.archivist = MagicMock()
+        orch.archivist.has_profile.return_value = False
+        orch._llm_lock = threading.Lock()
+        orch.pending_approvals = {}
+        orch._prefetched_triage = {}
+        return orch
+
+    @staticmethod
+    def _decide(handle):
+        from services.policy import InboundDecision
+
+        kind = "allowlisted" if handle == "+15559999999" else "unknown"
+        return InboundDecision(kind=kind, handle=handle)
+
+    def test_batch_results_consumed_by_unknown_handler(self) -> None:
+        orch = self._make_orchestrator()
+        messages = [
+            SimpleNamespace(handle="+15550000001", text="hi there"),
+            SimpleNamespace(handle="+15559999999", text="known"),
+            SimpleNamespace(handle="+15550000001", text="second"),
+            SimpleNamespace(handle="+15550000002", text=" hello "),
+        ]
+        orch.analyst.analyze_batch.return_value = [
+            {"classification": "benign_chat", "suggested_reply": "a"},
+            {"classification": "spam", "suggested_reply": "b"},
+        ]
+
+        with patch("orchestrator.policy.decide_inbound", side_effect=self._decide):
+            orch._prefetch_unknown_triage(messages)
+
+        orch.analyst.analyze_batch.assert_called_once_with([
+            {"handle": "+15550000001", "inbound_text": "hi there"},
+            {"handle": "+15550000002", "inbound_text": "hello"},
+        ])
+
+        with patch("orchestrator.settings") as mock_settings, \
+                patch("orchestrator.Archivist"), \
+                patch.object(orch, "_request_approval") as mock_approval:
+            mock_settings.AUTO_REPLY_UNKNOWN_CONTACTS = False
+            orch._handle_unknown_contact(handle="+15550000002", inbound_text=" hello ", service="SMS")
+
+        orch.analyst.analyze_unknown_contact.assert_not_called()
+        assert mock_approval.call_args.args[2] == "b"
+        assert "+15550000002" not in orch._prefetched_triage
+
+    def test_single_unknown_sender_keeps_per_contact_path(self) -> None:
+        orch = self._make_orchestrator()
+
+        with patch("orchestrator.policy.decide_inbound", side_effect=self._decide):
+            orch._prefetch_unknown_triage([SimpleNamespace(handle="+15550000001", text="hi")])
+
+        orch.analyst.analyze_batch.assert_not_called()
+        assert orch._prefetched_triage == {}
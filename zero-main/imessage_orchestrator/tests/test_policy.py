@@ -0,0 +1,67 @@
+"""Tests for inbound handle canonicalization and routing policy."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+class TestCanonicalizeHandle:
+    """Verify phone handles reduce to '+' and ASCII digits; others are kept."""
+
+    @pytest.mark.parametrize(
+        ("handle", "expected"),
+        [
+            ("+1 (555) 000-1111", "+15550001111"),
+            ("  15550001111 ", "+15550001111"),
+            ("+44+20.7946", "+44207946"),
+            ("+٣٣ 12", "+12"),
+            ("user@example.com", "user@example.com"),
+            ("chat123456789", "chat123456789"),
+            ("   ", ""),
+            (None, ""),
+        ],
+    )
+    def test_canonical_forms(self, handle, expected) -> None:
+        from services.policy import canonicalize_handle
+
+        assert canonicalize_handle(handle) == expected
+
+
+class TestPolicyCaches:
+    """Verify the allowlist is reused within its TTL and the operator tracks settings."""
+
+    def teardown_method(self) -> None:
+        from services import policy
+
+        policy._allowlist_cache = (frozenset(), float("-inf"))
+
+    def test_allowlist_reused_within_ttl(self) -> None:
+        from services import policy
+
+        policy._allowlist_cache = (frozenset(), float("-inf"))
+        with patch.object(policy.settings, "get_target_handles", return_value={"+1 555 000 1111", " "}) as mock_get, \
+                patch("services.policy.time.monotonic", return_value=100.0) as clock:
+            assert policy.get_allowlist() == {"+15550001111"}
+            assert policy.get_allowlist() == {"+15550001111"}
+            assert mock_get.call_count == 1
+
+            clock.return_value = 100.0 + policy._ALLOWLIST_TTL
+            policy.get_allowlist()
+            assert mock_get.call_count == 2
+
+    def test_operator_handle_follows_setting(self) -> None:
+        from services import policy
+
+        with patch.object(policy.settings, "OPERATOR_HANDLE", "+1 (555) 000-2222"):
+            assert policy.get_operator_handle() == "+15550002222"
+        with patch.object(policy.settings, "OPERATOR_HANDLE", None):
+            assert policy.get_operator_handle() is None
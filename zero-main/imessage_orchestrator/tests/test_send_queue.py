@@ -0,0 +1,118 @@
+"""Tests for the disk-backed scheduled send queue."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+class TestScheduledMessage:
+    """Verify the serialized form matches the dataclass fields."""
+
+    def test_round_trip_and_field_list(self) -> None:
+        from dataclasses import asdict, fields
+
+        from services.send_queue import ScheduledMessage
+
+        msg = ScheduledMessage(handle="+1", text="t", service="iMessage", send_after_epoch=5.0, context="c")
+
+        assert ScheduledMessage._KNOWN_FIELDS == {f.name for f in fields(ScheduledMessage)}
+        assert msg.to_dict() == asdict(msg)
+        assert ScheduledMessage.from_dict({**msg.to_dict(), "legacy": 1}) == msg
+        assert not hasattr(msg, "__dict__")
+
+
+class TestRetryBackoff:
+    """Verify failed sends are rescheduled with jittered exponential backoff."""
+
+    def test_retry_delay_is_jittered(self, tmp_path: Path) -> None:
+        from services.send_queue import SendQueue
+
+        queue = SendQueue(tmp_path / "queue.json")
+        with patch("services.send_queue.time.time", return_value=1000.0):
+            queue.enqueue(handle="+15550001111", text="hi", service="iMessage", delay_seconds=0)
+            assert queue.drain(MagicMock(return_value=False)) == 0
+
+        ((_, _, entry),) = queue._heap
+        assert entry.retries == 1
+        assert 1010.0 <= entry.send_after_epoch <= 1015.0
+
+
+class TestScheduling:
+    """Verify due entries drain in time order and the handle index stays in sync."""
+
+    def test_drains_due_entries_in_time_order(self, tmp_path: Path) -> None:
+        from services.send_queue import SendQueue
+
+        queue = SendQueue(tmp_path / "queue.json")
+        send = MagicMock(return_value=True)
+        with patch("services.send_queue.time.time", return_value=1000.0):
+            queue.enqueue(handle="+1late", text="late", service="iMessage", delay_seconds=30)
+            queue.enqueue(handle="+1b", text="b", service="iMessage", delay_seconds=5)
+            queue.enqueue(handle="+1a", text="a", service="iMessage", delay_seconds=5)
+            queue.enqueue(handle="+1first", text="first", service="iMessage", delay_seconds=1)
+
+        with patch("services.send_queue.time.time", return_value=1010.0):
+            assert queue.drain(send) == 3
+
+        assert [c.args[1] for c in send.call_args_list] == ["first", "b", "a"]
+        assert queue.depth == 1
+        assert queue.has_pending_for("+1late")
+        assert not queue.has_pending_for("+1a")
+
+    def test_max_per_tick_and_reload(self, tmp_path: Path) -> None:
+        from services.send_queue import SendQueue
+
+        path = tmp_path / "queue.json"
+        queue = SendQueue(path)
+        with patch("services.send_queue.time.time", return_value=1000.0):
+            for i in range(3):
+                queue.enqueue(handle="+1same", text=str(i), service="iMessage", delay_seconds=0)
+            assert queue.drain(MagicMock(return_value=True), max_per_tick=2) == 2
+
+        reloaded = SendQueue(path)
+        assert reloaded.depth == 1
+        assert reloaded.has_pending_for("+1same")
+
+
+class TestBatchedPersistence:
+    """Verify bursts of enqueues are coalesced and flush() writes the rest."""
+
+    def test_burst_coalesced_then_flushed(self, tmp_path: Path) -> None:
+        from services.send_queue import _FLUSH_MAX_OPS, SendQueue
+
+        path = tmp_path / "queue.json"
+        queue = SendQueue(path)
+        with patch("services.send_queue.atomic_write_json") as mock_write, \
+                patch("services.send_queue.time.monotonic", return_value=50.0):
+            for i in range(_FLUSH_MAX_OPS + 3):
+                queue.enqueue(handle="+1burst", text=str(i), service="iMessage", delay_seconds=60)
+            # First enqueue writes immediately, the next batch on the op limit
+            assert mock_write.call_count == 2
+
+            queue.flush()
+            assert mock_write.call_count == 3
+            assert len(mock_write.call_args.args[1]) == _FLUSH_MAX_OPS + 3
+
+            queue.flush()
+            assert mock_write.call_count == 3
+
+    def test_idle_drain_writes_leftovers(self, tmp_path: Path) -> None:
+        from services.send_queue import _FLUSH_INTERVAL, SendQueue
+
+        path = tmp_path / "queue.json"
+        queue = SendQueue(path)
+        with patch("services.send_queue.time.monotonic", return_value=50.0) as clock:
+            queue.enqueue(handle="+1a", text="a", service="iMessage", delay_seconds=60)
+            queue.enqueue(handle="+1b", text="b", service="iMessage", delay_seconds=60)
+            assert SendQueue(path).depth == 1
+
+            clock.return_value = 50.0 + _FLUSH_INTERVAL
+            queue.drain(MagicMock(return_value=True))
+        assert SendQueue(path).depth == 2
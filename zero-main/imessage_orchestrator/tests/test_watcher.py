@@ -0,0 +1,68 @@
+"""Tests for iMessageWatcher queries against a minimal chat.db."""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Ensure the orchestrator package is on sys.path
+_ORCH_ROOT = Path(__file__).resolve().parents[1]
+if str(_ORCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ORCH_ROOT))
+
+
+def _make_chat_db(path: Path) -> Path:
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE message (ROWID INTEGER PRIMARY KEY, text TEXT, attributedBody BLOB,
+                              is_from_me INTEGER, date INTEGER);
+        CREATE TABLE chat (ROWID INTEGER PRIMARY KEY, chat_identifier TEXT);
+        CREATE TABLE chat_message_join (chat_id INTEGER, message_id INTEGER);
+        INSERT INTO chat VALUES (1, '+15551230001'), (2, '+15551230002');
+        """
+    )
+    rows = [
+        (1, 1, "a1", 0, 10), (2, 1, "a2", 1, 20), (3, 1, "a3", 0, 30),
+        (4, 2, "b1", 0, 15),
+    ]
+    for rowid, chat, text, from_me, date in rows:
+        conn.execute("INSERT INTO message VALUES (?, ?, NULL, ?, ?)", (rowid, text, from_me, date))
+        conn.execute("INSERT INTO chat_message_join VALUES (?, ?)", (chat, rowid))
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestFetchLastMessagesWithTimestamps:
+    """Verify the per-handle query returns the newest window, oldest first."""
+
+    def test_returns_last_n_in_chronological_order(self, tmp_path: Path) -> None:
+        from services.watcher import iMessageWatcher
+
+        watcher = iMessageWatcher(chat_db_path=_make_chat_db(tmp_path / "chat.db"), state_file=tmp_path / "s.json")
+
+        msgs = watcher.fetch_last_messages_with_timestamps(handle="+15551230001", limit=2)
+
+        assert [m["text"] for m in msgs] == ["a2", "a3"]
+        assert watcher.fetch_last_messages_with_timestamps(handle="+15559999999", limit=2) == []
+
+
+class TestIncomingMessageDates:
+    """Verify polled messages carry Unix-second dates comparable across transports."""
+
+    def test_apple_epoch_nanoseconds_converted(self) -> None:
+        from services.watcher import _apple_to_unix
+
+        # 2024-01-01T00:00:00Z is 725760000s after the Apple epoch.
+        assert _apple_to_unix(725760000 * 10**9) == 1704067200.0
+        assert _apple_to_unix(725760000) == 1704067200.0
+
+    def test_incoming_message_is_slotted(self) -> None:
+        from services.interfaces import IncomingMessage
+
+        msg = IncomingMessage(message_rowid=1, handle="+1", text="hi", service="iMessage", date=1.5)
+
+        assert not hasattr(msg, "__dict__")
+        assert msg.date == 1.5
@@ -8,6 +8,8 @@ Guarantees:
 - ``os.replace`` is atomic on both POSIX and Windows (Python 3.3+).
 - Parent directories are created on demand.
 - Encoding is always UTF-8.
+- Serialization uses ``orjson`` when installed (2-space or compact layouts,
+  non-ASCII kept as-is) and falls back to stdlib ``json`` otherwise.
 """
 
 from __future__ import annotations
@@ -18,32 +20,50 @@ import os
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # Optional accelerator; stdlib json is the fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
-def atomic_write_json(
-    path: Path,
-    data: Any,
-    *,
-    indent: int = 2,
-    ensure_ascii: bool = False,
-) -> None:
-    """Atomically write *data* as JSON to *path*.
+def _dumps_bytes(data: Any, *, indent: int | None, ensure_ascii: bool) -> bytes:
+    """Serialize *data* to UTF-8 JSON bytes (orjson fast path when it can honor the layout)."""
+    if orjson is not None and not ensure_ascii and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option, default=str)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; stdlib json handles them
+    return json.dumps(data, indent=indent, ensure_ascii=ensure_ascii, default=str).encode("utf-8")
 
-    1. Serialize to a ``.tmp`` sibling.
-    2. ``os.replace`` the target (atomic on all platforms).
-    3. On failure the tmp file is cleaned up; the original is untouched.
+
+def atomic_write_bytes(path: Path, data: bytes, *, fsync: bool = True) -> None:
+    """Atomically write pre-serialized *data* to *path*.
+
+    Writes straight to a ``.tmp`` file descriptor (no text layer), optionally
+    fsyncs it, then ``os.replace``s the target. On failure the tmp file is
+    cleaned up and the original is untouched.
     """
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
 
     try:
-        tmp.write_text(
-            json.dumps(data, indent=indent, ensure_ascii=ensure_ascii, default=str),
-            encoding="utf-8",
-        )
-        os.replace(str(tmp), str(path))
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
     except Exception:
         # Clean up partial tmp on failure; never leave orphan .tmp files.
         try:
@@ -51,3 +71,21 @@ def atomic_write_json(
         except Exception:
             pass
         raise
+
+
+def atomic_write_json(
+    path: Path,
+    data: Any,
+    *,
+    indent: int = 2,
+    ensure_ascii: bool = False,
+) -> None:
+    """Atomically write *data* as JSON to *path*.
+
+    1. Serialize to a ``.tmp`` sibling.
+    2. ``os.replace`` the target (atomic on all platforms).
+    3. On failure the tmp file is cleaned up; the original is untouched.
+    """
+    atomic_write_bytes(
+        path, _dumps_bytes(data, indent=indent, ensure_ascii=ensure_ascii), fsync=False
+    )